@@ -6,7 +6,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[('dist\\bronze.db', '.')],
-    hiddenimports=['sqlite3', 'requests', 'colorama', 'rich', 'threading', 'pickle'],
+    hiddenimports=['sqlite3', 'requests', 'colorama', 'rich', 'rich.console', 'rich.progress', 'threading', 'asyncio'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -0,0 +1,54 @@
+# Benchmark da busca no catálogo de links (FTS5 no bronze.db)
+# Uso: python benchmarks/bench_catalogo.py [links]
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main
+from geradores import gerar_arvore_links
+
+def cronometrar(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return resultado, time.perf_counter() - inicio
+
+def percentil(tempos, p):
+    ordenados = sorted(tempos)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+def main_benchmark(links=1_000_000):
+    arvore = gerar_arvore_links(links)
+    os.chdir(tempfile.mkdtemp())
+    if not main.BronzeDB().catalogo_disponivel:
+        print("SQLite sem FTS5: nada a medir")
+        return
+
+    _, t_snapshot = cronometrar(lambda: main.salvar_cache(arvore))
+    _, t_completo = cronometrar(main.atualizar_catalogo)
+
+    # Versão nova do dataset: poucas folhas mudam, o resto é reaproveitado
+    categoria = next(iter(arvore))
+    subcategoria = next(iter(arvore[categoria]))
+    arvore[categoria][subcategoria] = arvore[categoria][subcategoria][:-10] + ["https://novo.example.org/bronze"]
+    arvore["Nova Categoria"] = {"Links": ["https://outro.example.net/"]}
+    main.salvar_cache(arvore)
+    _, t_incremental = cronometrar(main.atualizar_catalogo)
+    assert main.buscar_no_catalogo("novo example bronze")
+
+    consultas = ['filmes', 'python linux', 'nintendo retro', 'cursos 12', 'com br', 'esportes dublado legendas',
+                 'anime', 'outro example']
+    print(f"Catálogo: {links:,} links")
+    print(f"  snapshot: {t_snapshot:.1f} s | índice completo: {t_completo:.1f} s"
+          f" | reindexação incremental: {t_incremental * 1000:.0f} ms")
+    for consulta in consultas:
+        tempos = []
+        for _ in range(20):
+            resultados, tempo = cronometrar(lambda: main.buscar_no_catalogo(consulta))
+            tempos.append(tempo)
+        print(f"  {consulta!r:28} {len(resultados):2} resultados | p50: {percentil(tempos, 0.5) * 1000:6.1f} ms"
+              f" | p95: {percentil(tempos, 0.95) * 1000:6.1f} ms")
+
+if __name__ == "__main__":
+    main_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,88 @@
+# Benchmark da pesquisa em fluxo: response.json() + lista de dicts x leitura
+# incremental para o ResultadosTorrent, contra um servidor local
+# Uso: python benchmarks/bench_fluxo.py [quantidade]
+import os
+import sys
+import json
+import time
+import subprocess
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+from geradores import gerar_resultados
+from stub_http import servir, url
+
+ITENS_POR_PAGINA = 10
+
+# Roda num processo novo por modo, para o pico de memória não se misturar.
+# O ru_maxrss sobrevive ao exec (herdaria o pico deste processo, que guarda o
+# corpo inteiro); no Linux o VmHWM é zerado no processo novo
+FILHO = """
+import gc, sys, json, time, resource
+sys.path.insert(0, {raiz!r})
+import main
+
+def status_kb(campo):
+    try:
+        with open("/proc/self/status") as f:
+            for linha in f:
+                if linha.startswith(campo + ":"):
+                    return int(linha.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+pico_kb = lambda: status_kb("VmHWM")
+
+modo, url = sys.argv[1], sys.argv[2]
+provedor = main.ProvedorApibay([url], paralelo=False)
+main.obter_sessao()
+antes = pico_kb()
+residente = status_kb("VmRSS")
+
+inicio = time.perf_counter()
+if modo == "lista":
+    # Caminho antigo: corpo inteiro decodificado e pontuado antes da primeira página
+    resultados = provedor.pesquisar("teste")
+    scores = main.analisar_torrents(resultados)["score"]
+    primeira = time.perf_counter()
+    total = len(resultados)
+else:
+    resultados = main.ResultadosTorrent()
+    primeira = None
+    for lote in provedor.pesquisar_em_lotes("teste"):
+        resultados.adicionar(lote)
+        if primeira is None and len(resultados) >= {pagina}:
+            primeira = time.perf_counter()
+    resultados.concluir()
+    total = len(resultados)
+fim = time.perf_counter()
+
+depois = pico_kb()
+gc.collect()
+retido = status_kb("VmRSS") - residente  # Com os resultados ainda vivos
+print(json.dumps({{"primeira": primeira - inicio, "fim": fim - inicio, "itens": total,
+                  "memoria_mb": (depois - antes) / 1024, "retido_mb": retido / 1024}}))
+"""
+
+def medir(modo, url):
+    codigo = FILHO.format(raiz=RAIZ, pagina=ITENS_POR_PAGINA)
+    saida = subprocess.run([sys.executable, "-c", codigo, modo, url],
+                           capture_output=True, text=True, check=True).stdout
+    return json.loads(saida.splitlines()[-1])
+
+def main_benchmark(quantidade=500_000):
+    corpo = json.dumps(gerar_resultados(quantidade)).encode()
+    servidor = servir({"/q.php": corpo})
+    endereco = url(servidor, "/q.php?q={termo}")
+
+    print(f"Pesquisa com {quantidade} resultados ({len(corpo) / 1e6:.0f} MB de JSON, servidor local)")
+    for modo, nome in (("lista", "response.json() "), ("fluxo", "fluxo + colunas ")):
+        r = medir(modo, endereco)
+        print(f"  {nome} primeira página: {r['primeira'] * 1000:8.1f} ms | tudo: {r['fim'] * 1000:8.1f} ms"
+              f" | memória: pico +{r['memoria_mb']:5.0f} MB, retida +{r['retido_mb']:5.0f} MB"
+              f" | {r['itens']} itens")
+    servidor.shutdown()
+
+if __name__ == "__main__":
+    main_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
@@ -0,0 +1,68 @@
+# Benchmark do início a frio (modo rápido): processo novo até o menu principal aparecer
+# Uso: python benchmarks/bench_inicio.py [repeticoes]
+import os
+import sys
+import time
+import tempfile
+import subprocess
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LIMITE_MS = 150
+
+# Roda no processo filho: importa o painel e para na primeira leitura do teclado,
+# que só acontece depois de o menu principal ser desenhado
+FILHO = """
+import sys, time, builtins
+inicio = time.perf_counter()
+sys.path.insert(0, {raiz!r})
+import main
+importado = time.perf_counter()
+
+class MenuPronto(Exception):
+    pass
+
+def parar(*_):
+    raise MenuPronto
+
+main.is_admin = lambda: True
+main.limpar_tela = lambda: None
+builtins.input = parar
+try:
+    main.iniciar_sistema()
+except MenuPronto:
+    pass
+fim = time.perf_counter()
+sys.stderr.write(f"{{(importado - inicio) * 1000:.1f}} {{(fim - inicio) * 1000:.1f}}\\n")
+"""
+
+def medir_processo(argumentos, ambiente, pasta):
+    inicio = time.perf_counter()
+    resultado = subprocess.run([sys.executable, *argumentos], cwd=pasta, env=ambiente,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    return (time.perf_counter() - inicio) * 1000, resultado.stderr
+
+def main_benchmark(repeticoes=10):
+    pasta = tempfile.mkdtemp()
+    ambiente = dict(os.environ, BRONZE_RAPIDO="1")
+    codigo = FILHO.format(raiz=RAIZ)
+
+    vazio = sorted(medir_processo(["-c", "pass"], ambiente, pasta)[0] for _ in range(repeticoes))
+    totais, importacoes, menus = [], [], []
+    for _ in range(repeticoes):
+        total, saida = medir_processo(["-c", codigo], ambiente, pasta)
+        importacao, menu = map(float, saida.split()[-2:])
+        totais.append(total)
+        importacoes.append(importacao)
+        menus.append(menu)
+
+    mediana = lambda valores: sorted(valores)[len(valores) // 2]
+    print(f"Início a frio (BRONZE_RAPIDO=1), mediana de {repeticoes} processos:")
+    print(f"  interpretador vazio:             {mediana(vazio):7.1f} ms")
+    print(f"  processo até o menu principal:   {mediana(totais):7.1f} ms (limite: {LIMITE_MS} ms)")
+    print(f"    import main:                   {mediana(importacoes):7.1f} ms")
+    print(f"    import + iniciar_sistema:      {mediana(menus):7.1f} ms")
+    if mediana(totais) > LIMITE_MS:
+        print(f"  [!] acima do limite; o interpretador sozinho já gasta {mediana(vazio):.0f} ms aqui")
+
+if __name__ == "__main__":
+    main_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,44 @@
+# Benchmark da varredura de saúde dos links contra servidores locais
+# Uso: python benchmarks/bench_links.py [quantidade] [hosts]
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main
+from stub_http import servir, url
+
+def servir_hosts(hosts):
+    """Um servidor por endereço de loopback (127.0.0.1, 127.0.0.2...): cada um é um host distinto"""
+    return [servir(host=f"127.0.0.{i + 1}") for i in range(hosts)]
+
+def gerar_urls(servidores, quantidade):
+    tipos = ["ok"] * 90 + ["sem-head"] * 5 + ["morto"] * 4 + ["lento"]
+    return [url(servidores[i % len(servidores)], f"/{tipos[i % len(tipos)]}/{i}") for i in range(quantidade)]
+
+def main_benchmark(quantidade=10_000, hosts=20):
+    os.chdir(tempfile.mkdtemp())
+    servidores = servir_hosts(hosts)
+    urls = gerar_urls(servidores, quantidade)
+
+    inicio = time.perf_counter()
+    resultados = main.verificar_links_async(urls).result()
+    decorrido = time.perf_counter() - inicio
+    main.salvar_saude_links(resultados)
+
+    fora = sum(main.link_fora_do_ar(status) for _, status, _, _ in resultados)
+    por_status = {}
+    for _, status, _, _ in resultados:
+        por_status[status] = por_status.get(status, 0) + 1
+    print(f"Varredura: {quantidade} URLs em {hosts} hosts locais "
+          f"(até {main.LINKS_POR_HOST} por host, {main.LINKS_CONCORRENCIA} no total, "
+          f"teto de {main.LINKS_TAXA_MAXIMA}/s)")
+    print(f"  {len(resultados)} verificadas em {decorrido:.2f} s ({len(resultados) / decorrido:,.0f} URLs/s)")
+    print(f"  fora do ar: {fora} | status: {dict(sorted(por_status.items(), key=str))}")
+    assert len(main.saude_links(urls)) == len(resultados)
+    for servidor in servidores:
+        servidor.shutdown()
+
+if __name__ == "__main__":
+    main_benchmark(*(int(arg) for arg in sys.argv[1:3]))
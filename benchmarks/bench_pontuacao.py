@@ -0,0 +1,31 @@
+# Benchmark da pontuação em lote (analisar_torrents)
+# A paridade NumPy x Python fica em tests/test_pontuacao.py
+# Uso: python benchmarks/bench_pontuacao.py [quantidade]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main
+from geradores import gerar_resultados
+
+def medir(resultados, repeticoes, **kwargs):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        main.analisar_torrents(resultados, **kwargs)
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), sorted(tempos)[len(tempos) // 2]
+
+def main_benchmark(quantidade=100_000, repeticoes=5):
+    resultados = gerar_resultados(quantidade)
+
+    caminhos = [('python', False)] + ([('numpy', True)] if main.np is not None else [])
+    print(f"analisar_torrents: {quantidade} resultados")
+    for nome, usar_numpy in caminhos:
+        melhor, mediana = medir(resultados, repeticoes, usar_numpy=usar_numpy)
+        print(f"  {nome:7} melhor: {melhor * 1000:.1f} ms | mediana: {mediana * 1000:.1f} ms"
+              f" | {quantidade / melhor:,.0f} resultados/s")
+
+if __name__ == "__main__":
+    main_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
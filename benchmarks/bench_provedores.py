@@ -0,0 +1,55 @@
+# Benchmark do motor de pesquisa com vários provedores (MotorPesquisa)
+# Uso: python benchmarks/bench_provedores.py
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main
+
+class ProvedorLento(main.ProvedorPesquisa):
+    """Provedor falso que demora `atraso` segundos e devolve `quantidade` itens"""
+
+    def __init__(self, nome, atraso, quantidade=100, inicio_hash=0, timeout=5):
+        self.nome = nome
+        self.atraso = atraso
+        self.quantidade = quantidade
+        self.inicio_hash = inicio_hash
+        self.timeout = timeout
+
+    def pesquisar(self, termo):
+        time.sleep(self.atraso)
+        return [
+            {'name': f"{termo} {self.nome} {i}", 'info_hash': f"{self.inicio_hash + i:040X}",
+             'size': '1000', 'seeders': '1', 'leechers': '0', 'added': '0'}
+            for i in range(self.quantidade)
+        ]
+
+def main_benchmark():
+    atrasos = [0.2, 0.5, 0.8]
+    # Hashes sobrepostos entre provedores para exercitar a deduplicação
+    provedores = [ProvedorLento(f"stub{i}", atraso, 100, inicio_hash=i * 50)
+                  for i, atraso in enumerate(atrasos)]
+    motor = main.MotorPesquisa(provedores)
+
+    chegadas = []
+    inicio = time.perf_counter()
+    resultados = motor.pesquisar("teste", lambda p, r: chegadas.append((p.nome, time.perf_counter() - inicio)))
+    total = time.perf_counter() - inicio
+
+    print(f"MotorPesquisa: {len(provedores)} provedores, atrasos {atrasos}")
+    for nome, instante in chegadas:
+        print(f"  {nome} respondeu em {instante * 1000:.0f} ms")
+    print(f"  total: {total * 1000:.0f} ms (max: {max(atrasos) * 1000:.0f} ms, soma: {sum(atrasos) * 1000:.0f} ms)")
+    print(f"  {len(resultados)} resultados após deduplicação (de {sum(p.quantidade for p in provedores)})")
+    assert total < sum(atrasos)
+
+    # Provedor que estoura o próprio timeout não segura os demais
+    motor = main.MotorPesquisa([ProvedorLento("rapido", 0.1), ProvedorLento("travado", 3, timeout=0.5)])
+    inicio = time.perf_counter()
+    resultados = motor.pesquisar("teste")
+    total = time.perf_counter() - inicio
+    print(f"  com provedor travado (timeout 0.5 s): {total * 1000:.0f} ms, {len(resultados)} resultados")
+
+if __name__ == "__main__":
+    main_benchmark()
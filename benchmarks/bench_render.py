@@ -0,0 +1,131 @@
+# Benchmark do desenho das telas: cls/clear + um print por linha x Quadro
+# escrito de uma vez (com redesenho só das linhas alteradas)
+# Uso: python benchmarks/bench_render.py [paginas]
+import io
+import builtins
+import tempfile
+import os
+import sys
+import time
+
+# Janela grande o bastante para a página de resultados (81 linhas) caber inteira
+os.environ.setdefault("COLUMNS", "160")
+os.environ.setdefault("LINES", "100")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main
+from geradores import gerar_resultados
+
+ITENS_POR_PAGINA = 10  # O mesmo de pesquisar_torrents
+
+class TerminalFalso(io.RawIOBase):
+    """Conta as chamadas de write que chegariam ao terminal"""
+
+    def __init__(self):
+        self.escritas = 0
+        self.bytes = 0
+
+    def writable(self):
+        return True
+
+    def isatty(self):
+        return True
+
+    def write(self, dados):
+        self.escritas += 1
+        self.bytes += len(dados)
+        return len(dados)
+
+def novo_stdout():
+    terminal = TerminalFalso()
+    return terminal, io.TextIOWrapper(io.BufferedWriter(terminal), encoding="utf-8", line_buffering=True)
+
+def linhas_pagina(resultados, ordem, pagina):
+    """As mesmas linhas que pesquisar_torrents mostra numa página"""
+    total_paginas = (len(ordem) + ITENS_POR_PAGINA - 1) // ITENS_POR_PAGINA
+    linhas = [main.ASCII_ART, "\n[*] Resultados para: teste", f"[*] Página {pagina} de {total_paginas}", "=" * 50]
+    inicio = (pagina - 1) * ITENS_POR_PAGINA
+    for i, indice in enumerate(ordem[inicio:inicio + ITENS_POR_PAGINA], inicio + 1):
+        linhas.append(f"\n[{i}] {resultados.nome(indice) or 'N/A'}")
+        linhas.append(f"    Tamanho: {main.format_size(resultados.tamanhos[indice])} | Score: {resultados.scores[indice]}/100")
+        linhas.append(f"    Seeds: {resultados.seeds[indice]} | Leeches: {resultados.leeches[indice]}")
+        linhas.append("-" * 50)
+    linhas += ["\nNavegação:", "A - Página anterior", "P - Próxima página", "E - Escolher torrent",
+               "S - Ordenar por score", "F - Filtrar por score mínimo", "V - Voltar ao menu",
+               f"\nPágina {pagina}/{total_paginas} - Total de {len(ordem)} resultados"]
+    return linhas
+
+def antigo(paginas, telas):
+    """Caminho antigo: cls/clear num processo novo e um print por linha"""
+    terminal, saida = novo_stdout()
+    processos = 0
+    inicio = time.perf_counter()
+    for linhas in telas:
+        os.system("clear >/dev/null 2>&1")
+        processos += 1
+        for linha in linhas:
+            print(main.Fore.RED + linha, file=saida)
+    return time.perf_counter() - inicio, terminal, processos
+
+def novo(paginas, telas):
+    terminal, saida = novo_stdout()
+    sistema = os.system
+    processos = []
+    os.system = lambda comando: processos.append(comando) or sistema(comando)
+    try:
+        main._quadro_anterior = None
+        inicio = time.perf_counter()
+        for linhas in telas:
+            tela = main.Quadro("resultados")
+            for linha in linhas:
+                tela.escrever(linha)
+            main.desenhar(tela, saida)
+        decorrido = time.perf_counter() - inicio
+    finally:
+        os.system = sistema
+    return decorrido, terminal, len(processos)
+
+def teclas_links(quantidade, teclas=200):
+    """Custo por tecla de mostrar_links paginando uma folha com `quantidade` links"""
+    links = [{'url': f"https://host{i % 50}.exemplo.com/arquivo/{i}", 'descrição': 'espelho' if i % 3 == 0 else ''}
+             for i in range(quantidade)]
+    roteiro = iter(['I', str(quantidade // 2)] + ['P', 'A'] * (teclas // 2) + ['V'])
+    terminal, saida = novo_stdout()
+    entrada, desenhar = builtins.input, main.desenhar
+    builtins.input = lambda prompt='': next(roteiro)
+    main.desenhar = lambda tela: desenhar(tela, saida)
+    try:
+        inicio = time.perf_counter()
+        main.mostrar_links("Folha", links, ["Benchmark"])
+        return (time.perf_counter() - inicio) / (teclas + 3)
+    finally:
+        builtins.input, main.desenhar = entrada, desenhar
+
+def main_benchmark(paginas=200):
+    resultados = main.ResultadosTorrent()
+    resultados.adicionar(gerar_resultados(paginas * ITENS_POR_PAGINA))
+    resultados.concluir()
+    ordem = resultados.ordem(0, False)
+    telas = [linhas_pagina(resultados, ordem, pagina) for pagina in range(1, paginas + 1)]
+    linhas = sum(linha.count("\n") + 1 for tela in telas for linha in tela)
+
+    print(f"Paginação de resultados: {paginas} telas, {linhas / paginas:.0f} linhas por tela "
+          f"(janela {os.environ['COLUMNS']}x{os.environ['LINES']})")
+    for nome, funcao in (("cls + print  ", antigo), ("quadro + diff", novo)):
+        decorrido, terminal, processos = funcao(paginas, telas)
+        print(f"  {nome} {decorrido / paginas * 1000:7.3f} ms/tela | writes/tela: {terminal.escritas / paginas:5.1f}"
+              f" | processos/tela: {processos / paginas:.0f} | {terminal.bytes / paginas / 1024:5.1f} KiB/tela")
+    # Sem diff: o mesmo quadro que não cabe na janela é sempre redesenhado inteiro
+    os.environ["LINES"] = "24"
+    decorrido, terminal, _ = novo(paginas, telas)
+    print(f"  quadro (janela de 24 linhas) {decorrido / paginas * 1000:7.3f} ms/tela"
+          f" | writes/tela: {terminal.escritas / paginas:5.1f} | {terminal.bytes / paginas / 1024:5.1f} KiB/tela")
+
+    # Paginação virtual: o custo por tecla não depende do tamanho da folha
+    os.chdir(tempfile.mkdtemp())  # saude_links e o histórico usam um bronze.db novo
+    print(f"mostrar_links ({main.LINKS_POR_PAGINA} links por página)")
+    for quantidade in (100, 10_000, 1_000_000):
+        print(f"  {quantidade:>9} links: {teclas_links(quantidade) * 1000:6.3f} ms/tecla")
+
+if __name__ == "__main__":
+    main_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,51 @@
+# Benchmark da carga do cache: snapshot SQLite (lazy) x pickle antigo
+# Uso: python benchmarks/bench_snapshot.py [multiplicador]
+import os
+import sys
+import time
+import pickle
+import tempfile
+from collections.abc import Mapping
+from datetime import datetime
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+import main
+from geradores import copias_dados
+
+def cronometrar(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return resultado, time.perf_counter() - inicio
+
+def main_benchmark(multiplicador=1000):
+    arvore = copias_dados(multiplicador)
+    os.chdir(tempfile.mkdtemp())
+
+    # Caminho antigo: pickle com a árvore inteira
+    _, t_pickle_grava = cronometrar(lambda: pickle.dump(
+        {'dados': arvore, 'timestamp': datetime.now()}, open('bronze_cache_antigo.pkl', 'wb')))
+    _, t_pickle_carga = cronometrar(lambda: pickle.load(open('bronze_cache_antigo.pkl', 'rb')))
+
+    # Snapshot: abrir e chegar até uma lista de links profunda
+    _, t_snap_grava = cronometrar(lambda: main.salvar_cache(arvore, '"etag"'))
+
+    def abrir_e_navegar():
+        dados = main.carregar_cache()
+        return dados[f"Cópia {multiplicador // 2}"]['Jogos']['Emuladores']['Multisistemas']
+    links, t_snap_carga = cronometrar(abrir_e_navegar)
+    assert links == arvore['Cópia 0']['Jogos']['Emuladores']['Multisistemas']
+
+    def materializar(no):
+        return {k: materializar(v) for k, v in no.items()} if isinstance(no, Mapping) else no
+    _, t_snap_total = cronometrar(lambda: materializar(main.carregar_cache()))
+
+    print(f"Árvore: {multiplicador}x dados.json "
+          f"({os.path.getsize('bronze_cache_antigo.pkl') / 1e6:.1f} MB em pickle, "
+          f"{os.path.getsize(main.CACHE_FILE) / 1e6:.1f} MB em snapshot)")
+    print(f"  pickle   grava: {t_pickle_grava * 1000:8.1f} ms | carga fria: {t_pickle_carga * 1000:8.1f} ms")
+    print(f"  snapshot grava: {t_snap_grava * 1000:8.1f} ms | abrir + navegar 4 níveis: {t_snap_carga * 1000:8.1f} ms"
+          f" | materializar tudo: {t_snap_total * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
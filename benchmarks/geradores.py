@@ -0,0 +1,123 @@
+# Geradores de dados sintéticos usados pelos benchmarks
+import os
+import sys
+import json
+import random
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+import main
+
+PALAVRAS = [
+    'The', 'Movie', 'Game', 'Season', 'S01E02', '2023', '1080p', '2160p',
+    'x264', 'x265', 'HEVC', 'WEB', 'DL', 'BluRay', 'AAC', 'HDR', 'Repack',
+    'Deluxe', 'Edition', 'v1', 'Multi', 'PT', 'BR'
+]
+EXTENSOES = ['', '', '.mkv', '.mp4', '.iso', '.bin', '.exe.zip']
+
+# Vocabulário das pastas e links do dados.json
+TEMAS = [
+    'filmes', 'series', 'anime', 'cursos', 'jogos', 'emuladores', 'livros', 'musica',
+    'esportes', 'documentarios', 'programacao', 'python', 'linux', 'torrent', 'legendas',
+    'dublado', 'retro', 'nintendo', 'playstation', 'idiomas', 'receitas', 'podcasts'
+]
+DOMINIOS = ['.com', '.com.br', '.net', '.org', '.tv', '.me', '.io']
+
+def gerar_resultados(quantidade, semente=42):
+    """Gera resultados sintéticos no formato da apibay"""
+    aleatorio = random.Random(semente)
+    grupos = list(main.NOMES_GRUPOS) + main.MALICIOSOS['CONHECIDOS'] + main.MALICIOSOS['PADRÕES_SUSPEITOS']
+    resultados = []
+    for i in range(quantidade):
+        partes = aleatorio.choices(PALAVRAS, k=aleatorio.randint(3, 8))
+        if aleatorio.random() < 0.6:
+            partes.append(aleatorio.choice(grupos))
+        resultados.append({
+            'id': str(i),
+            'name': aleatorio.choice('.- ').join(partes) + aleatorio.choice(EXTENSOES),
+            'info_hash': f"{aleatorio.getrandbits(160):040X}",
+            'leechers': str(aleatorio.randint(0, 500)),
+            'seeders': str(aleatorio.randint(0, 5000)),
+            'num_files': str(aleatorio.randint(1, 50)),
+            'size': str(aleatorio.randint(1_000_000, 150_000_000_000)),
+            'username': 'anon',
+            'added': str(aleatorio.randint(1_200_000_000, 1_700_000_000)),
+            'status': 'member',
+            'category': '200',
+            'imdb': ''
+        })
+    return resultados
+
+def _link(aleatorio, i):
+    host = f"{aleatorio.choice(TEMAS)}{aleatorio.randint(0, 9999)}{aleatorio.choice(DOMINIOS)}"
+    url = f"https://{host}/{aleatorio.choice(TEMAS)}/{i}"
+    if aleatorio.random() < 0.1:
+        return {'url': url, 'descrição': " ".join(aleatorio.choices(TEMAS, k=4))}
+    return url
+
+def gerar_arvore_links(links, semente=7, por_folha=500):
+    """Árvore no formato do dados.json: categorias > subcategorias > listas de links"""
+    aleatorio = random.Random(semente)
+    arvore = {}
+    for folha in range((links + por_folha - 1) // por_folha):
+        categoria = f"{aleatorio.choice(TEMAS).title()} {folha % 40}"
+        subcategoria = f"{aleatorio.choice(TEMAS).title()} {folha}"
+        itens = [_link(aleatorio, i) for i in range(min(por_folha, links - folha * por_folha))]
+        arvore.setdefault(categoria, {})[subcategoria] = itens
+    return arvore
+
+def gerar_arvore_profunda(profundidade=4, largura=8, links_por_folha=10, semente=3):
+    """dados.json com `largura` pastas por nível até `profundidade` níveis
+
+    As folhas misturam listas, links soltos e textos, como o dataset real.
+    """
+    aleatorio = random.Random(semente)
+    contador = iter(range(1 << 62))
+
+    def pasta(nivel):
+        if nivel == profundidade:
+            sorteio = aleatorio.random()
+            if sorteio < 0.8:
+                return [_link(aleatorio, next(contador)) for _ in range(links_por_folha)]
+            if sorteio < 0.9:
+                return f"https://{aleatorio.choice(TEMAS)}.exemplo{aleatorio.choice(DOMINIOS)}/{next(contador)}"
+            return " ".join(aleatorio.choices(TEMAS, k=6))
+        return {f"{aleatorio.choice(TEMAS).title()} {nivel}.{i}": pasta(nivel + 1) for i in range(largura)}
+
+    return pasta(0)
+
+def caminho_mais_fundo(arvore):
+    """Chaves da primeira folha no nível mais fundo"""
+    caminho = []
+    no = arvore
+    while isinstance(no, dict):
+        chave = next(iter(no))
+        caminho.append(chave)
+        no = no[chave]
+    return caminho
+
+def copias_dados(multiplicador):
+    """Repete o dados.json do repositório `multiplicador` vezes sob chaves distintas"""
+    with open(os.path.join(RAIZ, 'dados.json'), encoding='utf-8') as f:
+        texto = f.read()
+    # Cópias independentes: o pickle deduplicaria objetos repetidos
+    return {f"Cópia {i}": json.loads(texto) for i in range(multiplicador)}
+
+def gerar_favoritos(quantidade, categorias=50, semente=11):
+    """[(url, título, categoria)] com categorias e subcategorias no formato 'A > B'"""
+    aleatorio = random.Random(semente)
+    nomes = [f"{aleatorio.choice(TEMAS).title()} {i}" for i in range(categorias)]
+    favoritos = []
+    for i in range(quantidade):
+        categoria = aleatorio.choice(nomes)
+        if aleatorio.random() < 0.5:
+            categoria += f" > {aleatorio.choice(TEMAS).title()}"
+        favoritos.append((f"https://{aleatorio.choice(TEMAS)}{i}{aleatorio.choice(DOMINIOS)}/",
+                          f"Link {i}", categoria))
+    return favoritos
+
+def gerar_caminhos(quantidade, semente=13):
+    """Caminhos de navegação ('Pasta > Sub > Folha') para o histórico"""
+    aleatorio = random.Random(semente)
+    return [[f"{aleatorio.choice(TEMAS).title()} {i % 97}", aleatorio.choice(TEMAS).title(), f"Folha {i}"]
+            for i in range(quantidade)]
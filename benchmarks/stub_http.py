@@ -0,0 +1,53 @@
+# Servidor HTTP local que faz o papel da rede nos benchmarks
+#     /<qualquer caminho registrado>  -> corpo fixo (dados.json, resposta da apibay...)
+#     /ok /sem-head /morto /lento     -> alvos da verificação de links
+import time
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+class Stub(BaseHTTPRequestHandler):
+    """/ok responde 200, /sem-head recusa HEAD, /morto dá 404 e /lento demora; o resto vem de `corpos`"""
+    protocol_version = "HTTP/1.1"
+    corpos = {}  # caminho (sem a query) -> bytes
+
+    def responder(self, status, corpo=b"", tipo="application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        if self.command != "HEAD":
+            for i in range(0, len(corpo), 1 << 16):
+                self.wfile.write(corpo[i:i + (1 << 16)])
+
+    def do_HEAD(self):
+        if self.path.startswith("/sem-head"):
+            self.responder(405)
+        else:
+            self.do_GET()
+
+    def do_GET(self):
+        caminho = self.path.split("?", 1)[0]
+        if caminho in self.corpos:
+            self.responder(200, self.corpos[caminho])
+        elif caminho.startswith("/lento"):
+            time.sleep(0.2)
+            self.responder(200)
+        elif caminho.startswith("/ok") or caminho.startswith("/sem-head"):
+            self.responder(200)
+        else:
+            self.responder(404)
+
+    def log_message(self, *args):
+        pass
+
+def servir(corpos=None, host="127.0.0.1"):
+    """Sobe um Stub em segundo plano; `corpos` é {caminho: bytes}"""
+    handler = type("StubLocal", (Stub,), {"corpos": dict(corpos or {})})
+    servidor = ThreadingHTTPServer((host, 0), handler)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+def url(servidor, caminho=""):
+    host, porta = servidor.server_address[:2]
+    return f"http://{host}:{porta}{caminho}"
@@ -0,0 +1,362 @@
+# Suíte de benchmarks dos caminhos quentes, com dados sintéticos e a rede
+# trocada por um servidor HTTP local (roda offline). Cada execução grava
+# benchmarks/resultados/ultima.json e é comparada com a linha de base.
+# Uso: python benchmarks/suite.py [--salvar] [--comparar ARQUIVO] [--filtro TEXTO]
+#                                 [--escala 0.1] [--repeticoes 5] [--tolerancia 0.15]
+import io
+import os
+import sys
+import json
+import time
+import builtins
+import platform
+import argparse
+import tempfile
+from datetime import datetime
+from contextlib import redirect_stdout
+from collections.abc import Mapping
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+PASTA_RESULTADOS = os.path.join(PASTA, "resultados")
+LINHA_DE_BASE = os.path.join(PASTA_RESULTADOS, "baseline.json")
+ULTIMA = os.path.join(PASTA_RESULTADOS, "ultima.json")
+
+# Janela grande o bastante para os quadros caberem (redesenho por diferença)
+os.environ.setdefault("COLUMNS", "160")
+os.environ.setdefault("LINES", "100")
+
+sys.path.insert(0, os.path.dirname(PASTA))
+sys.path.insert(0, PASTA)
+import main
+import geradores
+import stub_http
+from bench_render import novo_stdout
+
+CASOS = []
+
+def caso(nome):
+    """Registra um caso: a função prepara os dados e devolve (rodar, operações por rodada)"""
+    def registrar(funcao):
+        CASOS.append((nome, funcao))
+        return funcao
+    return registrar
+
+def tamanho(base, escala):
+    return max(1, int(base * escala))
+
+class SemPausas:
+    """Tira os time.sleep das telas (pausas para o usuário ler avisos) durante a medição"""
+
+    class _Tempo:
+        def __getattr__(self, nome):
+            return getattr(time, nome)
+
+        @staticmethod
+        def sleep(segundos):
+            pass
+
+    def __enter__(self):
+        self.tempo, main.time = main.time, self._Tempo()
+        return self
+
+    def __exit__(self, *erro):
+        main.time = self.tempo
+
+class Teclado:
+    """Substitui o input() por um roteiro de teclas; o desenho vai para um terminal falso"""
+
+    def __init__(self, teclas):
+        self.teclas = teclas
+        self.saida = novo_stdout()[1]
+
+    def __enter__(self):
+        roteiro = iter(self.teclas)
+        self.entrada, self.desenhar = builtins.input, main.desenhar
+        builtins.input = lambda prompt='': next(roteiro)
+        main.desenhar = lambda tela: self.desenhar(tela, self.saida)
+        return self
+
+    def __exit__(self, *erro):
+        builtins.input, main.desenhar = self.entrada, self.desenhar
+
+# Segurança e formatação
+@caso("seguranca.verificar_seguranca")
+def _verificar_seguranca(escala, dados):
+    torrents = dados.resultados(tamanho(2000, escala))
+    return lambda: [main.verificar_seguranca(t) for t in torrents], len(torrents)
+
+@caso("seguranca.analisar_torrent")
+def _analisar_torrent(escala, dados):
+    torrents = dados.resultados(tamanho(2000, escala))
+    return lambda: [main.analisar_torrent(t) for t in torrents], len(torrents)
+
+@caso("seguranca.analisar_torrents.python")
+def _analisar_torrents_python(escala, dados):
+    torrents = dados.resultados(tamanho(50_000, escala))
+    return lambda: main.analisar_torrents(torrents, usar_numpy=False), len(torrents)
+
+@caso("seguranca.analisar_torrents.numpy")
+def _analisar_torrents_numpy(escala, dados):
+    if main.np is None:
+        return None
+    torrents = dados.resultados(tamanho(50_000, escala))
+    return lambda: main.analisar_torrents(torrents, usar_numpy=True), len(torrents)
+
+@caso("format_size")
+def _format_size(escala, dados):
+    tamanhos = [int(t['size']) >> (i % 40) for i, t in enumerate(dados.resultados(tamanho(20_000, escala)))]
+    return lambda: [main.format_size(t) for t in tamanhos], len(tamanhos)
+
+# Snapshot do dados.json
+@caso("cache.salvar")
+def _cache_salvar(escala, dados):
+    arvore = dados.arvore()
+    return lambda: main.salvar_cache(arvore, '"etag"'), 1
+
+@caso("cache.abrir_e_navegar")
+def _cache_abrir(escala, dados):
+    arvore = dados.arvore()
+    main.salvar_cache(arvore, '"etag"')
+    caminho = geradores.caminho_mais_fundo(arvore)
+
+    def rodar():
+        no = main.carregar_cache()
+        for chave in caminho:
+            no = no[chave]
+        return no
+    return rodar, 1
+
+@caso("cache.materializar")
+def _cache_materializar(escala, dados):
+    main.salvar_cache(dados.arvore(), '"etag"')
+
+    def materializar(no):
+        return {k: materializar(v) for k, v in no.items()} if isinstance(no, Mapping) else no
+    return lambda: materializar(main.carregar_cache()), 1
+
+# Favoritos e histórico (bronze.db)
+@caso("db.favoritos.adicionar")
+def _favoritos_adicionar(escala, dados):
+    favoritos = geradores.gerar_favoritos(tamanho(500, escala))
+
+    def rodar():
+        main.BronzeDB().executar('DELETE FROM favoritos')
+        with redirect_stdout(io.StringIO()), SemPausas():  # "[+] Link adicionado aos favoritos!"
+            for url, titulo, categoria in favoritos:
+                main.adicionar_favorito(url, titulo, categoria)
+    return rodar, len(favoritos)
+
+@caso("db.favoritos.paginar")
+def _favoritos_paginar(escala, dados):
+    db = main.BronzeDB()
+    favoritos = geradores.gerar_favoritos(tamanho(20_000, escala))
+    agora = datetime.now()
+    with db.transacao() as conn:
+        conn.execute('DELETE FROM favoritos')
+        conn.executemany('INSERT INTO favoritos (url, titulo, categoria, data_adicao) VALUES (?, ?, ?, ?)',
+                         [(*favorito, agora) for favorito in favoritos])
+    categoria = favoritos[0][2].split(" > ")[0]
+
+    def rodar():
+        paginas = 0
+        for filtro in (None, categoria):
+            main.contar_favoritos(filtro)
+            inicio = None
+            while paginas < 200:
+                pagina = main.pagina_favoritos(filtro, inicio)
+                paginas += 1
+                if len(pagina) < main.FAVORITOS_POR_PAGINA:
+                    break
+                inicio = (pagina[-1][3], pagina[-1][0])
+        return paginas
+    return rodar, 1
+
+@caso("db.historico.registrar")
+def _historico_registrar(escala, dados):
+    caminhos = geradores.gerar_caminhos(tamanho(2000, escala))
+    db = main.BronzeDB()
+
+    def rodar():
+        for caminho in caminhos:
+            main.adicionar_historico(caminho)
+        db.descarregar_historico()
+    return rodar, len(caminhos)
+
+@caso("db.historico.resumo")
+def _historico_resumo(escala, dados):
+    db = main.BronzeDB()
+    for caminho in geradores.gerar_caminhos(tamanho(2000, escala)):
+        main.adicionar_historico(caminho)
+    db.descarregar_historico()
+
+    def rodar():
+        with redirect_stdout(io.StringIO()), Teclado(['V']):
+            main.mostrar_historico()
+        return db.consultar('SELECT caminho, total_acessos FROM historico_resumo '
+                            'ORDER BY total_acessos DESC LIMIT ?', (main.PREFETCH_CAMINHOS,))
+    return rodar, 1
+
+# Telas
+@caso("tela.menu")
+def _tela_menu(escala, dados):
+    pasta = {f"Pasta {i}": ["https://exemplo.com/"] * 3 for i in range(tamanho(5000, escala))}
+    teclas = ['P', 'A'] * 50 + ['0']
+
+    def rodar():
+        with Teclado(teclas), redirect_stdout(io.StringIO()), SemPausas():
+            main.mostrar_menu(pasta)
+    return rodar, len(teclas)
+
+@caso("tela.links")
+def _tela_links(escala, dados):
+    folha = geradores.gerar_arvore_links(tamanho(20_000, escala), por_folha=tamanho(20_000, escala))
+    links = next(iter(next(iter(folha.values())).values()))
+    teclas = ['I', str(len(links) // 2)] + ['P', 'A'] * 50 + ['V']
+
+    def rodar():
+        with Teclado(teclas), SemPausas():
+            main.mostrar_links("Folha", links, ["Benchmark"])
+    return rodar, len(teclas)
+
+# Rede (servidor local)
+@caso("rede.baixar_dados")
+def _baixar_dados(escala, dados):
+    main.DATA_URL = stub_http.url(dados.servidor, "/dados.json")
+    main.DATA_PATCH_URL = stub_http.url(dados.servidor, "/dados.patch.json")  # 404: vai direto ao completo
+    return lambda: main.atualizar_dados_async(None).result(), 1
+
+@caso("rede.pesquisa_em_fluxo")
+def _pesquisa(escala, dados):
+    provedor = main.ProvedorApibay([stub_http.url(dados.servidor, "/q.php?q={termo}")], paralelo=False)
+    motor = main.MotorPesquisa([provedor])
+
+    def rodar():
+        resultados = main.ResultadosTorrent()
+        motor.preencher("teste", resultados)
+        resultados.concluir()
+        return resultados
+    return rodar, len(dados.resultados(dados.tamanho_pesquisa))
+
+@caso("rede.verificar_links")
+def _verificar_links(escala, dados):
+    tipos = ["ok"] * 9 + ["sem-head"]
+    urls = [stub_http.url(dados.servidor, f"/{tipos[i % len(tipos)]}/{i}") for i in range(tamanho(500, escala))]
+    return lambda: main.verificar_links_async(urls).result(), len(urls)
+
+class Dados:
+    """Dados sintéticos gerados uma vez e compartilhados entre os casos"""
+
+    def __init__(self, escala):
+        self._resultados = geradores.gerar_resultados(tamanho(50_000, escala))
+        self._arvore = geradores.gerar_arvore_profunda(profundidade=4, largura=tamanho(8, escala ** 0.25))
+        self.tamanho_pesquisa = tamanho(50_000, escala)
+        self.servidor = stub_http.servir({
+            "/dados.json": json.dumps(self._arvore, ensure_ascii=False).encode(),
+            "/q.php": json.dumps(self.resultados(self.tamanho_pesquisa)).encode(),
+        })
+
+    def resultados(self, quantidade):
+        return self._resultados[:quantidade]
+
+    def arvore(self):
+        return self._arvore
+
+def medir(rodar, repeticoes):
+    rodar()  # Aquecimento: caches, conexões e imports tardios
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        rodar()
+        tempos.append(time.perf_counter() - inicio)
+    tempos.sort()
+    return tempos[0], tempos[len(tempos) // 2]
+
+def comparar(atual, base, tolerancia):
+    """Linhas do relatório e nomes dos casos que ficaram mais lentos que a tolerância"""
+    regressoes = []
+    linhas = []
+    for nome, medida in atual['casos'].items():
+        anterior = base['casos'].get(nome)
+        if not anterior:
+            linhas.append(f"  {nome:38} (novo)")
+            continue
+        variacao = medida['por_op_us'] / anterior['por_op_us'] - 1
+        marca = ""
+        if variacao > tolerancia:
+            marca = "  <-- REGRESSÃO"
+            regressoes.append(nome)
+        elif variacao < -tolerancia:
+            marca = "  (melhorou)"
+        linhas.append(f"  {nome:38} {anterior['por_op_us']:12.2f} -> {medida['por_op_us']:12.2f} µs/op"
+                      f" ({variacao:+.0%}){marca}")
+    return linhas, regressoes
+
+def salvar(resultado, arquivo):
+    os.makedirs(os.path.dirname(arquivo), exist_ok=True)
+    with open(arquivo, 'w', encoding='utf-8') as f:
+        json.dump(resultado, f, ensure_ascii=False, indent=2)
+
+def criar_parser():
+    parser = argparse.ArgumentParser(description="Suíte de benchmarks do Painel do Bronze (offline)")
+    parser.add_argument("--salvar", action="store_true", help="grava esta execução como a nova linha de base")
+    parser.add_argument("--comparar", metavar="ARQUIVO", default=LINHA_DE_BASE,
+                        help="linha de base para comparar (padrão: resultados/baseline.json)")
+    parser.add_argument("--filtro", default="", help="só os casos cujo nome contém este texto")
+    parser.add_argument("--escala", type=float, default=1.0, help="multiplica o tamanho dos dados (ex.: 0.1)")
+    parser.add_argument("--repeticoes", type=int, default=5, help="rodadas medidas por caso (mediana)")
+    parser.add_argument("--tolerancia", type=float, default=0.15,
+                        help="variação aceita antes de acusar regressão (0.15 = 15%%)")
+    return parser
+
+def main_benchmark(args):
+    os.chdir(tempfile.mkdtemp())  # bronze.db e bronze_cache.db novos
+    dados = Dados(args.escala)
+    resultado = {
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'maquina': f"{platform.system()} {platform.machine()} ({os.cpu_count()} CPUs)",
+        'numpy': main.np is not None,
+        'escala': args.escala,
+        'repeticoes': args.repeticoes,
+        'casos': {},
+    }
+
+    print(f"Suíte de benchmarks: escala {args.escala}, {args.repeticoes} repetições, {resultado['maquina']}")
+    for nome, preparar in CASOS:
+        if args.filtro not in nome:
+            continue
+        preparado = preparar(args.escala, dados)
+        if preparado is None:
+            print(f"  {nome:38} (indisponível aqui)")
+            continue
+        rodar, operacoes = preparado
+        melhor, mediana = medir(rodar, args.repeticoes)
+        resultado['casos'][nome] = {
+            'operacoes': operacoes,
+            'mediana_s': mediana,
+            'melhor_s': melhor,
+            'por_op_us': mediana / operacoes * 1e6,
+        }
+        print(f"  {nome:38} mediana: {mediana * 1000:9.2f} ms | melhor: {melhor * 1000:9.2f} ms"
+              f" | {mediana / operacoes * 1e6:10.2f} µs/op ({operacoes} ops)")
+    dados.servidor.shutdown()
+
+    salvar(resultado, ULTIMA)
+    regressoes = []
+    if os.path.exists(args.comparar) and not args.salvar:
+        with open(args.comparar, encoding='utf-8') as f:
+            base = json.load(f)
+        if base.get('escala') != args.escala:
+            print(f"\n[!] A linha de base usou escala {base.get('escala')}; a comparação não vale muito")
+        linhas, regressoes = comparar(resultado, base, args.tolerancia)
+        print(f"\nComparação com {os.path.relpath(args.comparar, PASTA)} ({base['data']}):")
+        print("\n".join(linhas))
+        if regressoes:
+            print(f"\n[!] {len(regressoes)} caso(s) mais de {args.tolerancia:.0%} mais lentos")
+    if args.salvar:
+        salvar(resultado, LINHA_DE_BASE)
+        print(f"\n[+] Linha de base gravada em {os.path.relpath(LINHA_DE_BASE, PASTA)}")
+    return 1 if regressoes else 0
+
+if __name__ == "__main__":
+    sys.exit(main_benchmark(criar_parser().parse_args()))
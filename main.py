@@ -2,30 +2,136 @@
 import os
 import sys
 import json
+import re
 import time
 import ctypes
 import subprocess
-from colorama import init, Fore
-from rich.console import Console
-from rich.progress import Progress
-import requests
-import pickle
-from datetime import datetime
+import importlib.util
+import codecs
+import argparse
+import shutil
+from colorama import init, Fore, Style
+from datetime import datetime, timedelta
 import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from concurrent.futures import TimeoutError as FuturoTimeout, CancelledError
+from functools import partial, wraps
+from array import array
+from bisect import bisect_right
 import sqlite3
+import atexit
+from contextlib import contextmanager, nullcontext, redirect_stdout
 from pathlib import Path
+from collections import deque
+from collections.abc import Mapping
+import hashlib
+import zlib
+import math
+import unicodedata
+from abc import ABC, abstractmethod
+
+class _ModuloTardio:
+    """Importa o módulo só no primeiro acesso a um atributo (início mais rápido)"""
+
+    def __init__(self, nome):
+        self._nome = nome
+        self._modulo = None
+
+    def __getattr__(self, atributo):
+        if self._modulo is None:
+            self._modulo = importlib.import_module(self._nome)
+        return getattr(self._modulo, atributo)
+
+# requests, asyncio e rich só são carregados quando a rede ou uma barra de
+# progresso são usadas pela primeira vez
+requests = _ModuloTardio("requests")
+asyncio = _ModuloTardio("asyncio")  # Só o núcleo de E/S assíncrona usa
+
+# NumPy é opcional: acelera a pontuação em lote quando instalado
+np = _ModuloTardio("numpy") if importlib.util.find_spec("numpy") else None
 
 # Inicialização
 init(autoreset=True)
-console = Console()
+_console = None
+
+def obter_console():
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
+
+def nova_barra_progresso(**kwargs):
+    from rich.progress import Progress
+    return Progress(console=obter_console(), **kwargs)
+
+# Início rápido: sem a animação de abertura nem o texto lento, e com o
+# dataset aquecido em segundo plano enquanto o menu aparece.
+# Ative com BRONZE_RAPIDO=1 ou --rapido (tratado pelo argparse no __main__).
+INICIO_RAPIDO = os.environ.get("BRONZE_RAPIDO") == "1"
 
 # URL do JSON e constantes
 DATA_URL = "https://raw.githubusercontent.com/brulho/PAINEL-BRONZE/refs/heads/main/dados.json"
+DATA_PATCH_URL = DATA_URL.rsplit('/', 1)[0] + "/dados.patch.json"  # Mudanças desde a última versão
 
 # Constantes para cache e banco de dados
-CACHE_FILE = "bronze_cache.pkl"
+CACHE_FILE = "bronze_cache.db"
+CACHE_LEGADO = "bronze_cache.pkl"  # Formato antigo (pickle), apagado na primeira execução
 DB_FILE = "bronze.db"
+# Conexões do bronze.db (uma por thread, abertas uma única vez)
+DB_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",  # Seguro com WAL; só o último commit pode se perder numa queda de energia
+    "PRAGMA cache_size=-8000",  # 8 MB
+    "PRAGMA mmap_size=67108864",  # 64 MB
+    "PRAGMA temp_store=MEMORY"
+)
+DB_STATEMENTS_EM_CACHE = 64
+HISTORICO_INTERVALO = 1.0  # Segundos acumulando acessos antes de gravar o lote
+HISTORICO_LOTE_MAX = 256
+HISTORICO_RETENCAO_DIAS = 180  # Acessos individuais mais velhos são apagados (None mantém tudo)
 CACHE_TIMEOUT = 3600  # 1 hora
+CACHE_REVALIDAR_EM_SEGUNDO_PLANO = True  # Serve o cache expirado e revalida em segundo plano
+
+# Pré-carregamento disparado no início (iniciar_sistema)
+PREFETCH_CAMINHOS = 10  # Caminhos mais acessados do histórico deixados em memória
+PREFETCH_TERMOS = 5  # Pesquisas recentes renovadas quando o cache delas expirou
+
+# Rede: sessão compartilhada com pool de conexões e novas tentativas limitadas
+REDE_TIMEOUT = 10
+REDE_TENTATIVAS = 2
+REDE_BACKOFF = 0.5  # Espera 0.5s, 1s... entre tentativas
+
+# Saúde dos links (tabela saude_links no bronze.db)
+LINKS_CONCORRENCIA = 64  # Verificações simultâneas no total
+LINKS_POR_HOST = 4  # ... e por host
+LINKS_TAXA_MAXIMA = 1000  # Requisições iniciadas por segundo, no total
+LINKS_TIMEOUT = 5  # Segundos por requisição
+LINKS_ORCAMENTO = 300  # Segundos para a varredura inteira
+LINKS_LENTO = 3.0  # Acima disso (segundos) o link é marcado como lento
+LINKS_VALIDADE_DIAS = 7  # Verificações mais antigas não marcam mais os links
+
+# Espelhos da pesquisa, em ordem de preferência. Com PESQUISA_PARALELA a
+# consulta vai para todos ao mesmo tempo e vale a primeira resposta boa.
+PESQUISA_ESPELHOS = [
+    "https://apibay.org/q.php?q={termo}",
+    "https://piratebay.party/api/search?q={termo}"
+]
+PESQUISA_PARALELA = True
+
+# Dumps locais usados como provedores extras de pesquisa (.json ou SQLite),
+# consultados junto com a apibay quando o arquivo existe
+PESQUISA_DUMPS_LOCAIS = ["torrents_dump.json", "torrents_dump.db"]
+
+# Cache de pesquisas de torrents (tabela cache_pesquisas no bronze.db)
+PESQUISA_CACHE_TTL = 900  # 15 minutos
+PESQUISA_CACHE_MAX = 200  # Máximo de termos guardados (LRU)
+PESQUISA_PEDACO = 65536  # Bytes lidos por vez das respostas em fluxo
+PESQUISA_CACHE_MAX_ITENS = 50000  # Respostas maiores não vão para o cache (seriam regravadas em JSON)
+HEADERS_PESQUISA = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
 
 # Após as outras constantes (DATA_URL, CACHE_FILE, etc) e antes das classes/funções
 CONFIÁVEIS = {
@@ -97,22 +203,194 @@ MALICIOSOS = {
     ]
 }
 
+# Métricas
+# Contadores e histogramas de latência em memória, vistos no menu
+# Estatísticas e gravados em JSON ao sair (BRONZE_METRICAS_ARQUIVO ou
+# --metricas). Com BRONZE_METRICAS=0 cada medição vira uma chamada vazia.
+METRICAS_ATIVAS = os.environ.get("BRONZE_METRICAS") != "0"
+METRICAS_ARQUIVO = os.environ.get("BRONZE_METRICAS_ARQUIVO")
+METRICAS_FAIXAS_POR_OITAVA = 8  # Faixas do histograma a cada dobro de latência (~9% de largura)
+METRICAS_PERCENTIS = (50, 95, 99)
+
+class Histograma:
+    """Latências em faixas logarítmicas: percentis sem guardar cada amostra"""
+    __slots__ = ('contagem', 'total', 'maximo', 'faixas')
+
+    def __init__(self):
+        self.contagem = 0
+        self.total = 0.0
+        self.maximo = 0.0
+        self.faixas = {}
+
+    def registrar(self, segundos):
+        self.contagem += 1
+        self.total += segundos
+        if segundos > self.maximo:
+            self.maximo = segundos
+        # Faixa 0 junta tudo abaixo de 1 µs
+        faixa = max(0, int(math.log2(segundos * 1e6) * METRICAS_FAIXAS_POR_OITAVA)) if segundos > 1e-6 else 0
+        self.faixas[faixa] = self.faixas.get(faixa, 0) + 1
+
+    def percentil(self, p):
+        """Limite superior da faixa que contém o percentil p (em segundos)"""
+        alvo = self.contagem * p / 100
+        acumulado = 0
+        for faixa in sorted(self.faixas):
+            acumulado += self.faixas[faixa]
+            if acumulado >= alvo:
+                return min(2 ** ((faixa + 1) / METRICAS_FAIXAS_POR_OITAVA) / 1e6, self.maximo)
+        return self.maximo
+
+class _Medicao:
+    __slots__ = ('metricas', 'nome', 'inicio')
+
+    def __init__(self, metricas, nome):
+        self.metricas = metricas
+        self.nome = nome
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, erro, rastro):
+        self.metricas.registrar(self.nome, time.perf_counter() - self.inicio)
+        if tipo is not None:
+            self.metricas.contar(self.nome + ".erros")
+
+_SEM_MEDICAO = nullcontext()
+
+class Metricas:
+    """Contadores e latências da sessão, seguros para uso entre threads"""
+
+    def __init__(self, ativas=True):
+        self.ativas = ativas
+        self._lock = threading.Lock()
+        self.contadores = {}
+        self.latencias = {}
+        self.inicio = time.time()
+
+    def contar(self, nome, quantidade=1):
+        if not self.ativas:
+            return
+        with self._lock:
+            self.contadores[nome] = self.contadores.get(nome, 0) + quantidade
+
+    def registrar(self, nome, segundos):
+        if not self.ativas:
+            return
+        with self._lock:
+            histograma = self.latencias.get(nome)
+            if histograma is None:
+                histograma = self.latencias[nome] = Histograma()
+            histograma.registrar(segundos)
+
+    def medir(self, nome):
+        """`with METRICAS.medir(nome):` registra a duração do bloco (e os erros)"""
+        if not self.ativas:
+            return _SEM_MEDICAO
+        return _Medicao(self, nome)
+
+    def zerar(self):
+        with self._lock:
+            self.contadores = {}
+            self.latencias = {}
+            self.inicio = time.time()
+
+    def resumo(self):
+        """Tudo em tipos simples (ms), pronto para JSON"""
+        with self._lock:
+            latencias = {
+                nome: {
+                    'n': h.contagem,
+                    'total_ms': round(h.total * 1000, 3),
+                    **{f'p{p}_ms': round(h.percentil(p) * 1000, 3) for p in METRICAS_PERCENTIS},
+                    'max_ms': round(h.maximo * 1000, 3),
+                }
+                for nome, h in sorted(self.latencias.items())
+            }
+            return {
+                'inicio': datetime.fromtimestamp(self.inicio).isoformat(timespec='seconds'),
+                'duracao_s': round(time.time() - self.inicio, 1),
+                'contadores': dict(sorted(self.contadores.items())),
+                'latencias': latencias,
+            }
+
+    def salvar(self, arquivo):
+        with open(arquivo, 'w', encoding='utf-8') as f:
+            json.dump(self.resumo(), f, ensure_ascii=False, indent=2)
+
+METRICAS = Metricas(METRICAS_ATIVAS)
+
+def medido(nome):
+    """Decorador: cada chamada da função entra no histograma `nome`"""
+    def decorador(funcao):
+        @wraps(funcao)
+        def medida(*args, **kwargs):
+            if not METRICAS.ativas:
+                return funcao(*args, **kwargs)
+            with _Medicao(METRICAS, nome):
+                return funcao(*args, **kwargs)
+        return medida
+    return decorador
+
+def _salvar_metricas_ao_sair():
+    if METRICAS.ativas and METRICAS_ARQUIVO:
+        try:
+            METRICAS.salvar(METRICAS_ARQUIVO)
+        except OSError as e:
+            print(f"[!] Erro ao salvar métricas: {str(e)}", file=sys.stderr)
+
+atexit.register(_salvar_metricas_ao_sair)
+
 # Adicionar adaptador de data/hora personalizado
 sqlite3.register_adapter(datetime, lambda val: val.isoformat())
 sqlite3.register_converter("timestamp", lambda val: datetime.fromisoformat(val.decode()))
 
 class BronzeDB:
+    """Camada de acesso ao bronze.db: uma conexão por thread e histórico gravado em lote"""
     _instance = None
-    
+    _lock = threading.Lock()
+
+    SQL_INSERIR_HISTORICO = 'INSERT INTO historico (caminho, data_acesso) VALUES (?, ?)'
+    SQL_RESUMIR_HISTORICO = '''
+        INSERT INTO historico_resumo (caminho, ultimo_acesso, total_acessos) VALUES (?, ?, 1)
+        ON CONFLICT (caminho) DO UPDATE SET
+            ultimo_acesso = excluded.ultimo_acesso,
+            total_acessos = total_acessos + 1
+    '''
+
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(BronzeDB, cls).__new__(cls)
-            cls._instance.conn = sqlite3.connect(DB_FILE, timeout=30, isolation_level=None)
-            cls._instance.conn.execute("PRAGMA journal_mode=WAL")
-            cls._instance.criar_tabelas()
+            with cls._lock:
+                if cls._instance is None:
+                    instancia = super(BronzeDB, cls).__new__(cls)
+                    instancia._local = threading.local()
+                    instancia._fila_historico = queue.SimpleQueue()
+                    instancia._escritor = None
+                    instancia._ultimo_caminho = None
+                    instancia.criar_tabelas()
+                    instancia.catalogo_disponivel = instancia.criar_tabelas_catalogo()
+                    atexit.register(instancia.descarregar_historico)
+                    cls._instance = instancia
         return cls._instance
-    
+
+    @property
+    def conn(self):
+        """Conexão da thread atual, aberta uma vez e reaproveitada (com cache de statements)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(DB_FILE, timeout=30, isolation_level=None,
+                                   cached_statements=DB_STATEMENTS_EM_CACHE)
+            for pragma in DB_PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+        return conn
+
     def criar_tabelas(self):
+        # O resumo do histórico (um registro por caminho) é montado uma vez a
+        # partir do log bruto de bancos criados antes dele
+        novo_resumo = not self.consultar_um(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'historico_resumo'")
         self.conn.executescript('''
             BEGIN;
             CREATE TABLE IF NOT EXISTS favoritos (
@@ -121,168 +399,2034 @@ class BronzeDB:
                 categoria TEXT,
                 data_adicao TIMESTAMP
             );
+            CREATE INDEX IF NOT EXISTS idx_favoritos_data
+                ON favoritos (data_adicao, url);
+            CREATE INDEX IF NOT EXISTS idx_favoritos_categoria
+                ON favoritos (categoria, data_adicao, url);
             
             CREATE TABLE IF NOT EXISTS historico (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 caminho TEXT,
                 data_acesso TIMESTAMP
             );
+            CREATE INDEX IF NOT EXISTS idx_historico_data
+                ON historico (data_acesso);
+
+            CREATE TABLE IF NOT EXISTS historico_resumo (
+                caminho TEXT PRIMARY KEY,
+                ultimo_acesso TIMESTAMP,
+                total_acessos INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS idx_historico_resumo_acesso
+                ON historico_resumo (ultimo_acesso);
+
+            CREATE TABLE IF NOT EXISTS cache_pesquisas (
+                termo TEXT PRIMARY KEY,
+                resultados TEXT,
+                data_criacao TIMESTAMP,
+                ultimo_acesso TIMESTAMP
+            );
+            CREATE INDEX IF NOT EXISTS idx_cache_pesquisas_acesso
+                ON cache_pesquisas (ultimo_acesso);
+
+            CREATE TABLE IF NOT EXISTS saude_links (
+                url TEXT PRIMARY KEY,
+                status INTEGER,
+                latencia REAL,
+                erro TEXT,
+                data_verificacao TIMESTAMP
+            );
             COMMIT;
         ''')
-    
-    def __del__(self):
-        if hasattr(self, 'conn'):
-            self.conn.close()
+        if novo_resumo:
+            self.executar('''
+                INSERT OR IGNORE INTO historico_resumo (caminho, ultimo_acesso, total_acessos)
+                SELECT caminho, MAX(data_acesso), COUNT(*) FROM historico GROUP BY caminho
+            ''')
+
+    def criar_tabelas_catalogo(self):
+        """Tabelas da busca no catálogo; retorna False se o SQLite não tiver FTS5"""
+        try:
+            self.conn.executescript('''
+                BEGIN;
+                CREATE TABLE IF NOT EXISTS catalogo_meta (
+                    chave TEXT PRIMARY KEY,
+                    valor TEXT
+                );
+
+                CREATE TABLE IF NOT EXISTS catalogo_nos (
+                    caminho TEXT PRIMARY KEY,
+                    pai TEXT,
+                    tipo INTEGER,
+                    hash TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_catalogo_nos_pai
+                    ON catalogo_nos (pai);
+
+                CREATE TABLE IF NOT EXISTS catalogo_links (
+                    id INTEGER PRIMARY KEY,
+                    caminho TEXT,
+                    url TEXT,
+                    host TEXT,
+                    descricao TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_catalogo_links_caminho
+                    ON catalogo_links (caminho);
+
+                CREATE VIRTUAL TABLE IF NOT EXISTS catalogo_fts USING fts5(
+                    caminho, url, host, descricao,
+                    content='catalogo_links', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2'
+                );
+                COMMIT;
+            ''')
+            return True
+        except sqlite3.OperationalError:
+            if self.conn.in_transaction:
+                self.conn.execute('ROLLBACK')
+            return False
+
+    @medido("db.consulta")
+    def consultar(self, sql, parametros=()):
+        return self.conn.execute(sql, parametros).fetchall()
+
+    @medido("db.consulta")
+    def consultar_um(self, sql, parametros=()):
+        return self.conn.execute(sql, parametros).fetchone()
+
+    @medido("db.escrita")
+    def executar(self, sql, parametros=()):
+        """Executa um comando isolado (autocommit); retorna o número de linhas afetadas"""
+        METRICAS.contar("db.escritas")
+        return self.conn.execute(sql, parametros).rowcount
+
+    @contextmanager
+    def transacao(self):
+        """Agrupa vários comandos numa única transação (desfeita em caso de erro)"""
+        conn = self.conn
+        with METRICAS.medir("db.transacao"):
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+        METRICAS.contar("db.escritas")
+
+    def registrar_historico(self, caminho):
+        """Enfileira um acesso ao histórico; a gravação acontece em lote, em segundo plano
+
+        Redesenhos da mesma tela (o mesmo caminho seguido) não contam como novo acesso.
+        """
+        if caminho == self._ultimo_caminho:
+            return
+        self._ultimo_caminho = caminho
+        self._fila_historico.put((caminho, datetime.now()))
+        if self._escritor is None:
+            with self._lock:
+                if self._escritor is None:
+                    self._escritor = threading.Thread(target=self._gravar_historico,
+                                                      name="bronze-historico", daemon=True)
+                    self._escritor.start()
+
+    def descarregar_historico(self, timeout=5):
+        """Espera o histórico enfileirado chegar ao banco (antes de lê-lo ou ao sair)"""
+        if self._escritor is None or threading.current_thread() is self._escritor:
+            return
+        gravado = threading.Event()
+        self._fila_historico.put(gravado)
+        gravado.wait(timeout)
+
+    def limpar_historico(self):
+        self.descarregar_historico()
+        with self.transacao() as conn:
+            conn.execute('DELETE FROM historico')
+            conn.execute('DELETE FROM historico_resumo')
+        self._ultimo_caminho = None
+
+    def compactar_historico(self, dias=HISTORICO_RETENCAO_DIAS, lote=5000):
+        """Apaga do log bruto os acessos com mais de `dias` dias; o resumo não muda
+
+        Apaga em lotes curtos para não segurar o banco. Retorna o total apagado.
+        """
+        if dias is None:
+            return 0
+        limite = datetime.fromtimestamp(time.time() - dias * 86400)
+        total = 0
+        while True:
+            apagados = self.executar('''
+                DELETE FROM historico WHERE id IN (
+                    SELECT id FROM historico WHERE data_acesso < ? LIMIT ?
+                )
+            ''', (limite, lote))
+            total += apagados
+            if apagados < lote:
+                return total
+
+    def _gravar_historico(self):
+        try:
+            self.compactar_historico()
+        except sqlite3.Error as e:
+            print_vermelho(f"\n[!] Erro ao compactar histórico: {str(e)}")
+        while True:
+            # Junta o que chegar em até HISTORICO_INTERVALO segundos numa só transação
+            lote = [self._fila_historico.get()]
+            limite = time.monotonic() + HISTORICO_INTERVALO
+            while len(lote) < HISTORICO_LOTE_MAX and not isinstance(lote[-1], threading.Event):
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    break
+                try:
+                    lote.append(self._fila_historico.get(timeout=restante))
+                except queue.Empty:
+                    break
+
+            linhas = [item for item in lote if not isinstance(item, threading.Event)]
+            if linhas:
+                try:
+                    with self.transacao() as conn:
+                        conn.executemany(self.SQL_INSERIR_HISTORICO, linhas)
+                        conn.executemany(self.SQL_RESUMIR_HISTORICO, linhas)
+                    METRICAS.contar("db.historico.acessos", len(linhas))
+                except sqlite3.Error as e:
+                    print_vermelho(f"\n[!] Erro ao registrar histórico: {str(e)}")
+            for item in lote:
+                if isinstance(item, threading.Event):
+                    item.set()
 
 # Gerenciamento de Cache
-def salvar_cache(dados):
-    with open(CACHE_FILE, 'wb') as f:
-        pickle.dump({
-            'dados': dados,
-            'timestamp': datetime.now()
-        }, f)
-
-def carregar_cache():
+# O dados.json fica num snapshot SQLite (CACHE_FILE): uma tabela plana de
+# nós em que o id serve de índice e cada pasta conhece seus filhos pelo
+# campo `pai` (irmãos em ordem crescente de id). Cada nó guarda o hash do
+# seu conteúdo, e o de uma pasta combina os dos filhos: uma atualização
+# parcial só precisa recalcular o caminho até a raiz. Abrir o snapshot só
+# lê os metadados; as pastas são carregadas sob demanda.
+#
+# A tabela também é o índice de navegação dos menus: cada nó já traz o
+# total de links abaixo dele e, nas folhas, a largura da tabela que
+# mostrar_links desenha, calculados uma vez quando o dataset é gravado.
+NO_PASTA, NO_LISTA, NO_LINK, NO_TEXTO, NO_OUTRO = range(5)
+SNAPSHOT_VERSAO = 3
+_RAIZ_SNAPSHOT = 0
+
+def _conectar_snapshot():
+    conn = sqlite3.connect(CACHE_FILE, timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SNAPSHOT_VERSAO:
+        # Esquema de outra versão: o snapshot é só cache, então é recriado
+        conn.executescript(f'''
+            BEGIN IMMEDIATE;
+            DROP TABLE IF EXISTS snapshot_meta;
+            DROP TABLE IF EXISTS snapshot_nos;
+            CREATE TABLE snapshot_meta (
+                chave TEXT PRIMARY KEY,
+                valor TEXT
+            );
+            CREATE TABLE snapshot_nos (
+                id INTEGER PRIMARY KEY,
+                pai INTEGER,
+                chave TEXT,
+                tipo INTEGER,
+                valor TEXT,
+                hash TEXT,
+                links INTEGER,
+                largura INTEGER
+            );
+            CREATE INDEX idx_snapshot_nos_pai ON snapshot_nos (pai, id);
+            CREATE UNIQUE INDEX idx_snapshot_nos_chave ON snapshot_nos (pai, chave);
+            PRAGMA user_version = {SNAPSHOT_VERSAO};
+            COMMIT;
+        ''')
+    return conn
+
+def _tipo_no(valor):
+    if isinstance(valor, dict):
+        return NO_LINK if 'url' in valor else NO_PASTA
+    if isinstance(valor, list):
+        return NO_LISTA
+    if isinstance(valor, str):
+        return NO_TEXTO
+    return NO_OUTRO
+
+def _itens_folha(tipo, valor):
+    """Itens que mostrar_links exibe para uma folha"""
+    if tipo == NO_LISTA:
+        return valor
+    return [valor] if tipo in (NO_LINK, NO_TEXTO) else []
+
+def largura_links(titulo, links):
+    """Largura interna da tabela de mostrar_links para estes links"""
+    largura = max(
+        len(titulo),
+        max((len(str(link['url'] if isinstance(link, dict) else link)) for link in links), default=0),
+        len("C - Copiar URL | F - Favoritar | V - Voltar")
+    ) + 6  # Aumenta a margem
+    return max(largura, 80)  # Largura mínima de 80 caracteres
+
+def _navegacao_folha(chave, tipo, valor):
+    """(total de links, largura da tabela) de uma folha"""
+    itens = _itens_folha(tipo, valor)
+    return len(itens), largura_links(chave, itens) if itens else 0
+
+def _serializar_no(tipo, valor):
+    return valor if tipo == NO_TEXTO else json.dumps(valor, ensure_ascii=False)
+
+def _hash_valor(valor):
+    texto = json.dumps(valor, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+def _hash_pasta(pares):
+    """Hash de uma pasta a partir dos pares (chave, hash do filho), sem depender da ordem"""
+    texto = json.dumps(sorted(pares), ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+def checksum_dados(dados):
+    """Checksum da árvore do dados.json, o mesmo guardado na raiz do snapshot"""
+    return _hash_pasta([
+        (chave, checksum_dados(valor) if _tipo_no(valor) == NO_PASTA else _hash_valor(valor))
+        for chave, valor in dados.items()
+    ])
+
+SQL_INSERIR_NO = '''
+    INSERT OR REPLACE INTO snapshot_nos (id, pai, chave, tipo, valor, hash, links, largura)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+def _linhas_snapshot(pasta, pai, proximo_id, linhas):
+    """Acrescenta a `linhas` os nós da pasta em pré-ordem, no formato de SQL_INSERIR_NO
+
+    Retorna (hash da pasta, total de links abaixo dela, próximo id livre).
+    """
+    pares = []
+    total_links = 0
+    for chave, valor in pasta.items():
+        tipo = _tipo_no(valor)
+        no_id = proximo_id
+        proximo_id += 1
+        if tipo == NO_PASTA:
+            posicao = len(linhas)
+            linhas.append(None)
+            hash_no, links, proximo_id = _linhas_snapshot(valor, no_id, proximo_id, linhas)
+            linhas[posicao] = (no_id, pai, chave, tipo, None, hash_no, links, 0)
+        else:
+            hash_no = _hash_valor(valor)
+            links, largura = _navegacao_folha(chave, tipo, valor)
+            linhas.append((no_id, pai, chave, tipo, _serializar_no(tipo, valor), hash_no, links, largura))
+        pares.append((chave, hash_no))
+        total_links += links
+    return _hash_pasta(pares), total_links, proximo_id
+
+class PastaSnapshot(Mapping):
+    """Pasta do snapshot lida sob demanda; se comporta como um dict somente leitura"""
+
+    def __init__(self, conn, no_id=_RAIZ_SNAPSHOT, checksum=None):
+        self._conn = conn
+        self.id = no_id
+        self.checksum = checksum  # Só na raiz: versão do snapshot fixada pela leitura
+        self._filhos = None
+        self._subpastas = {}
+
+    def _carregar(self):
+        # Só o índice dos filhos; o valor de uma folha é lido quando ela é aberta
+        if self._filhos is None:
+            self._filhos = {
+                chave: (no_id, tipo, links, largura)
+                for no_id, chave, tipo, links, largura in self._conn.execute(
+                    'SELECT id, chave, tipo, links, largura FROM snapshot_nos WHERE pai = ? ORDER BY id',
+                    (self.id,))
+            }
+        return self._filhos
+
+    def navegacao(self):
+        """Filhos na ordem do menu: [(chave, id, tipo, total de links, largura)]"""
+        return [(chave, *no) for chave, no in self._carregar().items()]
+
+    def __getitem__(self, chave):
+        no_id, tipo, _, _ = self._carregar()[chave]
+        if tipo == NO_PASTA:
+            # Subpastas ficam guardadas: voltar a um menu não relê o índice dele
+            if chave not in self._subpastas:
+                self._subpastas[chave] = PastaSnapshot(self._conn, no_id)
+            return self._subpastas[chave]
+        valor = self._conn.execute('SELECT valor FROM snapshot_nos WHERE id = ?', (no_id,)).fetchone()[0]
+        if tipo == NO_TEXTO:
+            return valor
+        return json.loads(valor)
+
+    def __iter__(self):
+        return iter(self._carregar())
+
+    def __len__(self):
+        return len(self._carregar())
+
+    def fechar(self):
+        """Solta a leitura fixada e fecha a conexão (as subpastas usam a mesma)"""
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, erro, rastro):
+        self.fechar()
+
+def navegacao(pasta):
+    """Filhos da pasta como PastaSnapshot.navegacao(), calculados na hora para um dict comum"""
+    if isinstance(pasta, PastaSnapshot):
+        return pasta.navegacao()
+    itens = []
+    for chave, valor in pasta.items():
+        tipo = _tipo_no(valor)
+        if tipo == NO_PASTA:
+            itens.append((chave, None, tipo, _linhas_snapshot(valor, 0, 1, [])[1], 0))
+        else:
+            itens.append((chave, None, tipo, *_navegacao_folha(chave, tipo, valor)))
+    return itens
+
+def salvar_cache(dados, etag=None, last_modified=None):
+    """Grava o snapshot do dados.json, com o ETag e o Last-Modified da origem"""
+    linhas = []
+    checksum, _, _ = _linhas_snapshot(dados, _RAIZ_SNAPSHOT, _RAIZ_SNAPSHOT + 1, linhas)
+    conn = _conectar_snapshot()
     try:
-        if not Path(CACHE_FILE).exists():
-            return None
-        
-        with open(CACHE_FILE, 'rb') as f:
-            cache = pickle.load(f)
-            
-        if (datetime.now() - cache['timestamp']).total_seconds() > CACHE_TIMEOUT:
-            os.remove(CACHE_FILE)  # Remove cache expirado
+        with conn:
+            conn.execute('DELETE FROM snapshot_nos')
+            conn.executemany(SQL_INSERIR_NO, linhas)
+            conn.execute('DELETE FROM snapshot_meta')
+            conn.executemany('INSERT INTO snapshot_meta (chave, valor) VALUES (?, ?)', [
+                ('versao', str(SNAPSHOT_VERSAO)),
+                ('timestamp', datetime.now().isoformat()),
+                ('etag', etag or ''),
+                ('last_modified', last_modified or ''),
+                ('checksum', checksum)
+            ])
+    finally:
+        conn.close()
+
+def renovar_cache():
+    """Estende a validade do snapshot atual (o servidor respondeu 304)"""
+    conn = _conectar_snapshot()
+    try:
+        with conn:
+            conn.execute("UPDATE snapshot_meta SET valor = ? WHERE chave = 'timestamp'",
+                         (datetime.now().isoformat(),))
+    finally:
+        conn.close()
+
+def cache_expirado(meta):
+    return (datetime.now() - datetime.fromisoformat(meta['timestamp'])).total_seconds() > CACHE_TIMEOUT
+
+def ler_meta_cache():
+    """Metadados do snapshot (versao, timestamp, etag, checksum), ou {} se não houver"""
+    if not Path(CACHE_FILE).exists():
+        return {}
+    conn = _conectar_snapshot()
+    try:
+        return dict(conn.execute('SELECT chave, valor FROM snapshot_meta'))
+    finally:
+        conn.close()
+
+def carregar_cache(aceitar_expirado=False):
+    # O cache antigo em pickle nunca é lido: um arquivo adulterado executaria código
+    if Path(CACHE_LEGADO).exists():
+        os.remove(CACHE_LEGADO)
+    try:
+        meta = ler_meta_cache()
+        if meta.get('versao') != str(SNAPSHOT_VERSAO):
             return None
-            
-        return cache['dados']
+
+        if not aceitar_expirado and cache_expirado(meta):
+            return None  # Cache expirado
+
+        # A transação de leitura aberta fixa a versão vista por esta árvore,
+        # mesmo que uma revalidação regrave o snapshot enquanto o menu navega
+        conn = _conectar_snapshot()
+        conn.execute('BEGIN')
+        checksum = conn.execute("SELECT valor FROM snapshot_meta WHERE chave = 'checksum'").fetchone()
+        return PastaSnapshot(conn, checksum=checksum[0] if checksum else None)
     except Exception as e:
         print_vermelho(f"\n[!] Erro ao carregar cache: {str(e)}")
         if Path(CACHE_FILE).exists():
             os.remove(CACHE_FILE)  # Remove cache corrompido
         return None
 
-# Funções para Favoritos
-def adicionar_favorito(url, titulo, categoria):
+# Atualização incremental do snapshot
+# O feed DATA_PATCH_URL traz só as mudanças desde a última versão publicada:
+#     {"de": <checksum base>, "para": <checksum novo>,
+#      "operacoes": [{"op": "add" | "remove" | "replace", "path": "/Pasta/Sub", "value": ...}]}
+# As operações seguem o JSON Patch (RFC 6902) e podem descer até dentro de
+# uma lista de links. O snapshot só muda se partir de "de" e o checksum
+# recalculado bater com "para"; senão a transação é desfeita e o dados.json
+# completo é baixado como antes.
+def _ponteiro_json(caminho):
+    if not caminho.startswith('/'):
+        raise ValueError(f"Caminho inválido no patch: {caminho!r}")
+    return [token.replace('~1', '/').replace('~0', '~') for token in caminho[1:].split('/')]
+
+def _aplicar_em_valor(valor, tokens, op, novo):
+    """Aplica uma operação do patch dentro do valor de uma folha (lista ou link)"""
+    alvo = valor
+    for token in tokens[:-1]:
+        alvo = alvo[int(token)] if isinstance(alvo, list) else alvo[token]
+    ultimo = tokens[-1]
+    if isinstance(alvo, list):
+        indice = len(alvo) if ultimo == '-' and op == 'add' else int(ultimo)
+        if not 0 <= indice <= len(alvo) - (op != 'add'):
+            raise IndexError(f"Índice fora da lista: {ultimo}")
+        if op == 'add':
+            alvo.insert(indice, novo)
+        elif op == 'replace':
+            alvo[indice] = novo
+        else:
+            del alvo[indice]
+    elif isinstance(alvo, dict):
+        if op != 'add' and ultimo not in alvo:
+            raise KeyError(ultimo)
+        if op == 'remove':
+            del alvo[ultimo]
+        else:
+            alvo[ultimo] = novo
+    else:
+        raise ValueError("Operação de patch sobre um valor simples")
+    return valor
+
+def _inserir_no(conn, pai, chave, valor, no_id=None):
+    """Grava o valor como filho `chave` de `pai`, com a subárvore inteira se for pasta"""
+    proximo_id = conn.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM snapshot_nos').fetchone()[0]
+    if no_id is None:
+        no_id = proximo_id
+        proximo_id += 1
+    tipo = _tipo_no(valor)
+    if tipo == NO_PASTA:
+        linhas = []
+        hash_no, links, _ = _linhas_snapshot(valor, no_id, proximo_id, linhas)
+        conn.executemany(SQL_INSERIR_NO, linhas)
+        linha = (no_id, pai, chave, tipo, None, hash_no, links, 0)
+    else:
+        linha = (no_id, pai, chave, tipo, _serializar_no(tipo, valor), _hash_valor(valor),
+                 *_navegacao_folha(chave, tipo, valor))
+    conn.execute(SQL_INSERIR_NO, linha)
+
+def _remover_descendentes(conn, no_id):
+    conn.execute('''
+        WITH RECURSIVE sub(id) AS (
+            SELECT id FROM snapshot_nos WHERE pai = ?
+            UNION ALL
+            SELECT n.id FROM snapshot_nos n JOIN sub ON n.pai = sub.id
+        )
+        DELETE FROM snapshot_nos WHERE id IN sub
+    ''', (no_id,))
+
+def _aplicar_operacao(conn, operacao):
+    """Aplica uma operação do patch ao snapshot; retorna as pastas cujo hash mudou (da raiz para baixo)"""
+    op = operacao['op']
+    if op not in ('add', 'remove', 'replace'):
+        raise ValueError(f"Operação de patch não suportada: {op}")
+    tokens = _ponteiro_json(operacao['path'])
+
+    pai = _RAIZ_SNAPSHOT
+    pastas = [_RAIZ_SNAPSHOT]
+    for posicao, token in enumerate(tokens[:-1]):
+        linha = conn.execute('SELECT id, tipo, valor FROM snapshot_nos WHERE pai = ? AND chave = ?',
+                             (pai, token)).fetchone()
+        if linha is None:
+            raise KeyError(token)
+        no_id, tipo, valor = linha
+        if tipo != NO_PASTA:
+            # Mudança dentro de uma folha: reescreve só o valor dela
+            conteudo = valor if tipo == NO_TEXTO else json.loads(valor)
+            conteudo = _aplicar_em_valor(conteudo, tokens[posicao + 1:], op, operacao.get('value'))
+            novo_tipo = _tipo_no(conteudo)
+            if novo_tipo == NO_PASTA:
+                raise ValueError("Patch transformaria um link em pasta")
+            conn.execute('UPDATE snapshot_nos SET tipo = ?, valor = ?, hash = ?, links = ?, largura = ? WHERE id = ?',
+                         (novo_tipo, _serializar_no(novo_tipo, conteudo), _hash_valor(conteudo),
+                          *_navegacao_folha(token, novo_tipo, conteudo), no_id))
+            return pastas
+        pai = no_id
+        pastas.append(no_id)
+
+    chave = tokens[-1]
+    existente = conn.execute('SELECT id FROM snapshot_nos WHERE pai = ? AND chave = ?', (pai, chave)).fetchone()
+    if existente is None and op != 'add':
+        raise KeyError(chave)
+    if existente:
+        _remover_descendentes(conn, existente[0])
+        if op == 'remove':
+            conn.execute('DELETE FROM snapshot_nos WHERE id = ?', existente)
+            return pastas
+    # No replace (ou add sobre chave existente) o nó mantém o id e a posição
+    _inserir_no(conn, pai, chave, operacao['value'], existente[0] if existente else None)
+    return pastas
+
+def _recalcular_hashes(conn, profundidades):
+    """Recalcula hash e total de links das pastas alteradas, das mais fundas para a raiz
+
+    Retorna o hash da raiz.
+    """
+    checksum = None
+    for no_id in sorted(profundidades, key=profundidades.get, reverse=True):
+        filhos = conn.execute('SELECT chave, hash, links FROM snapshot_nos WHERE pai = ?', (no_id,)).fetchall()
+        checksum = _hash_pasta([(chave, hash_no) for chave, hash_no, _ in filhos])
+        if no_id != _RAIZ_SNAPSHOT:
+            conn.execute('UPDATE snapshot_nos SET hash = ?, links = ? WHERE id = ?',
+                         (checksum, sum(links for _, _, links in filhos), no_id))
+    return checksum
+
+def aplicar_patch_dados(feed):
+    """Aplica o feed incremental ao snapshot; retorna False se ele não servir para esta versão"""
+    if not isinstance(feed, dict) or not isinstance(feed.get('operacoes'), list):
+        return False
+    if not Path(CACHE_FILE).exists():
+        return False
+    conn = _conectar_snapshot()
     try:
-        with sqlite3.connect(DB_FILE, timeout=30) as conn:
-            conn.execute("PRAGMA journal_mode=WAL")
-            # Verifica se já existe
-            existente = conn.execute('SELECT 1 FROM favoritos WHERE url = ?', (url,)).fetchone()
-            if existente:
-                print_vermelho("\n[!] Este link já está nos favoritos!")
-                time.sleep(1)
-                return
-                
-            # Adiciona novo favorito
+        meta = dict(conn.execute('SELECT chave, valor FROM snapshot_meta'))
+        if meta.get('versao') != str(SNAPSHOT_VERSAO) or not meta.get('checksum'):
+            return False
+        if feed.get('para') == meta['checksum']:
+            # Já estamos na versão publicada
+            with conn:
+                conn.execute("UPDATE snapshot_meta SET valor = ? WHERE chave = 'timestamp'",
+                             (datetime.now().isoformat(),))
+            return True
+        if feed.get('de') != meta['checksum']:
+            return False
+
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            profundidades = {}
+            for operacao in feed['operacoes']:
+                for profundidade, no_id in enumerate(_aplicar_operacao(conn, operacao)):
+                    profundidades[no_id] = max(profundidade, profundidades.get(no_id, 0))
+            checksum = _recalcular_hashes(conn, profundidades)
+            if checksum != feed['para']:
+                raise ValueError("Checksum do patch não confere")
+            # O ETag do dados.json antigo não vale para a versão nova
+            conn.executemany('UPDATE snapshot_meta SET valor = ? WHERE chave = ?', [
+                (datetime.now().isoformat(), 'timestamp'),
+                ('', 'etag'),
+                ('', 'last_modified'),
+                (checksum, 'checksum')
+            ])
+            conn.commit()
+            return True
+        except (KeyError, IndexError, TypeError, ValueError, sqlite3.IntegrityError):
+            conn.rollback()
+            return False
+    finally:
+        conn.close()
+
+def _escapar_token(chave):
+    return chave.replace('~', '~0').replace('/', '~1')
+
+def gerar_patch(antigo, novo, caminho=''):
+    """Operações de patch que levam a árvore `antigo` até `novo` (para quem publica o feed)"""
+    operacoes = []
+    for chave in antigo:
+        if chave not in novo:
+            operacoes.append({'op': 'remove', 'path': f"{caminho}/{_escapar_token(chave)}"})
+    for chave, valor in novo.items():
+        destino = f"{caminho}/{_escapar_token(chave)}"
+        if chave not in antigo:
+            operacoes.append({'op': 'add', 'path': destino, 'value': valor})
+        elif _tipo_no(valor) == NO_PASTA and _tipo_no(antigo[chave]) == NO_PASTA:
+            operacoes.extend(gerar_patch(antigo[chave], valor, destino))
+        elif antigo[chave] != valor:
+            operacoes.append({'op': 'replace', 'path': destino, 'value': valor})
+    return operacoes
+
+# Sessão HTTP compartilhada
+_sessao = None
+_sessao_lock = threading.Lock()
+_executor_rede = ThreadPoolExecutor(max_workers=8, thread_name_prefix="bronze-rede")
+
+def obter_sessao():
+    """Retorna a sessão HTTP compartilhada (pool de conexões + novas tentativas)"""
+    global _sessao
+    if _sessao is None:
+        with _sessao_lock:
+            if _sessao is None:
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+
+                class RetryContado(Retry):
+                    def increment(self, *args, **kwargs):
+                        METRICAS.contar("rede.novas_tentativas")
+                        return super().increment(*args, **kwargs)
+
+                tentativas = RetryContado(
+                    total=REDE_TENTATIVAS,
+                    connect=REDE_TENTATIVAS,
+                    read=0,  # Timeout de leitura não é repetido: o limite de tempo continua valendo
+                    status=REDE_TENTATIVAS,
+                    backoff_factor=REDE_BACKOFF,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=frozenset(['GET', 'HEAD'])
+                )
+                adaptador = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=tentativas)
+                sessao = requests.Session()
+                sessao.mount("https://", adaptador)
+                sessao.mount("http://", adaptador)
+                _sessao = sessao
+    return _sessao
+
+# Cache de Pesquisas
+def normalizar_termo(termo):
+    """Normaliza o termo de busca para uso como chave do cache"""
+    return " ".join(termo.lower().split())
+
+def ler_cache_pesquisa(termo):
+    """Retorna os resultados guardados para o termo, ou None se ausente/expirado"""
+    chave = normalizar_termo(termo)
+    try:
+        db = BronzeDB()
+        linha = db.consultar_um('SELECT resultados, data_criacao FROM cache_pesquisas WHERE termo = ?', (chave,))
+        if linha:
+            idade = (datetime.now() - datetime.fromisoformat(linha[1])).total_seconds()
+            if idade <= PESQUISA_CACHE_TTL:
+                db.executar('UPDATE cache_pesquisas SET ultimo_acesso = ? WHERE termo = ?',
+                            (datetime.now(), chave))
+                METRICAS.contar("cache.pesquisa.acertos")
+                with METRICAS.medir("json.cache_pesquisa"):
+                    return json.loads(linha[0])
+            db.executar('DELETE FROM cache_pesquisas WHERE termo = ?', (chave,))
+    except Exception as e:
+        print_vermelho(f"\n[!] Erro ao ler cache de pesquisa: {str(e)}")
+    METRICAS.contar("cache.pesquisa.falhas")
+    return None
+
+def salvar_cache_pesquisa(termo, resultados):
+    """Guarda os resultados do termo e descarta os menos usados além do limite"""
+    agora = datetime.now()
+    try:
+        with BronzeDB().transacao() as conn:
             conn.execute('''
-                INSERT INTO favoritos (url, titulo, categoria, data_adicao)
+                INSERT OR REPLACE INTO cache_pesquisas (termo, resultados, data_criacao, ultimo_acesso)
                 VALUES (?, ?, ?, ?)
-            ''', (url, titulo, categoria, datetime.now()))
-            conn.commit()
+            ''', (normalizar_termo(termo), json.dumps(resultados, ensure_ascii=False), agora, agora))
+            conn.execute('''
+                DELETE FROM cache_pesquisas WHERE termo IN (
+                    SELECT termo FROM cache_pesquisas
+                    ORDER BY ultimo_acesso DESC
+                    LIMIT -1 OFFSET ?
+                )
+            ''', (PESQUISA_CACHE_MAX,))
+    except Exception as e:
+        print_vermelho(f"\n[!] Erro ao salvar cache de pesquisa: {str(e)}")
+
+def buscar_torrents(termo, ao_receber=None):
+    """Busca o termo em todos os provedores, respondendo do cache quando possível
+
+    `ao_receber(provedor, parciais)` é chamado a cada provedor que responde.
+    """
+    resultados = ler_cache_pesquisa(termo)
+    if resultados is not None:
+        return resultados
+
+    resultados = obter_motor_pesquisa().pesquisar(termo, ao_receber)
+    salvar_cache_pesquisa(termo, resultados)
+    return resultados
+
+def buscar_torrents_em_fluxo(termo, destino, ao_receber=None):
+    """Como buscar_torrents, mas preenchendo `destino` (ResultadosTorrent) enquanto chega"""
+    resultados = ler_cache_pesquisa(termo)
+    if resultados is not None:
+        destino.adicionar(resultados)
+        destino.concluir()
+        return destino
+
+    obter_motor_pesquisa().preencher(termo, destino, ao_receber)
+    destino.concluir()
+    if not destino.cancelado and len(destino) <= PESQUISA_CACHE_MAX_ITENS:
+        salvar_cache_pesquisa(termo, destino.como_dicts())
+    return destino
+
+def _sem_resultados(resultados):
+    """A apibay responde [{"name": "No results returned", ...}] quando não acha nada"""
+    return not resultados or resultados[0].get('name') == 'No results returned'
+
+# Leitura em fluxo das respostas de pesquisa
+# Uma busca ampla na apibay devolve centenas de milhares de itens; em vez de
+# response.json() no corpo inteiro, o array é decodificado pedaço a pedaço e
+# os itens vão para um ResultadosTorrent enquanto o resto ainda chega.
+_DECODIFICADOR_JSON = json.JSONDecoder()
+_RE_ENTRE_ITENS = re.compile(r'[\s,]*')
+_FIM_ESCALAR = frozenset(' \t\r\n,]')  # O que pode vir logo depois de um número ou literal completo
+
+def _pedacos_texto(response, tamanho=PESQUISA_PEDACO):
+    """Corpo da resposta como texto, em pedaços, sem juntar tudo na memória"""
+    decodificador = codecs.getincrementaldecoder('utf-8')()
+    for pedaco in response.iter_content(chunk_size=tamanho):
+        yield decodificador.decode(pedaco)
+    yield decodificador.decode(b'', final=True)
+
+def lotes_array_json(pedacos):
+    """Itens de um array JSON conforme os pedaços chegam: uma lista por pedaço"""
+    buffer = ""
+    posicao = 0
+    aberto = False
+    for pedaco in pedacos:
+        inicio = time.perf_counter()
+        buffer = buffer[posicao:] + pedaco
+        posicao = 0
+        if not aberto:
+            buffer = buffer.lstrip()
+            if not buffer:
+                continue
+            if buffer[0] != '[':
+                raise ValueError("A resposta não é uma lista JSON")
+            posicao = 1
+            aberto = True
+        lote = []
+        while True:
+            posicao = _RE_ENTRE_ITENS.match(buffer, posicao).end()
+            if posicao == len(buffer):
+                break
+            if buffer[posicao] == ']':
+                METRICAS.registrar("json.pesquisa", time.perf_counter() - inicio)
+                if lote:
+                    yield lote
+                return
+            try:
+                item, fim = _DECODIFICADOR_JSON.raw_decode(buffer, posicao)
+            except json.JSONDecodeError:
+                break  # Item cortado no meio: espera o próximo pedaço
+            if not isinstance(item, (dict, list, str)) and (fim == len(buffer) or buffer[fim] not in _FIM_ESCALAR):
+                # Número cortado no pedaço ("6500." / "1e" / "-"): o raw_decode
+                # para antes do fim, então só aceita com o separador já visível
+                break
+            lote.append(item)
+            posicao = fim
+        METRICAS.registrar("json.pesquisa", time.perf_counter() - inicio)
+        if lote:
+            yield lote
+    raise ValueError("Lista JSON incompleta")
+
+def _inteiro(valor):
+    """int do campo numérico da apibay; vazio, inválido ou fora do int64 vira 0"""
+    try:
+        numero = int(valor)
+    except (TypeError, ValueError):
+        return 0
+    return numero if -2 ** 63 <= numero < 2 ** 63 else 0
+
+# Campos da apibay guardados nas colunas do ResultadosTorrent
+_CAMPOS_COLUNAS = frozenset(('name', 'info_hash', 'size', 'seeders', 'leechers', 'added'))
+
+class ResultadosTorrent:
+    """Resultados de pesquisa em colunas compactas, preenchidos enquanto chegam
+
+    Os nomes ficam num único buffer UTF-8 com os offsets de fim de cada um,
+    o info_hash em 20 bytes por item e os números em arrays de int64,
+    convertidos uma única vez na entrada. O score é calculado por lote
+    sobre essas colunas. Os demais campos (id, num_files, username...) ficam
+    num JSON comprimido por lote, só aberto quando o item inteiro é pedido, e um
+    info_hash repetido é descartado.
+    """
+
+    def __init__(self, itens=()):
+        self.hashes = bytearray()
+        self.tamanhos = array('q')
+        self.seeds = array('q')
+        self.leeches = array('q')
+        self.adicionados = array('q')
+        self.scores = array('B')
+        self.cancelado = False
+        self._nomes = bytearray()
+        self._fins_nomes = array('q')
+        self._hashes_texto = {}  # info_hash fora do formato de 40 dígitos hexadecimais
+        self._extras = []  # JSON comprimido dos campos fora das colunas, um por lote
+        self._inicios_extras = array('q')  # Índice do primeiro item de cada lote
+        self._vistos = set()
+        self._trava = threading.Lock()
+        self._total = 0
+        if itens:
+            self.adicionar(itens)
+
+    def __len__(self):
+        return self._total
+
+    def _chave(self, info_hash):
+        try:
+            chave = bytes.fromhex(info_hash)
+            if len(chave) == 20:
+                return chave
+        except ValueError:
+            pass
+        return info_hash.upper()
+
+    def adicionar(self, itens):
+        """Acrescenta um lote de itens no formato da apibay; devolve quantos entraram"""
+        with self._trava:
+            if self._vistos is None:
+                self._vistos = {self.info_hash(i) if i in self._hashes_texto else bytes(self.hashes[i * 20:i * 20 + 20])
+                                for i in range(self._total)}
+            novos = []
+            chaves = []
+            for item in itens:
+                chave = self._chave(str(item.get('info_hash', '')))
+                if chave:
+                    if chave in self._vistos:
+                        continue
+                    self._vistos.add(chave)
+                novos.append(item)
+                chaves.append(chave)
+            if not novos:
+                return 0
+
+            nomes = [str(item.get('name', '')) for item in novos]
+            numeros = []
+            for campo in ('size', 'seeders', 'leechers', 'added'):
+                valores = [item.get(campo, 0) for item in novos]
+                try:
+                    numeros.append(array('q', map(int, valores)))
+                except (TypeError, ValueError, OverflowError):
+                    numeros.append(array('q', map(_inteiro, valores)))
+            self.scores.extend(analisar_colunas(nomes, *numeros)['score'])
+            for coluna, valores in zip((self.tamanhos, self.seeds, self.leeches, self.adicionados), numeros):
+                coluna.extend(valores)
+
+            for chave in chaves:
+                if not isinstance(chave, bytes):
+                    self._hashes_texto[len(self.hashes) // 20] = chave
+                    chave = bytes(20)
+                self.hashes += chave
+            posicao = len(self._nomes)
+            for nome in nomes:
+                codificado = nome.encode('utf-8', 'surrogatepass')
+                self._nomes += codificado
+                posicao += len(codificado)
+                self._fins_nomes.append(posicao)
+            extras = [{campo: valor for campo, valor in item.items() if campo not in _CAMPOS_COLUNAS}
+                      for item in novos]
+            self._inicios_extras.append(self._total)
+            self._extras.append(zlib.compress(json.dumps(extras, ensure_ascii=False)
+                                              .encode('utf-8', 'surrogatepass'), 1))
+            self._total += len(novos)  # Só agora os itens ficam visíveis para quem lê
+            return len(novos)
+
+    def cancelar(self):
+        """Pede aos provedores que parem de preencher (o usuário saiu da pesquisa)"""
+        self.cancelado = True
+
+    def concluir(self):
+        """Fim do preenchimento: libera o conjunto de deduplicação (refeito se vierem mais itens)"""
+        with self._trava:
+            self._vistos = None
+
+    def nome(self, i):
+        inicio = self._fins_nomes[i - 1] if i else 0
+        return self._nomes[inicio:self._fins_nomes[i]].decode('utf-8', 'surrogatepass')
+
+    def info_hash(self, i):
+        if i in self._hashes_texto:
+            return self._hashes_texto[i]
+        return self.hashes[i * 20:i * 20 + 20].hex().upper()
+
+    def _lote_extras(self, lote):
+        return json.loads(zlib.decompress(self._extras[lote]).decode('utf-8', 'surrogatepass'))
+
+    def _item(self, i, extras):
+        return {
+            **extras,
+            'name': self.nome(i),
+            'info_hash': self.info_hash(i),
+            'size': str(self.tamanhos[i]),
+            'seeders': str(self.seeds[i]),
+            'leechers': str(self.leeches[i]),
+            'added': str(self.adicionados[i])
+        }
+
+    def item(self, i):
+        """O resultado `i` no formato da apibay, com todos os campos recebidos"""
+        lote = bisect_right(self._inicios_extras, i) - 1
+        return self._item(i, self._lote_extras(lote)[i - self._inicios_extras[lote]])
+
+    def como_dicts(self):
+        """Todos os itens completos (cada lote de extras é decodificado uma vez)"""
+        itens = []
+        total = len(self)
+        for lote in range(len(self._extras)):
+            inicio = self._inicios_extras[lote]
+            if inicio >= total:
+                break
+            for i, extras in enumerate(self._lote_extras(lote), inicio):
+                if i >= total:
+                    break
+                itens.append(self._item(i, extras))
+        return itens
+
+    def analisar(self, usar_numpy=None):
+        """Colunas completas de analisar_torrents (grupo, verificações...) direto das colunas"""
+        total = len(self)
+        nomes = [self.nome(i) for i in range(total)]
+        return analisar_colunas(nomes, self.tamanhos[:total], self.seeds[:total],
+                                self.leeches[:total], self.adicionados[:total], usar_numpy)
+
+    def ordem(self, score_minimo=0, por_score=False):
+        """Índices dos itens já recebidos, filtrados e ordenados, num array('q')
+
+        A ordenação é estável: com o mesmo score vale a ordem de chegada.
+        """
+        scores = self.scores[:len(self)]  # Cópia: o preenchimento pode estar crescendo o array
+        if np is not None:
+            valores = np.frombuffer(scores, dtype=np.uint8)
+            indices = np.flatnonzero(valores >= score_minimo)
+            if por_score:
+                indices = indices[np.argsort(-valores[indices].astype(np.int16), kind='stable')]
+            return array('q', indices.astype(np.int64).tobytes())
+        indices = [i for i, score in enumerate(scores) if score >= score_minimo]
+        if por_score:
+            indices.sort(key=scores.__getitem__, reverse=True)
+        return array('q', indices)
+
+# Provedores de Pesquisa
+class ProvedorPesquisa(ABC):
+    """Fonte de resultados no formato da apibay (name, info_hash, size, seeders...)"""
+    nome = "provedor"
+    timeout = REDE_TIMEOUT
+
+    @abstractmethod
+    def pesquisar(self, termo):
+        """Todos os resultados do termo numa lista (vazia se nada for encontrado)"""
+
+    def pesquisar_em_lotes(self, termo):
+        """Os resultados em lotes conforme chegam; por padrão, tudo num lote só"""
+        resultados = self.pesquisar(termo)
+        if resultados:
+            yield resultados
+
+class ProvedorApibay(ProvedorPesquisa):
+    """API da apibay e seus espelhos"""
+    nome = "apibay"
+    timeout = REDE_TIMEOUT * 2
+
+    def __init__(self, espelhos=None, paralelo=None):
+        self.espelhos = espelhos if espelhos is not None else PESQUISA_ESPELHOS
+        self.paralelo = paralelo if paralelo is not None else PESQUISA_PARALELA
+
+    def pesquisar(self, termo):
+        if self.paralelo and len(self.espelhos) > 1:
+            resultados = self._consultar_em_paralelo(termo)
+        else:
+            resultados = self._consultar_em_sequencia(termo)
+        return [] if _sem_resultados(resultados) else resultados
+
+    def _consultar(self, url, termo):
+        with METRICAS.medir("rede.pesquisa"):
+            response = obter_sessao().get(url.format(termo=termo), headers=HEADERS_PESQUISA, timeout=REDE_TIMEOUT)
+        response.raise_for_status()
+        with METRICAS.medir("json.pesquisa"):
+            resultados = response.json()
+        if not isinstance(resultados, list):
+            raise requests.RequestException(f"Resposta inesperada de {url.split('/')[2]}")
+        return resultados
+
+    def _abrir(self, url, termo):
+        """Faz a requisição sem ler o corpo (stream=True)"""
+        with METRICAS.medir("rede.pesquisa"):
+            response = obter_sessao().get(url.format(termo=termo), headers=HEADERS_PESQUISA,
+                                          timeout=REDE_TIMEOUT, stream=True)
+        try:
+            response.raise_for_status()
+        except requests.RequestException:
+            response.close()
+            raise
+        return response
+
+    def _respostas(self, termo):
+        """Espelhos abertos, na ordem em que atendem: (response, None) ou (None, erro)"""
+        if not (self.paralelo and len(self.espelhos) > 1):
+            for url in self.espelhos:
+                try:
+                    yield self._abrir(url, termo), None
+                except (requests.RequestException, ValueError) as e:
+                    yield None, e
+            return
+        futuros = [_executor_rede.submit(self._abrir, url, termo) for url in self.espelhos]
+        try:
+            for futuro in as_completed(futuros):
+                try:
+                    yield futuro.result(), None
+                except (requests.RequestException, ValueError) as e:
+                    yield None, e
+        finally:
+            # Libera as conexões dos espelhos que não foram lidos
+            for futuro in futuros:
+                if not futuro.cancel():
+                    futuro.add_done_callback(lambda f: f.exception() is None and f.result().close())
+
+    def pesquisar_em_lotes(self, termo):
+        """Lê a resposta em fluxo: o primeiro espelho com resultados é lido até o fim"""
+        erro = None
+        vazio = False
+        respostas = self._respostas(termo)
+        try:
+            for response, erro_espelho in respostas:
+                if response is None:
+                    erro = erro_espelho
+                    continue
+                with response:
+                    try:
+                        lotes = lotes_array_json(_pedacos_texto(response))
+                        primeiro = next(lotes, [])
+                    except (requests.RequestException, ValueError) as e:
+                        erro = e
+                        continue
+                    if _sem_resultados(primeiro):
+                        vazio = True
+                        continue  # Outro espelho pode ter resultados
+                    yield primeiro
+                    yield from lotes
+                    return
+        finally:
+            respostas.close()
+        if not vazio and erro is not None:
+            raise erro
+
+    def _consultar_em_sequencia(self, termo):
+        """Tenta um espelho por vez, passando ao próximo em caso de erro"""
+        erro = None
+        for url in self.espelhos:
+            try:
+                return self._consultar(url, termo)
+            except (requests.RequestException, ValueError) as e:
+                erro = e
+        raise erro
+
+    def _consultar_em_paralelo(self, termo):
+        """Consulta todos os espelhos ao mesmo tempo e fica com a primeira resposta boa
+
+        Uma resposta vazia só é usada se nenhum espelho trouxer resultados.
+        """
+        futuros = [_executor_rede.submit(self._consultar, url, termo) for url in self.espelhos]
+        vazio = None
+        erro = None
+        for futuro in as_completed(futuros):
+            try:
+                resultados = futuro.result()
+            except (requests.RequestException, ValueError) as e:
+                erro = e
+                continue
+            if not _sem_resultados(resultados):
+                for pendente in futuros:
+                    pendente.cancel()
+                return resultados
+            if vazio is None:
+                vazio = resultados
+        if vazio is not None:
+            return vazio
+        raise erro
+
+def _filtrar_por_termo(termo):
+    """Predicado que aceita nomes contendo todas as palavras do termo"""
+    palavras = normalizar_termo(termo).split()
+    return lambda nome: all(palavra in nome.lower() for palavra in palavras)
+
+class ProvedorJSONLocal(ProvedorPesquisa):
+    """Dump local em JSON: uma lista de itens no formato da apibay"""
+    timeout = 5
+
+    def __init__(self, arquivo):
+        self.arquivo = arquivo
+        self.nome = Path(arquivo).name
+        self._itens = None
+
+    def pesquisar(self, termo):
+        if self._itens is None:
+            with open(self.arquivo, encoding='utf-8') as f:
+                self._itens = json.load(f)
+        aceita = _filtrar_por_termo(termo)
+        return [item for item in self._itens if aceita(item.get('name', ''))]
+
+class ProvedorSQLiteLocal(ProvedorPesquisa):
+    """Dump local em SQLite com uma tabela `torrents` de colunas no formato da apibay"""
+    timeout = 5
+
+    def __init__(self, arquivo, limite=1000):
+        self.arquivo = arquivo
+        self.nome = Path(arquivo).name
+        self.limite = limite
+
+    def pesquisar(self, termo):
+        palavras = normalizar_termo(termo).split()
+        filtro = " AND ".join(["name LIKE ?"] * len(palavras)) or "1"
+        with sqlite3.connect(f"file:{self.arquivo}?mode=ro", uri=True, timeout=30) as conn:
+            conn.row_factory = sqlite3.Row
+            linhas = conn.execute(
+                f"SELECT * FROM torrents WHERE {filtro} ORDER BY CAST(seeders AS INTEGER) DESC LIMIT ?",
+                [f"%{palavra}%" for palavra in palavras] + [self.limite]
+            ).fetchall()
+        return [{chave: str(linha[chave]) for chave in linha.keys()} for linha in linhas]
+
+class MotorPesquisa:
+    """Consulta vários provedores em paralelo e mescla os resultados por info_hash"""
+
+    def __init__(self, provedores):
+        self.provedores = list(provedores)
+
+    def pesquisar(self, termo, ao_receber=None):
+        """Retorna os resultados mesclados; o tempo total é o do provedor mais lento
+
+        Cada provedor tem seu próprio timeout; quem estoura é ignorado. Se
+        todos falharem, o último erro é repassado.
+        """
+        inicio = time.monotonic()
+        futuros = {_executor_provedores.submit(p.pesquisar, termo): p for p in self.provedores}
+        prazos = {futuro: inicio + p.timeout for futuro, p in futuros.items()}
+        respostas = {}
+        erro = None
+
+        pendentes = set(futuros)
+        while pendentes:
+            espera = min(prazos[f] for f in pendentes) - time.monotonic()
+            prontos, pendentes = wait(pendentes, timeout=max(espera, 0), return_when=FIRST_COMPLETED)
+            for futuro in prontos:
+                provedor = futuros[futuro]
+                try:
+                    respostas[provedor] = futuro.result()
+                except Exception as e:
+                    erro = e
+                    continue
+                if ao_receber:
+                    ao_receber(provedor, respostas[provedor])
+            agora = time.monotonic()
+            for futuro in [f for f in pendentes if prazos[f] <= agora]:
+                erro = _estouro(futuros[futuro])
+                futuro.cancel()
+                pendentes.discard(futuro)
+
+        if not respostas and erro is not None:
+            raise erro
+        # Mescla na ordem de prioridade dos provedores, não na de chegada
+        return mesclar_resultados(respostas[p] for p in self.provedores if p in respostas)
+
+    def preencher(self, termo, destino, ao_receber=None):
+        """Versão em fluxo de pesquisar: cada lote entra em `destino` assim que chega
+
+        `ao_receber(provedor, quantidade)` é chamado quando um provedor termina.
+        Os resultados ficam na ordem de chegada, não na de prioridade; um
+        info_hash repetido é descartado pelo próprio destino. O timeout de
+        cada provedor vale para a resposta inteira: quem passa do prazo
+        para de ser consumido e o que já entrou fica.
+        """
+        inicio = time.monotonic()
+        prazos = {p: inicio + p.timeout for p in self.provedores}
+
+        def consumir(provedor):
+            total = 0
+            lotes = provedor.pesquisar_em_lotes(termo)
+            try:
+                with METRICAS.medir(f"pesquisa.{provedor.nome}"):
+                    for lote in lotes:
+                        if destino.cancelado:
+                            break
+                        if time.monotonic() >= prazos[provedor]:
+                            raise _estouro(provedor)
+                        total += destino.adicionar(lote)
+            finally:
+                lotes.close()  # Fecha a conexão de quem foi interrompido
+            return total
+
+        futuros = {_executor_provedores.submit(consumir, p): p for p in self.provedores}
+        respondeu = False
+        erro = None
+        pendentes = set(futuros)
+        while pendentes:
+            # Um provedor travado numa leitura não chega a ver o prazo: quem
+            # espera desiste dele e a thread sai no próximo lote ou timeout de leitura
+            espera = min(prazos[futuros[f]] for f in pendentes) - time.monotonic()
+            prontos, pendentes = wait(pendentes, timeout=max(espera, 0), return_when=FIRST_COMPLETED)
+            for futuro in prontos:
+                try:
+                    quantidade = futuro.result()
+                except Exception as e:
+                    erro = e
+                    continue
+                respondeu = True
+                if ao_receber:
+                    ao_receber(futuros[futuro], quantidade)
+            agora = time.monotonic()
+            for futuro in [f for f in pendentes if prazos[futuros[f]] <= agora]:
+                erro = _estouro(futuros[futuro])
+                futuro.cancel()
+                pendentes.discard(futuro)
+        if not respondeu and erro is not None:
+            raise erro
+        return destino
+
+def _estouro(provedor):
+    return TimeoutError(f"{provedor.nome} não respondeu em {provedor.timeout}s")
+
+def mesclar_resultados(listas):
+    """Junta listas de resultados descartando info_hash repetidos (fica o primeiro)"""
+    vistos = set()
+    mesclados = []
+    for resultados in listas:
+        for item in resultados:
+            info_hash = str(item.get('info_hash', '')).upper()
+            if info_hash:
+                if info_hash in vistos:
+                    continue
+                vistos.add(info_hash)
+            mesclados.append(item)
+    return mesclados
+
+_executor_provedores = ThreadPoolExecutor(max_workers=8, thread_name_prefix="bronze-provedor")
+_motor_pesquisa = None
+
+def obter_motor_pesquisa():
+    """Motor padrão: apibay mais os dumps locais configurados que existirem"""
+    global _motor_pesquisa
+    if _motor_pesquisa is None:
+        provedores = [ProvedorApibay()]
+        for arquivo in PESQUISA_DUMPS_LOCAIS:
+            if Path(arquivo).exists():
+                if arquivo.endswith('.json'):
+                    provedores.append(ProvedorJSONLocal(arquivo))
+                else:
+                    provedores.append(ProvedorSQLiteLocal(arquivo))
+        _motor_pesquisa = MotorPesquisa(provedores)
+    return _motor_pesquisa
+
+# Núcleo de E/S assíncrona: um event loop asyncio em thread de fundo.
+# As funções *_async devolvem concurrent.futures.Future, que o menu pode
+# consultar (done/result) sem travar a tela.
+_loop_async = None
+_loop_async_lock = threading.Lock()
+# Executor padrão do loop (asyncio.to_thread): pesquisa, catálogo, patch...
+# Essas tarefas esperam por requisições no _executor_rede, então não podem
+# ocupar as vagas dele; o _executor_rede fica só com as chamadas HTTP
+_executor_tarefas = ThreadPoolExecutor(thread_name_prefix="bronze-tarefa")
+
+def obter_loop_async():
+    """Inicia (uma vez) e retorna o event loop que roda em segundo plano"""
+    global _loop_async
+    if _loop_async is None:
+        with _loop_async_lock:
+            if _loop_async is None:
+                loop = asyncio.new_event_loop()
+                loop.set_default_executor(_executor_tarefas)
+                threading.Thread(target=loop.run_forever, name="bronze-async", daemon=True).start()
+                _loop_async = loop
+    return _loop_async
+
+def executar_async(corrotina):
+    """Agenda a corrotina no loop de fundo e retorna um Future consultável"""
+    return asyncio.run_coroutine_threadsafe(corrotina, obter_loop_async())
+
+async def buscar_url(url, metodo='GET', **kwargs):
+    """Requisição HTTP aguardável sobre a sessão compartilhada (pool + tentativas)"""
+    kwargs.setdefault('timeout', REDE_TIMEOUT)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor_rede, partial(obter_sessao().request, metodo, url, **kwargs))
+
+async def _baixar_dados(meta=None):
+    headers = {
+        'Cache-Control': 'no-cache',
+        'Pragma': 'no-cache'
+    }
+    # Requisição condicional: sem mudanças o servidor responde 304, sem corpo
+    if meta and meta.get('etag'):
+        headers['If-None-Match'] = meta['etag']
+    if meta and meta.get('last_modified'):
+        headers['If-Modified-Since'] = meta['last_modified']
+    with METRICAS.medir("rede.dados"):
+        response = await buscar_url(DATA_URL, headers=headers)
+    response.raise_for_status()
+    return response
+
+def baixar_dados_async(meta=None):
+    """Baixa o dados.json em segundo plano; o Future resolve para a resposta HTTP
+
+    Com os metadados do snapshot, a requisição é condicional e pode voltar 304.
+    """
+    return executar_async(_baixar_dados(meta))
+
+def aplicar_resposta_dados(response):
+    """Atualiza o snapshot com a resposta do dados.json; retorna True se mudou"""
+    if response.status_code == 304:
+        renovar_cache()
+        return False
+    with METRICAS.medir("json.dados"):
+        dados = json.loads(response.content)
+    salvar_cache(dados, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+    return True
+
+async def _atualizar_dados(meta):
+    # Primeiro o feed incremental; qualquer problema com ele cai no download completo
+    if meta and meta.get('checksum'):
+        try:
+            with METRICAS.medir("rede.patch"):
+                response = await buscar_url(DATA_PATCH_URL, headers={'Cache-Control': 'no-cache'})
+            if response.status_code == 200:
+                if await asyncio.to_thread(aplicar_patch_dados, response.json()):
+                    return True
+        except (requests.RequestException, ValueError):
+            pass
+    response = await _baixar_dados(meta)
+    return await asyncio.to_thread(aplicar_resposta_dados, response)
+
+def atualizar_dados_async(meta=None):
+    """Atualiza o snapshot em segundo plano: patch incremental se possível, senão dados.json completo"""
+    return executar_async(_atualizar_dados(meta))
+
+_revalidacao = None
+_revalidacao_lock = threading.Lock()  # O pré-carregamento e o menu revalidam de threads diferentes
+
+def revalidar_cache_async(meta):
+    """Revalida o snapshot em segundo plano (stale-while-revalidate)
+
+    Só uma revalidação roda por vez; erros apenas mantêm o snapshot atual.
+    O Future é compartilhado: quem espera por ele não deve cancelá-lo.
+    """
+    global _revalidacao
+    with _revalidacao_lock:
+        if _revalidacao is None or _revalidacao.done():
+            _revalidacao = atualizar_dados_async(meta)
+        return _revalidacao
+
+def pesquisar_async(termo, ao_receber=None):
+    """Pesquisa em segundo plano; `ao_receber` roda na thread do provedor"""
+    return executar_async(asyncio.to_thread(buscar_torrents, termo, ao_receber))
+
+def pesquisar_em_fluxo_async(termo, destino, ao_receber=None):
+    """Pesquisa em segundo plano preenchendo `destino`; o Future termina com a pesquisa"""
+    return executar_async(asyncio.to_thread(buscar_torrents_em_fluxo, termo, destino, ao_receber))
+
+def aguardar_futuro(futuro, ao_esperar=None, intervalo=0.05, cancelar=True):
+    """Espera o Future sem bloquear Ctrl+C, chamando `ao_esperar` a cada volta
+
+    Com Ctrl+C o Future é cancelado (só se `cancelar`; um Future
+    compartilhado continua para os outros) e o KeyboardInterrupt repassado.
+    """
+    try:
+        while True:
+            try:
+                return futuro.result(timeout=intervalo)
+            except FuturoTimeout:
+                pass
+            finally:
+                if ao_esperar:
+                    ao_esperar()
+    except KeyboardInterrupt:
+        if cancelar:
+            futuro.cancel()
+        raise
+
+# Funções para Favoritos
+FAVORITOS_POR_PAGINA = 10
+FAVORITOS_MAX_SUBCATEGORIAS = 64  # Acima disso o filtro por categoria percorre o índice por data
+
+def adicionar_favorito(url, titulo, categoria):
+    try:
+        # Um único INSERT atômico: se a URL já existe, nada é gravado
+        inseridos = BronzeDB().executar('''
+            INSERT INTO favoritos (url, titulo, categoria, data_adicao)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (url) DO NOTHING
+        ''', (url, titulo, categoria, datetime.now()))
+        if inseridos:
             print_vermelho("\n[+] Link adicionado aos favoritos!")
-            time.sleep(1)
+        else:
+            print_vermelho("\n[!] Este link já está nos favoritos!")
+        time.sleep(1)
     except Exception as e:
         print_vermelho(f"\n[!] Erro ao adicionar favorito: {str(e)}")
         time.sleep(1)
 
+def _filtro_categoria(categoria):
+    """Condição SQL para a categoria e todas as subcategorias dela (usa o índice)"""
+    if not categoria:
+        return "", ()
+    # "Jogos > PC" pega "Jogos > PC" e "Jogos > PC > ...", mas não "Jogos > PCs"
+    return " AND (categoria = ? OR (categoria >= ? AND categoria < ?))", (
+        categoria, categoria + " > ", categoria + " >!")
+
+def contar_favoritos(categoria=None):
+    filtro, parametros = _filtro_categoria(categoria)
+    return BronzeDB().consultar_um(f"SELECT COUNT(*) FROM favoritos WHERE 1 = 1{filtro}", parametros)[0]
+
+def _categorias_favoritos(categoria):
+    """Categorias distintas iguais a `categoria` ou abaixo dela, pulando pelo índice"""
+    return [linha[0] for linha in BronzeDB().consultar('''
+        WITH RECURSIVE subcategorias (nome) AS (
+            SELECT MIN(categoria) FROM favoritos WHERE categoria >= ?2 AND categoria < ?3
+            UNION ALL
+            SELECT (SELECT MIN(categoria) FROM favoritos WHERE categoria > nome AND categoria < ?3)
+            FROM subcategorias WHERE nome IS NOT NULL
+        )
+        SELECT ?1 WHERE EXISTS (SELECT 1 FROM favoritos WHERE categoria = ?1)
+        UNION ALL
+        SELECT nome FROM subcategorias WHERE nome IS NOT NULL
+        LIMIT ?4
+    ''', (categoria, categoria + " > ", categoria + " >!", FAVORITOS_MAX_SUBCATEGORIAS + 1))]
+
+def pagina_favoritos(categoria=None, apos=None, limite=FAVORITOS_POR_PAGINA):
+    """Favoritos mais recentes primeiro, paginados por chave (data_adicao, url)
+
+    `apos` é a chave do último item da página anterior; o custo não depende
+    de quantas páginas ficaram para trás. Com categoria, cada subcategoria é
+    lida pelo próprio índice e as páginas são intercaladas.
+    """
+    chave = " AND (data_adicao, url) < (?, ?)" if apos is not None else ""
+    parametros_chave = tuple(apos) if apos is not None else ()
+    colunas = "url, titulo, categoria, data_adicao"
+    ordem = "ORDER BY data_adicao DESC, url DESC LIMIT ?"
+
+    categorias = _categorias_favoritos(categoria) if categoria else None
+    if categorias is None or len(categorias) > FAVORITOS_MAX_SUBCATEGORIAS:
+        filtro, parametros = _filtro_categoria(categoria)
+        return BronzeDB().consultar(f"SELECT {colunas} FROM favoritos WHERE 1 = 1{filtro}{chave} {ordem}",
+                                    parametros + parametros_chave + (limite,))
+    if not categorias:
+        return []
+    consulta = " UNION ALL ".join(
+        f"SELECT * FROM (SELECT {colunas} FROM favoritos WHERE categoria = ?{chave} {ordem})"
+        for _ in categorias
+    )
+    parametros = tuple(p for nome in categorias for p in (nome, *parametros_chave, limite))
+    return BronzeDB().consultar(f"{consulta} {ordem}", parametros + (limite,))
+
 def mostrar_favoritos():
     try:
-        with sqlite3.connect(DB_FILE, timeout=30) as conn:
-            conn.execute("PRAGMA journal_mode=WAL")
-            favoritos = conn.execute('''
-                SELECT url, titulo, categoria, data_adicao 
-                FROM favoritos 
-                ORDER BY data_adicao DESC
-            ''').fetchall()
-            
+        categoria = None
+        total = contar_favoritos()
+        if not total:
+            print_vermelho("\n[!] Nenhum favorito encontrado!")
+            return
+
+        # Chaves de início de cada página já visitada (para voltar)
+        inicios = [None]
+        while True:
+            favoritos = pagina_favoritos(categoria, inicios[-1], FAVORITOS_POR_PAGINA + 1)
+            tem_proxima = len(favoritos) > FAVORITOS_POR_PAGINA
+            favoritos = favoritos[:FAVORITOS_POR_PAGINA]
+            if not favoritos and len(inicios) > 1:
+                inicios.pop()  # A página ficou vazia depois de uma remoção
+                continue
+            pagina = len(inicios)
+            total_paginas = max(1, (total + FAVORITOS_POR_PAGINA - 1) // FAVORITOS_POR_PAGINA)
+
+            tela = Quadro("favoritos")
+            tela.escrever(ASCII_ART)
+            tela.escrever("\n=== FAVORITOS ===")
+            if categoria:
+                tela.escrever(f"[*] Categoria: {categoria}")
             if not favoritos:
-                print_vermelho("\n[!] Nenhum favorito encontrado!")
-                return
-            
-            print_vermelho("\n=== FAVORITOS ===")
-            for i, (url, titulo, categoria, data) in enumerate(favoritos, 1):
-                print_vermelho(f"\n{i}. {titulo}")
-                print_vermelho(f"   Categoria: {categoria}")
-                print_vermelho(f"   URL: {url}")
-                print_vermelho(f"   Adicionado em: {data}")
-                
-            print_vermelho("\nR - Remover favorito | V - Voltar")
+                tela.escrever("\n[!] Nenhum favorito nesta categoria!")
+            for i, (url, titulo, categoria_item, data) in enumerate(favoritos, 1):
+                tela.escrever(f"\n{i}. {titulo}")
+                tela.escrever(f"   Categoria: {categoria_item}")
+                tela.escrever(f"   URL: {url}")
+                tela.escrever(f"   Adicionado em: {data}")
+
+            tela.escrever(f"\nPágina {pagina}/{total_paginas} - Total de {total} favoritos")
+            opcoes = []
+            if pagina > 1:
+                opcoes.append("A - Página anterior")
+            if tem_proxima:
+                opcoes.append("P - Próxima página")
+            opcoes += ["C - Filtrar por categoria", "R - Remover favorito", "V - Voltar"]
+            tela.escrever("\n" + " | ".join(opcoes))
+            desenhar(tela)
             escolha = input_vermelho("\nEscolha uma opção: ").upper()
-            
-            if escolha == 'R':
+
+            if escolha == 'P' and tem_proxima:
+                inicios.append((favoritos[-1][3], favoritos[-1][0]))
+            elif escolha == 'A' and pagina > 1:
+                inicios.pop()
+            elif escolha == 'C':
+                categoria = input_vermelho("Categoria (ex: Jogos > Emuladores, vazio para todas): ").strip() or None
+                total = contar_favoritos(categoria)
+                inicios = [None]
+            elif escolha == 'R':
                 try:
                     num = int(input_vermelho("Digite o número do favorito para remover: "))
                     if 1 <= num <= len(favoritos):
                         url = favoritos[num-1][0]
                         remover_favorito(url)
+                        total = contar_favoritos(categoria)
                 except ValueError:
                     print_vermelho("\n[!] Número inválido!")
                     time.sleep(1)
+            elif escolha == 'V':
+                break
+            else:
+                print_vermelho("\n[!] Opção inválida!")
+                time.sleep(1)
     except Exception as e:
         print_vermelho(f"\n[!] Erro ao mostrar favoritos: {str(e)}")
         time.sleep(1)
 
-def remover_favorito(url):
+def remover_favorito(url):
+    try:
+        BronzeDB().executar('DELETE FROM favoritos WHERE url = ?', (url,))
+        print_vermelho("\n[+] Link removido dos favoritos!")
+        time.sleep(1)
+    except Exception as e:
+        print_vermelho(f"\n[!] Erro ao remover favorito: {str(e)}")
+        time.sleep(1)
+
+# Histórico de Navegação
+def adicionar_historico(caminho):
+    """Registra o acesso no histórico (gravado em lote pelo BronzeDB)"""
+    BronzeDB().registrar_historico(" > ".join(caminho))
+
+def mostrar_historico():
+    try:
+        db = BronzeDB()
+        db.descarregar_historico()
+        historico = db.consultar('''
+            SELECT caminho, ultimo_acesso, total_acessos
+            FROM historico_resumo
+            ORDER BY ultimo_acesso DESC
+            LIMIT 10
+        ''')
+        
+        if not historico:
+            print_vermelho("\n[!] Nenhum histórico encontrado!")
+            return
+        
+        print_vermelho("\n=== HISTÓRICO DE NAVEGAÇÃO ===")
+        for i, (caminho, data, total) in enumerate(historico, 1):
+            data_formatada = datetime.fromisoformat(data).strftime("%d/%m/%Y %H:%M")
+            print_vermelho(f"\n{i}. Caminho acessado: {caminho}")
+            print_vermelho(f"   Último acesso: {data_formatada}")
+            print_vermelho(f"   Total de acessos: {total}")
+        
+        print_vermelho("\nL - Limpar histórico | V - Voltar")
+        escolha = input_vermelho("\nEscolha uma opção: ").upper()
+        
+        if escolha == 'L':
+            db.limpar_historico()
+            print_vermelho("\n[+] Histórico limpo com sucesso!")
+            time.sleep(1.5)
+            
+    except Exception as e:
+        print_vermelho(f"\n[!] Erro ao mostrar histórico: {str(e)}")
+
+# Catálogo de links (busca por texto)
+# Índice FTS5 no bronze.db com o caminho, a URL, o host e a descrição de
+# cada link do dados.json. catalogo_nos guarda o hash de cada pasta/folha
+# já indexada (o mesmo do snapshot): numa versão nova do dataset só as
+# partes cujo hash mudou são reindexadas.
+CATALOGO_RESULTADOS = 20
+CATALOGO_CANDIDATOS = 1000  # Termos muito comuns: só os primeiros candidatos entram no ranking
+CATALOGO_PESOS = (2, 1, 4, 3)  # caminho, url, host, descrição
+_catalogo_lock = threading.Lock()
+
+def _links_da_folha(tipo, valor):
+    """(url, descrição) de cada link de uma folha do dados.json, como mostrar_links exibe"""
+    if tipo == NO_LISTA:
+        itens = json.loads(valor)
+    elif tipo == NO_LINK:
+        itens = [json.loads(valor)]
+    elif tipo == NO_TEXTO:
+        itens = [valor]
+    else:
+        return []
+    return [
+        (item['url'], item.get('descrição', '')) if isinstance(item, dict) and 'url' in item else (str(item), '')
+        for item in itens
+    ]
+
+# Esquema, usuário e porta ficam de fora; bem mais rápido que urlsplit em 1M de links
+_RE_HOST = re.compile(r'^[A-Za-z][A-Za-z0-9+.-]*://(?:[^@/?#]*@)?(\[[^\]/?#]*\]|[^:/?#]*)')
+
+def _host(url):
+    encontrado = _RE_HOST.match(url)
+    return encontrado.group(1).lower() if encontrado else ''
+
+# O índice FTS (conteúdo externo) é mantido à mão, uma folha por vez:
+# triggers por linha deixavam a indexação inicial umas 4x mais lenta
+def _remover_links(conn, condicao, parametros):
+    conn.execute(f'''
+        INSERT INTO catalogo_fts (catalogo_fts, rowid, caminho, url, host, descricao)
+        SELECT 'delete', id, caminho, url, host, descricao FROM catalogo_links WHERE {condicao}
+    ''', parametros)
+    conn.execute(f'DELETE FROM catalogo_links WHERE {condicao}', parametros)
+
+def _inserir_links(conn, caminho, links):
+    conn.executemany('INSERT INTO catalogo_links (caminho, url, host, descricao) VALUES (?, ?, ?, ?)',
+                     [(caminho, url, _host(url), descricao) for url, descricao in links])
+    conn.execute('''
+        INSERT INTO catalogo_fts (rowid, caminho, url, host, descricao)
+        SELECT id, caminho, url, host, descricao FROM catalogo_links WHERE caminho = ?
+    ''', (caminho,))
+
+def _remover_do_catalogo(conn, caminho):
+    """Remove do catálogo o caminho e tudo abaixo dele"""
+    condicao = "caminho = ? OR (caminho >= ? AND caminho < ?)"
+    faixa = (caminho, caminho + " > ", caminho + " >!")
+    _remover_links(conn, condicao, faixa)
+    conn.execute(f'DELETE FROM catalogo_nos WHERE {condicao}', faixa)
+
+def _sincronizar_catalogo(conn, snapshot, pasta_id, caminho_pasta):
+    antigos = {
+        caminho: (tipo, hash_no)
+        for caminho, tipo, hash_no in conn.execute(
+            'SELECT caminho, tipo, hash FROM catalogo_nos WHERE pai = ?', (caminho_pasta,))
+    }
+    filhos = snapshot.execute(
+        'SELECT id, chave, tipo, valor, hash FROM snapshot_nos WHERE pai = ? ORDER BY id', (pasta_id,)).fetchall()
+    for no_id, chave, tipo, valor, hash_no in filhos:
+        caminho = f"{caminho_pasta} > {chave}" if caminho_pasta else chave
+        antigo = antigos.pop(caminho, None)
+        if antigo == (tipo, hash_no):
+            continue  # Nada mudou nesta parte da árvore
+        if antigo is not None and (antigo[0] == NO_PASTA) != (tipo == NO_PASTA):
+            _remover_do_catalogo(conn, caminho)
+        conn.execute('INSERT OR REPLACE INTO catalogo_nos (caminho, pai, tipo, hash) VALUES (?, ?, ?, ?)',
+                     (caminho, caminho_pasta, tipo, hash_no))
+        if tipo == NO_PASTA:
+            _sincronizar_catalogo(conn, snapshot, no_id, caminho)
+        else:
+            if antigo is not None:
+                _remover_links(conn, "caminho = ?", (caminho,))
+            _inserir_links(conn, caminho, _links_da_folha(tipo, valor))
+    for caminho in antigos:
+        _remover_do_catalogo(conn, caminho)
+
+def atualizar_catalogo():
+    """Deixa o catálogo igual ao snapshot atual; retorna False se não houver snapshot"""
+    if not Path(CACHE_FILE).exists() or not BronzeDB().catalogo_disponivel:
+        return False
+    with _catalogo_lock:
+        snapshot = _conectar_snapshot()
+        try:
+            # Lê tudo de uma mesma versão do snapshot, mesmo que ele seja regravado
+            snapshot.execute('BEGIN')
+            meta = dict(snapshot.execute('SELECT chave, valor FROM snapshot_meta'))
+            checksum = meta.get('checksum')
+            if not checksum:
+                return False
+            db = BronzeDB()
+            indexado = db.consultar_um("SELECT valor FROM catalogo_meta WHERE chave = 'checksum'")
+            if indexado and indexado[0] == checksum:
+                return True
+            with db.transacao() as conn:
+                _sincronizar_catalogo(conn, snapshot, _RAIZ_SNAPSHOT, '')
+                conn.execute("INSERT OR REPLACE INTO catalogo_meta (chave, valor) VALUES ('checksum', ?)",
+                             (checksum,))
+            return True
+        finally:
+            snapshot.close()
+
+def atualizar_catalogo_async():
+    return executar_async(asyncio.to_thread(atualizar_catalogo))
+
+def _normalizar_busca(texto):
+    """Minúsculas e sem acentos, como o tokenizador do FTS5 (unicode61, remove_diacritics)"""
+    if texto.isascii():
+        return texto.lower()
+    sem_acentos = unicodedata.normalize('NFKD', texto.casefold())
+    return "".join(c for c in sem_acentos if not unicodedata.combining(c))
+
+def _relevancia(termos, linha, caminhos):
+    """Soma, por termo, o peso da melhor coluna em que ele aparece"""
+    caminho, *outras = linha
+    if caminho not in caminhos:
+        caminhos[caminho] = _normalizar_busca(caminho)  # Repetido em todos os links da folha
+    colunas = [(CATALOGO_PESOS[0], caminhos[caminho])]
+    colunas += [(peso, _normalizar_busca(valor)) for peso, valor in zip(CATALOGO_PESOS[1:], outras)]
+    return sum(max((peso for peso, valor in colunas if termo in valor), default=0) for termo in termos)
+
+def buscar_no_catalogo(texto, limite=CATALOGO_RESULTADOS, candidatos=CATALOGO_CANDIDATOS):
+    """Links que casam com todos os termos, mais relevantes primeiro: [(caminho, url, descrição)]
+
+    O bm25 do FTS5 conta em quantos links cada termo aparece, o que custa
+    proporcional ao catálogo. Aqui os candidatos são colhidos com LIMIT
+    (primeiro pelos casamentos no host/descrição, depois em qualquer coluna)
+    e ordenados pelos pesos de CATALOGO_PESOS, em tempo limitado por
+    `candidatos` e não pelo tamanho do catálogo.
+    """
+    termos = re.findall(r"\w+", _normalizar_busca(texto))
+    if not termos:
+        return []
+    # Termos exatos, menos o último, que vale como prefixo (busca enquanto digita)
+    consulta = " ".join(f'"{termo}"' for termo in termos[:-1]) + f' "{termos[-1]}"*'
+
+    db = BronzeDB()
+    encontrados = {}
+    for filtro in ("{host descricao} : ", ""):
+        for no_id, *linha in db.consultar('''
+            SELECT l.id, l.caminho, l.url, l.host, l.descricao
+            FROM (SELECT rowid FROM catalogo_fts WHERE catalogo_fts MATCH ? LIMIT ?) AS casados
+            JOIN catalogo_links l ON l.id = casados.rowid
+        ''', (f"{filtro}({consulta})", candidatos)):
+            encontrados.setdefault(no_id, linha)
+        if len(encontrados) >= candidatos:
+            break
+
+    caminhos = {}
+    ordenados = sorted(encontrados.values(),
+                       key=lambda linha: (-_relevancia(termos, linha, caminhos), len(linha[1])))
+    return [(caminho, url, descricao) for caminho, url, host, descricao in ordenados[:limite]]
+
+def pesquisar_catalogo():
+    limpar_tela()
+    print_vermelho(ASCII_ART)
+    print_vermelho("\n[*] BUSCA NO CATÁLOGO DE LINKS")
+    print_vermelho("=" * 50)
+
     try:
-        with sqlite3.connect(DB_FILE, timeout=30) as conn:
-            conn.execute("PRAGMA journal_mode=WAL")
-            conn.execute('DELETE FROM favoritos WHERE url = ?', (url,))
-            conn.commit()
-            print_vermelho("\n[+] Link removido dos favoritos!")
-            time.sleep(1)
-    except Exception as e:
-        print_vermelho(f"\n[!] Erro ao remover favorito: {str(e)}")
-        time.sleep(1)
+        if not BronzeDB().catalogo_disponivel:
+            print_vermelho("\n[!] Este SQLite não tem suporte a FTS5; a busca no catálogo está indisponível.")
+            input_vermelho("\nPressione Enter para voltar ao menu...")
+            return
+        if not Path(CACHE_FILE).exists() and not carregar_dados():
+            return
+        print_vermelho("[*] Atualizando o índice...")
+        atualizar_catalogo()
 
-# Histórico de Navegação
-def adicionar_historico(caminho):
-    """Registra o acesso no histórico"""
+        while True:
+            texto = input_vermelho("\nDigite o que procura (vazio para voltar): ").strip()
+            if not texto:
+                return
+            inicio = time.perf_counter()
+            resultados = buscar_no_catalogo(texto)
+            decorrido = (time.perf_counter() - inicio) * 1000
+            if not resultados:
+                print_vermelho("\n[!] Nenhum link encontrado!")
+                continue
+
+            print_vermelho(f"\n[+] {len(resultados)} resultados em {decorrido:.1f} ms")
+            for i, (caminho, url, descricao) in enumerate(resultados, 1):
+                print_vermelho(f"\n{i}. {url}")
+                print_vermelho(f"   {caminho}")
+                if descricao:
+                    print_vermelho(f"   → {descricao}")
+
+            escolha = input_vermelho("\nNúmero do link para abrir (Enter para nova busca): ").strip()
+            if escolha.isdigit() and 1 <= int(escolha) <= len(resultados):
+                caminho, url, descricao = resultados[int(escolha) - 1]
+                link = {'url': url, 'descrição': descricao} if descricao else url
+                partes = caminho.split(" > ")
+                mostrar_links(partes[-1], [link], partes)
+    except sqlite3.Error as e:
+        print_vermelho(f"\n[!] Erro na busca do catálogo: {str(e)}")
+        input_vermelho("\nPressione Enter para voltar ao menu...")
+
+# Saúde dos links
+# Varre todas as URLs do dados.json e guarda status, latência e a data da
+# verificação na tabela saude_links do bronze.db; mostrar_links marca os links
+# fora do ar ou lentos a partir dela, sem nenhuma requisição nova.
+# Cada URL recebe um HEAD (com GET se o HEAD falhar). Há um limite de
+# conexões por host, outro no total, um teto de requisições por segundo e um
+# orçamento de tempo para a varredura inteira: o que não couber fica para a
+# próxima.
+_executor_links = None
+_sessao_links = None
+_links_lock = threading.Lock()
+
+def _obter_recursos_links():
+    """Threads e sessão HTTP próprias da varredura (sem novas tentativas: um erro já é o resultado)"""
+    global _executor_links, _sessao_links
+    if _sessao_links is None:
+        with _links_lock:
+            if _sessao_links is None:
+                from requests.adapters import HTTPAdapter
+                adaptador = HTTPAdapter(pool_connections=LINKS_CONCORRENCIA, pool_maxsize=LINKS_POR_HOST,
+                                        max_retries=0)
+                sessao = requests.Session()
+                sessao.headers.update(HEADERS_PESQUISA)
+                sessao.mount("https://", adaptador)
+                sessao.mount("http://", adaptador)
+                _executor_links = ThreadPoolExecutor(max_workers=LINKS_CONCORRENCIA, thread_name_prefix="bronze-links")
+                _sessao_links = sessao
+    return _executor_links, _sessao_links
+
+def _checar_link(sessao, url, timeout):
+    """(status ou None, segundos, erro ou None) de uma URL: HEAD, e GET se o HEAD não servir"""
+    inicio = time.monotonic()
     try:
-        with sqlite3.connect(DB_FILE, timeout=30) as conn:
-            conn.execute("PRAGMA journal_mode=WAL")
-            conn.execute('''
-                INSERT INTO historico (caminho, data_acesso)
-                VALUES (?, ?)
-            ''', (" > ".join(caminho), datetime.now()))
-            conn.commit()
-    except Exception as e:
-        print_vermelho(f"\n[!] Erro ao registrar histórico: {str(e)}")
+        response = sessao.head(url, timeout=timeout, allow_redirects=True)
+        if response.status_code >= 400:
+            # Muitos servidores recusam HEAD (405, 403, 404...) mas atendem GET;
+            # o corpo não é lido
+            response = sessao.get(url, timeout=timeout, allow_redirects=True, stream=True)
+            response.close()
+        return response.status_code, time.monotonic() - inicio, None
+    except requests.RequestException as e:
+        return None, time.monotonic() - inicio, type(e).__name__
+    except ValueError:
+        # Host malformado ('ex..com', rótulo com mais de 63 caracteres): o urllib3
+        # recusa com um ValueError que não passa pelas exceções do requests
+        return None, time.monotonic() - inicio, 'InvalidURL'
 
-def mostrar_historico():
+async def _verificar_links(urls, concorrencia, por_host, taxa, orcamento, ao_verificar):
+    loop = asyncio.get_running_loop()
+    executor, sessao = _obter_recursos_links()
+    limite = asyncio.Semaphore(concorrencia)
+    limites_host = {}
+    prazo = loop.time() + orcamento
+    proxima_vaga = loop.time()
+    resultados = []
+
+    async def verificar(url):
+        nonlocal proxima_vaga
+        # Primeiro a vaga do host: um host lento não segura as vagas globais
+        async with limites_host.setdefault(_host(url).lower(), asyncio.Semaphore(por_host)):
+            async with limite:
+                # Teto de taxa: os inícios ficam espaçados de 1/taxa segundo
+                agora = loop.time()
+                vez = max(agora, proxima_vaga)
+                proxima_vaga = vez + 1 / taxa
+                if vez > agora:
+                    await asyncio.sleep(vez - agora)
+                restante = prazo - loop.time()
+                if restante <= 0:
+                    return  # Orçamento esgotado: fica sem verificar
+                status, segundos, erro = await loop.run_in_executor(
+                    executor, _checar_link, sessao, url, min(LINKS_TIMEOUT, restante))
+        resultados.append((url, status, segundos, erro))
+        if ao_verificar:
+            ao_verificar(url, status, segundos)
+
+    await asyncio.gather(*(verificar(url) for url in urls))
+    return resultados
+
+def verificar_links_async(urls, concorrencia=LINKS_CONCORRENCIA, por_host=LINKS_POR_HOST,
+                          taxa=LINKS_TAXA_MAXIMA, orcamento=LINKS_ORCAMENTO, ao_verificar=None):
+    """Checa várias URLs em paralelo; resolve para [(url, status ou None, segundos, erro)]
+
+    URLs que não couberam no orçamento de tempo ficam fora do resultado.
+    `ao_verificar(url, status, segundos)` roda no loop de fundo a cada URL.
+    """
+    return executar_async(_verificar_links(list(urls), concorrencia, por_host, taxa, orcamento, ao_verificar))
+
+def urls_dos_dados(dados):
+    """Todas as URLs http(s) da árvore (dict ou PastaSnapshot), sem repetir, na ordem dos menus"""
+    urls = {}
+
+    def percorrer(pasta):
+        for valor in pasta.values():
+            if isinstance(valor, Mapping) and 'url' not in valor:
+                percorrer(valor)
+                continue
+            for item in _itens_folha(_tipo_no(valor), valor):
+                url = item['url'] if isinstance(item, dict) and 'url' in item else str(item)
+                if url.startswith(('http://', 'https://')):
+                    urls[url] = None
+
+    percorrer(dados)
+    return list(urls)
+
+def salvar_saude_links(resultados):
+    agora = datetime.now()
+    with BronzeDB().transacao() as conn:
+        conn.executemany('''
+            INSERT OR REPLACE INTO saude_links (url, status, latencia, erro, data_verificacao)
+            VALUES (?, ?, ?, ?, ?)
+        ''', [(url, status, segundos, erro, agora) for url, status, segundos, erro in resultados])
+
+def link_fora_do_ar(status):
+    """Sem resposta, ou erro que não seja só o servidor barrando o robô (401, 403, 429)"""
+    return status is None or (status >= 400 and status not in (401, 403, 429))
+
+def saude_links(urls):
+    """{url: (status, latência)} das verificações ainda válidas destas URLs"""
+    validade = datetime.now() - timedelta(days=LINKS_VALIDADE_DIAS)
+    urls = list(urls)
+    saude = {}
+    for inicio in range(0, len(urls), 500):
+        lote = urls[inicio:inicio + 500]
+        for url, status, latencia in BronzeDB().consultar(f'''
+            SELECT url, status, latencia FROM saude_links
+            WHERE url IN ({", ".join("?" * len(lote))}) AND data_verificacao >= ?
+        ''', (*lote, validade)):
+            saude[url] = (status, latencia)
+    return saude
+
+def marca_saude(saude, url):
+    """Aviso mostrado ao lado do link em mostrar_links ('' se está tudo bem ou não verificado)"""
+    if url not in saude:
+        return ""
+    status, latencia = saude[url]
+    if link_fora_do_ar(status):
+        return f" [FORA DO AR{f': {status}' if status else ''}]"
+    if latencia >= LINKS_LENTO:
+        return f" [LENTO: {latencia:.1f}s]"
+    return ""
+
+def verificar_saude_links():
+    limpar_tela()
+    print_vermelho(ASCII_ART)
+    print_vermelho("\n[*] VERIFICAÇÃO DOS LINKS")
+    print_vermelho("=" * 50)
+
+    dados = carregar_dados()
+    if not dados:
+        return
+    urls = urls_dos_dados(dados)
+    print_vermelho(f"\n[*] {len(urls)} links em {len({_host(url).lower() for url in urls})} hosts")
+    verificados = [0]
+    inicio = time.perf_counter()
     try:
-        with sqlite3.connect(DB_FILE, timeout=30) as conn:
-            conn.execute("PRAGMA journal_mode=WAL")
-            historico = conn.execute('''
-                SELECT DISTINCT caminho, MAX(data_acesso) as ultima_visita, 
-                       COUNT(*) as total_acessos
-                FROM historico 
-                GROUP BY caminho 
-                ORDER BY ultima_visita DESC 
-                LIMIT 10
-            ''').fetchall()
-            
-            if not historico:
-                print_vermelho("\n[!] Nenhum histórico encontrado!")
-                return
-            
-            print_vermelho("\n=== HISTÓRICO DE NAVEGAÇÃO ===")
-            for i, (caminho, data, total) in enumerate(historico, 1):
-                data_formatada = datetime.fromisoformat(data).strftime("%d/%m/%Y %H:%M")
-                print_vermelho(f"\n{i}. Caminho acessado: {caminho}")
-                print_vermelho(f"   Último acesso: {data_formatada}")
-                print_vermelho(f"   Total de acessos: {total}")
-            
-            print_vermelho("\nL - Limpar histórico | V - Voltar")
-            escolha = input_vermelho("\nEscolha uma opção: ").upper()
-            
-            if escolha == 'L':
-                conn.execute('DELETE FROM historico')
-                conn.commit()
-                print_vermelho("\n[+] Histórico limpo com sucesso!")
-                time.sleep(1.5)
-                
-    except Exception as e:
-        print_vermelho(f"\n[!] Erro ao mostrar histórico: {str(e)}")
+        with nova_barra_progresso(transient=True) as progress:
+            task = progress.add_task("[red]Verificando...", total=len(urls))
+            futuro = verificar_links_async(urls, ao_verificar=lambda *_: verificados.__setitem__(0, verificados[0] + 1))
+            resultados = aguardar_futuro(futuro, lambda: progress.update(task, completed=verificados[0]))
+        salvar_saude_links(resultados)
+    except KeyboardInterrupt:
+        print_vermelho("\n[!] Verificação cancelada.")
+        return
+
+    fora = sum(link_fora_do_ar(status) for _, status, _, _ in resultados)
+    lentos = sum(not link_fora_do_ar(status) and segundos >= LINKS_LENTO for _, status, segundos, _ in resultados)
+    print_vermelho(f"\n[+] {len(resultados)} links verificados em {time.perf_counter() - inicio:.1f}s")
+    print_vermelho(f"[!] Fora do ar: {fora} | Lentos: {lentos}")
+    if len(resultados) < len(urls):
+        print_vermelho(f"[*] {len(urls) - len(resultados)} ficaram para a próxima (orçamento de {LINKS_ORCAMENTO}s)")
+
+# Estatísticas da sessão (menu 7): o que METRICAS juntou até agora
+METRICAS_ARQUIVO_PADRAO = "bronze_metricas.json"
+
+def mostrar_estatisticas():
+    if not METRICAS.ativas:
+        print_vermelho("\n[!] Métricas desativadas (BRONZE_METRICAS=0)")
+        input_vermelho("\nPressione Enter para continuar...")
+        return
+    while True:
+        resumo = METRICAS.resumo()
+        tela = Quadro("estatisticas")
+        tela.escrever(ASCII_ART)
+        tela.escrever(f"\n=== ESTATÍSTICAS === (desde {resumo['inicio']}, {resumo['duracao_s']:.0f}s)")
+        if resumo['latencias']:
+            largura = max(len("Latência (ms)"), *map(len, resumo['latencias']))
+            tela.escrever(f"\n{'Latência (ms)':<{largura}} {'n':>7} {'p50':>9} {'p95':>9} {'p99':>9} {'máx':>9}")
+            for nome, latencia in resumo['latencias'].items():
+                tela.escrever(f"{nome:<{largura}} {latencia['n']:>7} {latencia['p50_ms']:>9.2f} "
+                              f"{latencia['p95_ms']:>9.2f} {latencia['p99_ms']:>9.2f} {latencia['max_ms']:>9.2f}")
+        else:
+            tela.escrever("\n[*] Nenhuma medição ainda")
+        if resumo['contadores']:
+            largura = max(len("Contador"), *map(len, resumo['contadores']))
+            tela.escrever(f"\n{'Contador':<{largura}} {'total':>9}")
+            for nome, total in resumo['contadores'].items():
+                tela.escrever(f"{nome:<{largura}} {total:>9}")
+        tela.escrever("\nS - Salvar em JSON | Z - Zerar | V - Voltar")
+        desenhar(tela)
+        
+        escolha = input_vermelho("\nEscolha uma opção: ").upper()
+        if escolha == 'S':
+            padrao = METRICAS_ARQUIVO or METRICAS_ARQUIVO_PADRAO
+            arquivo = input_vermelho(f"Arquivo [{padrao}]: ").strip() or padrao
+            try:
+                METRICAS.salvar(arquivo)
+                print_vermelho(f"\n[+] Métricas salvas em {arquivo}")
+            except OSError as e:
+                print_vermelho(f"\n[!] Erro ao salvar métricas: {str(e)}")
+            time.sleep(1.5)
+        elif escolha == 'Z':
+            METRICAS.zerar()
+        elif escolha == 'V':
+            break
+        else:
+            print_vermelho("\n[!] Opção inválida!")
+            time.sleep(1)
 
 def is_admin():
     try:
@@ -291,13 +2435,101 @@ def is_admin():
         return False
 
 def print_vermelho(texto):
-    print(Fore.RED + str(texto))
+    texto = str(texto)
+    print(Fore.RED + texto)
+    _contar_fora_do_quadro(texto)
 
 def input_vermelho(prompt):
-    return input(Fore.RED + prompt)
+    resposta = input(Fore.RED + prompt)
+    _contar_fora_do_quadro(prompt + resposta)
+    return resposta
+
+# Desenho das telas
+# Cada tela é montada num Quadro e vai para o terminal num único write, com
+# sequências ANSI no lugar de um cls/clear em processo separado. Quando a
+# mesma tela é redesenhada (troca de página, ordenação, aviso de opção
+# inválida) e nada rolou para fora da janela, só as linhas que mudaram são
+# reescritas: o ASCII_ART e as bordas ficam onde estão.
+# O print_vermelho e o input_vermelho contam as linhas que ocupam abaixo do
+# quadro; qualquer outra saída deve vir depois de um limpar_tela.
+ANSI_LIMPAR = "\033[H\033[2J\033[3J"
+_quadro_anterior = None  # (nome da tela, linhas, cabia na janela, tamanho da janela)
+_linhas_fora_do_quadro = 0
+
+class Quadro:
+    """Linhas de uma tela, na ordem em que o print_vermelho as mostraria"""
+
+    def __init__(self, nome):
+        self.nome = nome
+        self.linhas = []
+
+    def escrever(self, texto=""):
+        self.linhas.extend(str(texto).split("\n"))
+
+def _largura_texto(texto):
+    if texto.isascii():
+        return len(texto)
+    # Caracteres largos só existem a partir de U+1100; cada caractere distinto é consultado uma vez
+    return len(texto) + sum(texto.count(c) for c in set(texto)
+                            if c >= '\u1100' and unicodedata.east_asian_width(c) in 'WF')
+
+def _contar_fora_do_quadro(texto):
+    global _linhas_fora_do_quadro
+    if _quadro_anterior is not None:
+        colunas = _quadro_anterior[3].columns
+        _linhas_fora_do_quadro += sum(max(1, -(-_largura_texto(linha) // colunas))
+                                      for linha in texto.split("\n"))
+
+def _cabe_na_janela(linhas, tamanho):
+    # O cursor termina na linha seguinte ao quadro, que também precisa existir
+    return (len(linhas) < tamanho.lines
+            and all(_largura_texto(linha) <= tamanho.columns for linha in linhas))
+
+def _escrever_tela(texto, saida=None):
+    saida = saida or sys.stdout
+    # Fora do Windows o colorama não converte nada: o texto vai direto para o
+    # buffer binário, sem o write extra do reset do autoreset
+    buffer = getattr(saida, 'buffer', None) if os.name != 'nt' else None
+    if buffer is None:
+        saida.write(texto)
+        saida.flush()
+        return
+    saida.flush()
+    buffer.write((texto + Style.RESET_ALL).encode(saida.encoding or 'utf-8', saida.errors or 'strict'))
+    buffer.flush()
+
+@medido("tela.desenhar")
+def desenhar(tela, saida=None):
+    """Mostra o quadro inteiro com uma única escrita no terminal"""
+    global _quadro_anterior, _linhas_fora_do_quadro
+    saida = saida or sys.stdout
+    linhas = tela.linhas
+    tamanho = shutil.get_terminal_size()
+    cabe = saida.isatty() and _cabe_na_janela(linhas, tamanho)
+
+    anterior = _quadro_anterior
+    if (cabe and anterior and anterior[0] == tela.nome and anterior[2] and anterior[3] == tamanho
+            and len(anterior[1]) + _linhas_fora_do_quadro < tamanho.lines):
+        # Posiciona o cursor em cada linha alterada e apaga o que sobrou
+        # abaixo (o prompt e os avisos da vez anterior)
+        antigas = anterior[1]
+        partes = [Fore.RED]
+        for i, linha in enumerate(linhas):
+            if i >= len(antigas) or antigas[i] != linha:
+                partes.append(f"\033[{i + 1};1H{linha}\033[K")
+        partes.append(f"\033[{len(linhas) + 1};1H\033[J")
+        texto = "".join(partes)
+    else:
+        texto = ANSI_LIMPAR + Fore.RED + "\n".join(linhas) + "\n"
+
+    _quadro_anterior = (tela.nome, linhas, cabe, tamanho)
+    _linhas_fora_do_quadro = 0
+    _escrever_tela(texto, saida)
 
 def limpar_tela():
-    os.system('cls' if os.name == 'nt' else 'clear')
+    global _quadro_anterior
+    _quadro_anterior = None  # A próxima tela é desenhada inteira
+    _escrever_tela(ANSI_LIMPAR)
 
 # ASCII Art e mensagens iniciais
 ASCII_ART = """                                                                                  
@@ -324,39 +2556,52 @@ def iniciar_sistema():
         input_vermelho("\nPressione Enter para sair...")
         sys.exit(1)
 
+    BronzeDB()  # Garante que as tabelas existem
+
     limpar_tela()
     print_vermelho(ASCII_ART)
     print_vermelho("[!] SISTEMA DO BRONZE DE ACESSO RESTRITO [!]")
     print_vermelho("[*] APENAS MEMBROS DO BRONZE AUTORIZADOS [*]")
     print_vermelho("[+] TODAS AS OPERAÇÕES SÃO MONITORADAS E REGISTRADAS [+]\n")
     
-    # Corrigido o problema do display
-    progress = Progress(console=console)
-    with progress:
-        task = progress.add_task("[red]Iniciando sistema...", total=100)
-        for i in range(100):
-            time.sleep(0.02)
-            progress.update(task, advance=1)
+    if not INICIO_RAPIDO:
+        # Base, catálogo e pesquisas frequentes vão sendo preparados enquanto
+        # a barra de início roda
+        iniciar_pre_carregamento()
+        # Corrigido o problema do display
+        progress = nova_barra_progresso()
+        with progress:
+            task = progress.add_task("[red]Iniciando sistema...", total=100)
+            for i in range(100):
+                time.sleep(0.02)
+                progress.update(task, advance=1)
     
     limpar_tela()
     mostrar_menu_principal()
 
 def mostrar_menu_principal():
     while True:
-        limpar_tela()
-        print(Fore.RED + ASCII_ART)
-        print(Fore.RED + "╔═══════════════════════════════╗")
-        print(Fore.RED + "║    PAINEL DO BRONZE v1.0      ║")
-        print(Fore.RED + "╠═══════════════════════════════╣")
-        print(Fore.RED + "║ 1 - Acessar Database          ║")
-        print(Fore.RED + "║ 2 - Pesquisar Torrents        ║")
-        print(Fore.RED + "║ 3 - Favoritos                 ║")
-        print(Fore.RED + "║ 4 - Histórico                 ║")
-        print(Fore.RED + "║ 0 - Encerrar Sessão           ║")
-        print(Fore.RED + "╚═══════════════════════════════╝")
+        tela = Quadro("principal")
+        tela.escrever(ASCII_ART)
+        tela.escrever("╔═══════════════════════════════╗")
+        tela.escrever("║    PAINEL DO BRONZE v1.0      ║")
+        tela.escrever("╠═══════════════════════════════╣")
+        tela.escrever("║ 1 - Acessar Database          ║")
+        tela.escrever("║ 2 - Pesquisar Torrents        ║")
+        tela.escrever("║ 3 - Favoritos                 ║")
+        tela.escrever("║ 4 - Histórico                 ║")
+        tela.escrever("║ 5 - Buscar Links              ║")
+        tela.escrever("║ 6 - Verificar Links           ║")
+        tela.escrever("║ 7 - Estatísticas              ║")
+        tela.escrever("║ 0 - Encerrar Sessão           ║")
+        tela.escrever("╚═══════════════════════════════╝")
+        desenhar(tela)
         
         try:
-            escolha = input(Fore.RED + "\n[Bronze] Digite sua opção: ")
+            # No início rápido o pré-carregamento só começa com o menu já na tela,
+            # para não disputar a CPU com o primeiro desenho
+            iniciar_pre_carregamento()
+            escolha = input_vermelho("\n[Bronze] Digite sua opção: ")
             if escolha == "0":
                 print_slow(Fore.RED + "\n[!] Encerrando sessão do Bronze...")
                 break
@@ -372,6 +2617,13 @@ def mostrar_menu_principal():
             elif escolha == "4":
                 mostrar_historico()
                 input_vermelho("\nPressione Enter para continuar...")
+            elif escolha == "5":
+                pesquisar_catalogo()
+            elif escolha == "6":
+                verificar_saude_links()
+                input_vermelho("\nPressione Enter para continuar...")
+            elif escolha == "7":
+                mostrar_estatisticas()
             else:
                 print_vermelho("[!] Opção inválida!")
                 time.sleep(1)
@@ -394,59 +2646,85 @@ def pesquisar_torrents():
         
         pagina = 1
         ITENS_POR_PAGINA = 10
-        todos_resultados = []
         
-        # Faz a busca inicial para ter todos os resultados
-        url = f"https://apibay.org/q.php?q={termo}"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
+        # A busca roda em segundo plano e vai preenchendo `resultados`; a
+        # primeira página aparece assim que os itens dela chegam
+        resultados = ResultadosTorrent()
+        respostas = queue.SimpleQueue()
         
+        def mostrar_respostas():
+            while not respostas.empty():
+                nome, quantidade = respostas.get()
+                print_vermelho(f"[+] {nome}: {quantidade} resultados")
+        
+        print_vermelho("\n[*] Pesquisando... (Ctrl+C cancela)")
+        inicio_pesquisa = time.perf_counter()
+        futuro = pesquisar_em_fluxo_async(termo, resultados,
+                                          lambda provedor, quantidade: respostas.put((provedor.nome, quantidade)))
         try:
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            todos_resultados = response.json()
+            while not futuro.done() and len(resultados) < ITENS_POR_PAGINA:
+                mostrar_respostas()
+                time.sleep(0.05)
+            mostrar_respostas()
+            if futuro.done():
+                futuro.result()  # Repassa o erro se nenhum provedor respondeu
+            METRICAS.registrar("pesquisa.primeira_pagina", time.perf_counter() - inicio_pesquisa)
             
-            if not todos_resultados or todos_resultados[0].get('name') == 'No results returned':
+            if not resultados:
                 print_vermelho("\n[!] Nenhum resultado encontrado!")
                 input_vermelho("\nPressione Enter para voltar...")
                 return
             
-            total_paginas = (len(todos_resultados) + ITENS_POR_PAGINA - 1) // ITENS_POR_PAGINA
+            # O score vem calculado por lote na chegada, o que permite ordenar/filtrar
+            ordenado_por_score = False
+            score_minimo = 0
+            ordem = []
+            ordem_calculada = None
             
             while True:
-                limpar_tela()
-                print_vermelho(ASCII_ART)
-                print_vermelho(f"\n[*] Resultados para: {termo}")
-                print_vermelho(f"[*] Página {pagina} de {total_paginas}")
-                print_vermelho("=" * 50)
+                # Enquanto chegam itens, a ordem é refeita a cada redesenho
+                if ordem_calculada != (len(resultados), ordenado_por_score, score_minimo):
+                    ordem_calculada = (len(resultados), ordenado_por_score, score_minimo)
+                    ordem = resultados.ordem(score_minimo, ordenado_por_score)
+                carregando = not futuro.done()
+                
+                total_paginas = max(1, (len(ordem) + ITENS_POR_PAGINA - 1) // ITENS_POR_PAGINA)
+                pagina = min(pagina, total_paginas)
+                
+                tela = Quadro("resultados")
+                tela.escrever(ASCII_ART)
+                tela.escrever(f"\n[*] Resultados para: {termo}")
+                tela.escrever(f"[*] Página {pagina} de {total_paginas}")
+                if carregando:
+                    tela.escrever(f"[*] Recebendo resultados... {len(resultados)} até agora (Enter atualiza)")
+                if ordenado_por_score or score_minimo:
+                    tela.escrever(f"[*] Ordem: {'score' if ordenado_por_score else 'relevância'} | Score mínimo: {score_minimo}")
+                tela.escrever("=" * 50)
                 
                 # Calcula o índice inicial e final para a página atual
                 inicio = (pagina - 1) * ITENS_POR_PAGINA
-                fim = min(inicio + ITENS_POR_PAGINA, len(todos_resultados))
-                resultados_pagina = todos_resultados[inicio:fim]
+                fim = min(inicio + ITENS_POR_PAGINA, len(ordem))
+                indices_pagina = ordem[inicio:fim]
                 
                 # Agora a numeração é contínua usando o índice inicial
-                for i, item in enumerate(resultados_pagina, inicio + 1):
-                    nome = item.get('name', 'N/A')
-                    tamanho = format_size(int(item.get('size', 0)))
-                    seeds = item.get('seeders', 'N/A')
-                    leeches = item.get('leechers', 'N/A')
-                    
-                    print_vermelho(f"\n[{i}] {nome}")
-                    print_vermelho(f"    Tamanho: {tamanho}")
-                    print_vermelho(f"    Seeds: {seeds} | Leeches: {leeches}")
-                    print_vermelho("-" * 50)
+                for i, indice in enumerate(indices_pagina, inicio + 1):
+                    tela.escrever(f"\n[{i}] {resultados.nome(indice) or 'N/A'}")
+                    tela.escrever(f"    Tamanho: {format_size(resultados.tamanhos[indice])} | Score: {resultados.scores[indice]}/100")
+                    tela.escrever(f"    Seeds: {resultados.seeds[indice]} | Leeches: {resultados.leeches[indice]}")
+                    tela.escrever("-" * 50)
                 
                 # Menu de navegação
-                print_vermelho("\nNavegação:")
+                tela.escrever("\nNavegação:")
                 if pagina > 1:
-                    print_vermelho("A - Página anterior")
+                    tela.escrever("A - Página anterior")
                 if pagina < total_paginas:
-                    print_vermelho("P - Próxima página")
-                print_vermelho("E - Escolher torrent")
-                print_vermelho("V - Voltar ao menu")
-                print_vermelho(f"\nPágina {pagina}/{total_paginas} - Total de {len(todos_resultados)} resultados")
+                    tela.escrever("P - Próxima página")
+                tela.escrever("E - Escolher torrent")
+                tela.escrever("S - Ordenar por score" if not ordenado_por_score else "S - Ordenar por relevância")
+                tela.escrever("F - Filtrar por score mínimo")
+                tela.escrever("V - Voltar ao menu")
+                tela.escrever(f"\nPágina {pagina}/{total_paginas} - Total de {len(ordem)} resultados")
+                desenhar(tela)
                 
                 escolha = input_vermelho("\nEscolha uma opção: ").upper()
                 
@@ -454,7 +2732,7 @@ def pesquisar_torrents():
                     try:
                         num = int(input_vermelho("\nDigite o número do torrent: "))
                         if inicio + 1 <= num <= fim:
-                            item_selecionado = resultados_pagina[num - inicio - 1]
+                            item_selecionado = resultados.item(indices_pagina[num - inicio - 1])
                             analise = analisar_torrent(item_selecionado)
                             
                             while True:
@@ -471,27 +2749,35 @@ def pesquisar_torrents():
                     except ValueError:
                         print_vermelho("\n[!] Por favor, digite um número válido!")
                         time.sleep(1.5)
+                elif escolha in ('S', 'F'):
+                    if escolha == 'S':
+                        ordenado_por_score = not ordenado_por_score
+                    else:
+                        try:
+                            score_minimo = max(0, min(int(input_vermelho("\nScore mínimo (0-100): ")), 100))
+                        except ValueError:
+                            print_vermelho("\n[!] Por favor, digite um número válido!")
+                            time.sleep(1.5)
+                            continue
+                    pagina = 1
                 elif escolha == 'P' and pagina < total_paginas:
                     pagina += 1
                 elif escolha == 'A' and pagina > 1:
                     pagina -= 1
                 elif escolha == 'V':
                     break
+                elif escolha == '' and carregando:
+                    continue
                 else:
                     print_vermelho("\n[!] Opção inválida!")
                     time.sleep(1.5)
                 
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError, OSError) as e:
             print_vermelho(f"\n[!] Erro ao fazer a busca: {str(e)}")
-            print_vermelho("[*] Tentando servidor alternativo...")
-            
-            try:
-                alt_url = f"https://piratebay.party/api/search?q={termo}"
-                response = requests.get(alt_url, headers=headers, timeout=10)
-                response.raise_for_status()
-                todos_resultados = response.json()
-            except:
-                print_vermelho("[!] Falha também no servidor alternativo")
+            print_vermelho("[!] Nenhum servidor de pesquisa respondeu")
+        finally:
+            # Saindo no meio do download: para o preenchimento em segundo plano
+            resultados.cancelar()
                 
     except KeyboardInterrupt:
         print_vermelho("\n\n[!] Pesquisa cancelada pelo usuário.")
@@ -508,170 +2794,322 @@ def format_size(size_bytes):
         size_bytes /= 1024
     return f"{size_bytes:.2f} TB"
 
+@medido("carregar_dados")
 def carregar_dados():
-    # Tenta carregar do cache primeiro
-    dados_cache = carregar_cache()
+    # O pré-carregamento do início normalmente já deixou a árvore pronta
+    meta = ler_meta_cache()
+    if _dados_prontos is not None:
+        if _dados_prontos.checksum == meta.get('checksum'):
+            if cache_expirado(meta):
+                revalidar_cache_async(meta)
+            METRICAS.contar("cache.dados.acertos")
+            return _dados_prontos
+        _guardar_dados(None)  # Versão antiga: solta a leitura fixada no snapshot
+
+    # Tenta carregar do cache primeiro; expirado, ele é servido na hora e
+    # revalidado em segundo plano
+    dados_cache = carregar_cache(aceitar_expirado=CACHE_REVALIDAR_EM_SEGUNDO_PLANO)
     if dados_cache:
-        return dados_cache
+        if cache_expirado(meta):
+            revalidar_cache_async(meta)
+        atualizar_catalogo_async()
+        METRICAS.contar("cache.dados.acertos")
+        return _guardar_dados(dados_cache)
+    METRICAS.contar("cache.dados.falhas")
         
-    console.print(Fore.RED + "Carregando base de dados do Bronze...")
-    with Progress(console=console, transient=True) as progress:
+    obter_console().print(Fore.RED + "Carregando base de dados do Bronze...")
+    with nova_barra_progresso(transient=True) as progress:
         task = progress.add_task("[red]Carregando...", total=None)
         try:
-            headers = {
-                'Cache-Control': 'no-cache',
-                'Pragma': 'no-cache'
-            }
-            response = requests.get(DATA_URL, timeout=10, headers=headers)
-            response.raise_for_status()
-            dados = response.json()
-            
-            # Salva no cache
-            salvar_cache(dados)
-            return dados
+            # O download roda no loop de fundo; aqui só acompanhamos o Future.
+            # Com um snapshot antigo, tenta antes o patch incremental. Se o
+            # pré-carregamento já está baixando, espera o mesmo download
+            aguardar_futuro(revalidar_cache_async(meta), cancelar=False)
+            atualizar_catalogo_async()
+            return _guardar_dados(carregar_cache())
             
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             print_vermelho(f"\n[!] Erro ao carregar dados: {str(e)}")
             print_vermelho("[*] Tentando carregar do cache...")
             
-            dados_cache = carregar_cache()
+            dados_cache = carregar_cache(aceitar_expirado=True)
             if dados_cache:
                 print_vermelho("[+] Dados carregados do cache!")
-                return dados_cache
+                return _guardar_dados(dados_cache)
             else:
                 print_vermelho("[!] Nenhum cache disponível!")
                 time.sleep(2)
                 return None
 
+# Pré-carregamento
+# Roda uma vez por sessão, em segundo plano, a partir de iniciar_sistema.
+# Cada etapa falha sozinha: sem rede, carregar_dados e buscar_torrents
+# simplesmente fazem o trabalho quando o usuário pedir
+_dados_prontos = None
+_dados_lock = threading.Lock()  # O pré-carregamento guarda a árvore de outra thread
+_prefetch = None
+
+def _guardar_dados(dados):
+    """Troca a árvore servida pelo menu, fechando a conexão da anterior"""
+    global _dados_prontos
+    with _dados_lock:
+        antigos, _dados_prontos = _dados_prontos, dados
+    if antigos is not None and antigos is not dados:
+        antigos.fechar()
+    return dados
+
+def _aquecer_caminhos(dados):
+    """Percorre os caminhos mais acessados do histórico, deixando os índices em memória"""
+    for caminho, in BronzeDB().consultar(
+            'SELECT caminho FROM historico_resumo ORDER BY total_acessos DESC, ultimo_acesso DESC LIMIT ?',
+            (PREFETCH_CAMINHOS,)):
+        pasta = dados
+        for parte in caminho.split(" > "):
+            if not isinstance(pasta, PastaSnapshot) or parte not in pasta:
+                break  # Caminho que não existe mais na base
+            pasta = pasta[parte]
+
+def _renovar_pesquisas():
+    """Refaz as pesquisas recentes cujo cache expirou"""
+    limite = datetime.now() - timedelta(seconds=PESQUISA_CACHE_TTL)
+    termos = BronzeDB().consultar('''
+        SELECT termo FROM (
+            SELECT termo, data_criacao FROM cache_pesquisas
+            ORDER BY ultimo_acesso DESC
+            LIMIT ?
+        ) WHERE data_criacao < ?
+    ''', (PREFETCH_TERMOS, limite))
+    for termo, in termos:
+        # Mesmo caminho da pesquisa do usuário: respeita PESQUISA_CACHE_MAX_ITENS
+        buscar_torrents_em_fluxo(termo, ResultadosTorrent())
+
+def pre_carregar():
+    """Deixa a base, os índices e as pesquisas frequentes prontos antes de o usuário pedir"""
+    global _dados_prontos
+    erros = (requests.RequestException, ValueError, OSError, sqlite3.Error, CancelledError)
+    try:
+        meta = ler_meta_cache()
+        if meta.get('versao') != str(SNAPSHOT_VERSAO) or cache_expirado(meta):
+            revalidar_cache_async(meta).result()
+    except erros:
+        pass
+    try:
+        dados = carregar_cache(aceitar_expirado=True)
+        if dados is not None:
+            _aquecer_caminhos(dados)
+            with _dados_lock:
+                if _dados_prontos is None:
+                    _dados_prontos, dados = dados, None
+            if dados is not None:
+                dados.fechar()  # O menu carregou a dele enquanto aquecíamos; não fecha a que está em uso
+        atualizar_catalogo()
+    except erros:
+        pass
+    try:
+        _renovar_pesquisas()
+    except erros:
+        pass
+
+def iniciar_pre_carregamento():
+    """Dispara o pré-carregamento (uma vez por sessão) e devolve a thread dele"""
+    global _prefetch
+    if _prefetch is None:
+        # Thread daemon: sair do painel não espera um download pendurado
+        _prefetch = threading.Thread(target=pre_carregar, name="bronze-prefetch", daemon=True)
+        _prefetch.start()
+    return _prefetch
+
+# Paginação dos menus do dataset: só a janela visível é desenhada, então
+# cada tecla custa o mesmo com 10 ou 10 mil opções/links
+MENU_ITENS_POR_PAGINA = 20
+LINKS_POR_PAGINA = 20
+
+def _opcoes_paginacao(pagina, total_paginas):
+    """Teclas de navegação entre páginas disponíveis nesta página"""
+    opcoes = []
+    if pagina > 1:
+        opcoes.append("A - Página anterior")
+    if pagina < total_paginas:
+        opcoes.append("P - Próxima página")
+    opcoes.append("I - Ir para o número")
+    return opcoes
+
+def _navegar_paginas(escolha, pagina, total_paginas, por_pagina, total):
+    """Página depois das teclas A, P ou I (a mesma se a tecla não se aplica)"""
+    if escolha == 'P' and pagina < total_paginas:
+        return pagina + 1
+    if escolha == 'A' and pagina > 1:
+        return pagina - 1
+    if escolha == 'I':
+        try:
+            num = int(input_vermelho(f"Digite o número (1-{total}): "))
+            if 1 <= num <= total:
+                return (num - 1) // por_pagina + 1
+            print_vermelho("\n[!] Número inválido!")
+        except ValueError:
+            print_vermelho("\n[!] Por favor, digite um número válido!")
+        time.sleep(1)
+    return pagina
+
 def mostrar_menu(dados, nivel=0, caminho=[]):
+    # O índice de navegação já traz tipo e total de links de cada opção;
+    # nenhum valor é lido só para desenhar o menu
+    opcoes = navegacao(dados)
+    total_paginas = max(1, (len(opcoes) + MENU_ITENS_POR_PAGINA - 1) // MENU_ITENS_POR_PAGINA)
+    pagina = 1
+    
     while True:
-        limpar_tela()
-        print(Fore.RED + ASCII_ART)
-        print(Fore.RED + "\n" + " > ".join(caminho))
+        tela = Quadro("menu")
+        tela.escrever(ASCII_ART)
+        tela.escrever("\n" + " > ".join(caminho))
         
         # Adiciona o registro no histórico quando entrar em um novo menu
         if caminho:  # Só registra se não estiver no menu principal
             adicionar_historico(caminho)
         
-        print(Fore.RED + "\nO que você quer acessar?")
+        tela.escrever("\nO que você quer acessar?")
         
-        opcoes = list(dados.keys())
-        
-        # Adicionar informação sobre submenus
-        for i, opcao in enumerate(opcoes, 1):
-            item = dados[opcao]
-            if isinstance(item, dict):
-                if 'url' in item:
-                    print(Fore.RED + f"{i} - {opcao} [Link]")
-                else:
-                    print(Fore.RED + f"{i} - {opcao} [Pasta]")
-            elif isinstance(item, list):
-                print(Fore.RED + f"{i} - {opcao} [{len(item)} links]")
+        # Numeração contínua: a página só escolhe a janela de opções desenhada
+        inicio = (pagina - 1) * MENU_ITENS_POR_PAGINA
+        for i, (opcao, _, tipo, links, _) in enumerate(opcoes[inicio:inicio + MENU_ITENS_POR_PAGINA], inicio + 1):
+            if tipo == NO_LINK:
+                tela.escrever(f"{i} - {opcao} [Link]")
+            elif tipo == NO_PASTA:
+                tela.escrever(f"{i} - {opcao} [Pasta]")
+            elif tipo == NO_LISTA:
+                tela.escrever(f"{i} - {opcao} [{links} links]")
             else:
-                print(Fore.RED + f"{i} - {opcao}")
+                tela.escrever(f"{i} - {opcao}")
         
-        print(Fore.RED + ("0 - Voltar" if nivel > 0 else "0 - Sair"))
+        tela.escrever("0 - Voltar" if nivel > 0 else "0 - Sair")
+        if total_paginas > 1:
+            tela.escrever(f"\nPágina {pagina}/{total_paginas} - Total de {len(opcoes)} opções")
+            tela.escrever(" | ".join(_opcoes_paginacao(pagina, total_paginas)))
+        desenhar(tela)
         
         try:
-            escolha = input(Fore.RED + "\nEscolha uma opção: ")
+            escolha = input_vermelho("\nEscolha uma opção: ")
             if escolha == "0":
                 if nivel == 0:
-                    print(Fore.RED + "Saindo...")
+                    print_vermelho("Saindo...")
                     break
                 else:
                     return
+            
+            if total_paginas > 1 and escolha.upper() in ('A', 'P', 'I'):
+                pagina = _navegar_paginas(escolha.upper(), pagina, total_paginas, MENU_ITENS_POR_PAGINA, len(opcoes))
+                continue
                 
             if not escolha.isdigit() or int(escolha) < 1 or int(escolha) > len(opcoes):
-                print(Fore.RED + "[!] Opção inválida!")
+                print_vermelho("[!] Opção inválida!")
                 time.sleep(1)
                 continue
                 
             escolha = int(escolha) - 1
-            opcao_selecionada = opcoes[escolha]
+            opcao_selecionada, _, tipo, _, largura = opcoes[escolha]
             novo_caminho = caminho + [opcao_selecionada]
             item_selecionado = dados[opcao_selecionada]
 
-            if isinstance(item_selecionado, dict):
-                if 'url' in item_selecionado:
-                    mostrar_links(opcao_selecionada, [item_selecionado], novo_caminho)
-                else:
-                    mostrar_menu(item_selecionado, nivel + 1, novo_caminho)
-            elif isinstance(item_selecionado, list):
-                mostrar_links(opcao_selecionada, item_selecionado, novo_caminho)
-            elif isinstance(item_selecionado, str):
-                mostrar_links(opcao_selecionada, [item_selecionado], novo_caminho)
+            if tipo == NO_PASTA:
+                mostrar_menu(item_selecionado, nivel + 1, novo_caminho)
+            elif tipo in (NO_LISTA, NO_LINK, NO_TEXTO):
+                mostrar_links(opcao_selecionada, _itens_folha(tipo, item_selecionado), novo_caminho, largura)
             else:
-                print(Fore.RED + "[!] Formato de dados inválido!")
+                print_vermelho("[!] Formato de dados inválido!")
                 time.sleep(1)
                 
         except ValueError:
-            print(Fore.RED + "[!] Por favor, digite um número válido!")
+            print_vermelho("[!] Por favor, digite um número válido!")
             time.sleep(1)
 
-def mostrar_links(titulo, links, caminho):
+def _url_link(link):
+    return link['url'] if isinstance(link, dict) and 'url' in link else str(link)
+
+def mostrar_links(titulo, links, caminho, max_width=None):
+    total_paginas = max(1, (len(links) + LINKS_POR_PAGINA - 1) // LINKS_POR_PAGINA)
+    pagina = 1
+    paginas = {}  # pagina -> (marcas de saúde, largura), calculadas na primeira visita
+    
+    def preparar_pagina(pagina):
+        if pagina not in paginas:
+            inicio = (pagina - 1) * LINKS_POR_PAGINA
+            trecho = links[inicio:inicio + LINKS_POR_PAGINA]
+            urls = [_url_link(link) for link in trecho]
+            # Links fora do ar ou lentos na última verificação (consulta local, sem rede)
+            saude = saude_links(urls)
+            marcas = [marca_saude(saude, url) for url in urls]
+            # A largura do índice de navegação vale para a folha inteira; com
+            # mais de uma página ela é calculada só para os links da página
+            largura = max_width if max_width and total_paginas == 1 else largura_links(titulo, trecho)
+            linhas = [f" {i}. {url}{marca}" for i, (url, marca) in enumerate(zip(urls, marcas), inicio + 1)]
+            linhas += [f" → {link['descrição']}" for link in trecho if isinstance(link, dict) and link.get('descrição')]
+            if total_paginas > 1:
+                linhas.append(" " + " | ".join(_opcoes_paginacao(pagina, total_paginas)))
+            largura = max(largura, max((len(linha) + 1 for linha in linhas), default=0))
+            paginas[pagina] = (marcas, largura)
+        return paginas[pagina]
+    
     while True:
-        limpar_tela()
-        print_vermelho(ASCII_ART)
-        print_vermelho("\n" + " > ".join(caminho))
+        inicio = (pagina - 1) * LINKS_POR_PAGINA
+        trecho = links[inicio:inicio + LINKS_POR_PAGINA]
+        marcas, max_width_pagina = preparar_pagina(pagina)
+        
+        tela = Quadro("links")
+        tela.escrever(ASCII_ART)
+        tela.escrever("\n" + " > ".join(caminho))
         
         # Adiciona o registro no histórico quando visualizar links
         adicionar_historico(caminho)
         
-        # Encontra o tamanho máximo necessário para a tabela
-        max_width = max(
-            len(titulo),
-            max(len(str(link['url'] if isinstance(link, dict) else link)) for link in links),
-            len("C - Copiar URL | F - Favoritar | V - Voltar")
-        ) + 6  # Aumenta a margem
-        
-        # Garante que a largura é suficiente para todos os conteúdos
-        max_width = max(max_width, 80)  # Largura mínima de 80 caracteres
-        
         # Funções auxiliares para criar linhas da tabela
         def criar_borda(left, mid, right):
-            return f"{left}{mid * max_width}{right}"
+            return f"{left}{mid * max_width_pagina}{right}"
         
         def criar_linha_conteudo(texto, centralizar=False):
             if centralizar:
-                espacos = max_width - len(texto)
-                texto = texto.center(max_width)
-            return f"║{texto}{' ' * (max_width - len(texto))}║"
+                texto = texto.center(max_width_pagina)
+            return f"║{texto}{' ' * (max_width_pagina - len(texto))}║"
         
         # Desenha a tabela
-        print_vermelho(criar_borda("╔", "═", "╗"))
-        print_vermelho(criar_linha_conteudo(titulo, centralizar=True))
-        print_vermelho(criar_borda("╠", "═", "╣"))
+        tela.escrever(criar_borda("╔", "═", "╗"))
+        tela.escrever(criar_linha_conteudo(titulo, centralizar=True))
+        tela.escrever(criar_borda("╠", "═", "╣"))
         
-        # Mostra os links numerados
-        for i, link in enumerate(links, 1):
+        # Mostra os links numerados da página (numeração contínua)
+        for i, link in enumerate(trecho, inicio + 1):
             if isinstance(link, dict) and 'url' in link:
                 url = link['url']
                 descricao = link.get('descrição', '')
-                print_vermelho(criar_linha_conteudo(f" {i}. {url}"))
+                tela.escrever(criar_linha_conteudo(f" {i}. {url}{marcas[i - inicio - 1]}"))
                 if descricao:
-                    print_vermelho(criar_linha_conteudo(f" → {descricao}"))
+                    tela.escrever(criar_linha_conteudo(f" → {descricao}"))
             else:
                 url = str(link)
-                print_vermelho(criar_linha_conteudo(f" {i}. {url}"))
+                tela.escrever(criar_linha_conteudo(f" {i}. {url}{marcas[i - inicio - 1]}"))
             
             # Adiciona linha separadora se não for o último item
-            if i < len(links):
-                print_vermelho(criar_borda("╠", "═", "╣"))
+            if i < inicio + len(trecho):
+                tela.escrever(criar_borda("╠", "═", "╣"))
         
-        print_vermelho(criar_borda("╠", "═", "╣"))
-        print_vermelho(criar_linha_conteudo(" C - Copiar URL | F - Favoritar | V - Voltar"))
-        print_vermelho(criar_borda("╚", "═", "╝"))
+        tela.escrever(criar_borda("╠", "═", "╣"))
+        if total_paginas > 1:
+            tela.escrever(criar_linha_conteudo(f" Página {pagina}/{total_paginas} - Total de {len(links)} links"))
+            tela.escrever(criar_linha_conteudo(" " + " | ".join(_opcoes_paginacao(pagina, total_paginas))))
+        tela.escrever(criar_linha_conteudo(" C - Copiar URL | F - Favoritar | V - Voltar"))
+        tela.escrever(criar_borda("╚", "═", "╝"))
+        desenhar(tela)
         
         escolha = input_vermelho("\nEscolha uma opção: ").upper()
         
         if escolha == 'V':
             break
+        elif total_paginas > 1 and escolha in ('A', 'P', 'I'):
+            pagina = _navegar_paginas(escolha, pagina, total_paginas, LINKS_POR_PAGINA, len(links))
         elif escolha == 'C':
             try:
                 num = int(input_vermelho("Digite o número do link para copiar: "))
                 if 1 <= num <= len(links):
-                    link = links[num-1]
-                    url = link['url'] if isinstance(link, dict) and 'url' in link else str(link)
+                    url = _url_link(links[num-1])
                     copiar_para_clipboard(url)
                     print_vermelho("\n[+] URL copiada para a área de transferência!")
                     time.sleep(1.5)
@@ -685,8 +3123,7 @@ def mostrar_links(titulo, links, caminho):
             try:
                 num = int(input_vermelho("Digite o número do link para favoritar: "))
                 if 1 <= num <= len(links):
-                    link = links[num-1]
-                    url = link['url'] if isinstance(link, dict) and 'url' in link else str(link)
+                    url = _url_link(links[num-1])
                     adicionar_favorito(url, titulo, " > ".join(caminho))
                     time.sleep(1)
                 else:
@@ -712,48 +3149,14 @@ def copiar_para_clipboard(texto):
             pyperclip.copy(texto)
 
 def print_slow(text):
+    if INICIO_RAPIDO:
+        print(Fore.RED + text)
+        return
     for char in text:
         print(Fore.RED + char, end='', flush=True)
         time.sleep(0.03)
     print()
 
-def mostrar_historico():
-    try:
-        # Criar nova conexão específica para esta função
-        with sqlite3.connect(DB_FILE, timeout=30) as conn:
-            conn.execute("PRAGMA journal_mode=WAL")
-            historico = conn.execute('''
-                SELECT DISTINCT caminho, MAX(data_acesso) as ultima_visita, 
-                       COUNT(*) as total_acessos
-                FROM historico 
-                GROUP BY caminho 
-                ORDER BY ultima_visita DESC 
-                LIMIT 10
-            ''').fetchall()
-            
-            if not historico:
-                print_vermelho("\n[!] Nenhum histórico encontrado!")
-                return
-            
-            print_vermelho("\n=== HISTÓRICO DE NAVEGAÇÃO ===")
-            for i, (caminho, data, total) in enumerate(historico, 1):
-                data_formatada = datetime.fromisoformat(data).strftime("%d/%m/%Y %H:%M")
-                print_vermelho(f"\n{i}. Caminho acessado: {caminho}")
-                print_vermelho(f"   Último acesso: {data_formatada}")
-                print_vermelho(f"   Total de acessos: {total}")
-            
-            print_vermelho("\nL - Limpar histórico | V - Voltar")
-            escolha = input_vermelho("\nEscolha uma opção: ").upper()
-            
-            if escolha == 'L':
-                conn.execute('DELETE FROM historico')
-                conn.commit()
-                print_vermelho("\n[+] Histórico limpo com sucesso!")
-                time.sleep(1.5)
-                
-    except Exception as e:
-        print_vermelho(f"\n[!] Erro ao mostrar histórico: {str(e)}")
-
 CATEGORIAS_DETALHADAS = {
     'JOGOS': {
         'AAA': {
@@ -875,101 +3278,233 @@ CATEGORIAS_DETALHADAS = {
     }
 }
 
-def verificar_seguranca(torrent):
-    """Sistema robusto de verificação de segurança"""
-    nome = torrent.get('name', '').upper()
-    tamanho = int(torrent.get('size', 0))
-    
-    resultado = {
-        'score': 70,  # Score inicial
-        'alertas': [],
-        'categoria_detectada': None,
-        'subcategoria_detectada': None,
-        'grupo_detectado': None,
-        'verificacoes': {
-            'tamanho': False,
-            'grupo': False,
-            'extensao': False,
-            'seeds': False
-        }
-    }
-    
-    # Separar o nome em partes para melhor detecção
-    partes_nome = nome.replace('-', ' ').replace('_', ' ').replace('.', ' ').split()
-    
-    # Primeiro, vamos tentar detectar o grupo diretamente
+# Índices pré-compilados na importação para a verificação de segurança.
+# O custo por torrent passa a depender do número de partes do nome, e não
+# de grupos × padrões.
+def _compilar_indice_grupos():
+    """Mapeia cada grupo (em maiúsculas) para sua posição na ordem de busca"""
+    indice = {}
+    grupos = []
     for categoria, subcategorias in CATEGORIAS_DETALHADAS.items():
         for subcategoria, specs in subcategorias.items():
+            faixa = (specs['min_size'], specs['max_size'],
+                     tuple(ext.upper() for ext in specs.get('extensoes_esperadas', ())))
             for grupo in specs['grupos_confiaveis']:
-                if grupo.upper() in partes_nome:  # Verifica cada parte do nome
-                    resultado['verificacoes']['grupo'] = True
-                    resultado['score'] += 20
-                    resultado['grupo_detectado'] = grupo
-                    resultado['categoria_detectada'] = categoria
-                    resultado['subcategoria_detectada'] = subcategoria
-                    break
-            if resultado['grupo_detectado']:
-                break
-        if resultado['grupo_detectado']:
-            break
-    
-    # Verifica tamanho
-    if specs['min_size'] <= tamanho <= specs['max_size']:
-        resultado['verificacoes']['tamanho'] = True
-        resultado['score'] += 10
-    
+                # Mantém a primeira ocorrência, como no percurso original
+                indice.setdefault(grupo.upper(), len(grupos))
+                grupos.append((grupo, categoria, subcategoria) + faixa)
+    return indice, grupos
+
+def _regex_trie(palavras):
+    """Monta uma alternação em forma de trie (prefixos comuns fatorados)"""
+    trie = {}
+    for palavra in palavras:
+        no = trie
+        for char in palavra:
+            no = no.setdefault(char, {})
+        no[''] = True
+
+    def montar(no):
+        alternativas = [re.escape(char) + montar(filho)
+                        for char, filho in sorted(no.items()) if char]
+        if not alternativas:
+            return ''
+        corpo = alternativas[0] if len(alternativas) == 1 else "(?:" + "|".join(alternativas) + ")"
+        return f"(?:{corpo})?" if '' in no else corpo
+
+    return montar(trie)
+
+def _compilar_padroes_maliciosos():
+    """Une grupos maliciosos e padrões suspeitos em uma única regex"""
+    padroes = {}
+    for grupo in MALICIOSOS['CONHECIDOS']:
+        padroes.setdefault(grupo.upper(), []).append(
+            (-50, f"⚠️ Grupo malicioso detectado: {grupo}"))
+    for padrao in MALICIOSOS['PADRÕES_SUSPEITOS']:
+        padroes.setdefault(padrao.upper(), []).append(
+            (-15, f"⚠️ Padrão suspeito detectado: {padrao}"))
+
+    # Lookahead captura ocorrências sobrepostas; padrões que são prefixo de
+    # outro começam na mesma posição e são resolvidos pela tabela de prefixos
+    trie = _regex_trie(padroes)
+    regex = re.compile("(?=(" + trie + "))")
+    # Sem lookahead: acha ao menos uma ocorrência por nome, bem mais rápido
+    filtro = re.compile(trie)
+    prefixos = {
+        p: [q for q in padroes if q != p and p.startswith(q)]
+        for p in padroes
+    }
+    ordem = {p: i for i, p in enumerate(padroes)}
+    return regex, filtro, padroes, prefixos, ordem
+
+_INDICE_GRUPOS, _GRUPOS = _compilar_indice_grupos()
+(_REGEX_MALICIOSOS, _FILTRO_MALICIOSOS, _PENALIDADES_MALICIOSAS,
+ _PREFIXOS_MALICIOSOS, _ORDEM_MALICIOSOS) = _compilar_padroes_maliciosos()
+_EXTENSOES_PERIGOSAS = tuple(ext.upper() for ext in MALICIOSOS['EXTENSÕES_PERIGOSAS'])
+# Sem grupo detectado, o percurso original terminava na última subcategoria
+_FAIXA_SEM_GRUPO = _GRUPOS[-1][3:]
+NOMES_GRUPOS = tuple(grupo[0] for grupo in _GRUPOS)
+
+# Bits das verificações positivas (coluna 'verificacoes' da análise em lote)
+VERIFICACAO_TAMANHO = 1
+VERIFICACAO_GRUPO = 2
+VERIFICACAO_EXTENSAO = 4
+VERIFICACAO_SEEDS = 8
+_TODAS_VERIFICACOES = 15
+
+def _nomes_verificacoes(verificacoes):
+    """Bits VERIFICACAO_* como o dict de verificar_seguranca"""
+    return {
+        'tamanho': bool(verificacoes & VERIFICACAO_TAMANHO),
+        'grupo': bool(verificacoes & VERIFICACAO_GRUPO),
+        'extensao': bool(verificacoes & VERIFICACAO_EXTENSAO),
+        'seeds': bool(verificacoes & VERIFICACAO_SEEDS)
+    }
+
+def _detectar_grupo(partes_nome):
+    """Retorna o índice em _GRUPOS do grupo confiável encontrado, ou None"""
+    encontrados = _INDICE_GRUPOS.keys() & partes_nome
+    if not encontrados:
+        return None
+    return min(map(_INDICE_GRUPOS.__getitem__, encontrados))
+
+def _detectar_maliciosos(nome):
+    """Retorna os padrões maliciosos/suspeitos presentes no nome, em ordem"""
+    return _ordenar_maliciosos(set(_REGEX_MALICIOSOS.findall(nome)))
+
+def _ordenar_maliciosos(encontrados):
+    if not encontrados:
+        return []
+    for padrao in list(encontrados):
+        encontrados.update(_PREFIXOS_MALICIOSOS[padrao])
+    return sorted(encontrados, key=_ORDEM_MALICIOSOS.__getitem__)
+
+def _separar_partes(nome):
+    """Troca os separadores de release por espaços (para dividir em partes)"""
+    return nome.replace('-', ' ').replace('_', ' ').replace('.', ' ')
+
+def _avaliar_nome(nome, partes, maliciosos, alertas=None):
+    """Parte textual da pontuação: grupo, extensão e padrões maliciosos
+
+    `partes` é o nome já passado por _separar_partes. Retorna (posição do grupo em _GRUPOS ou None, bits de verificação, ajuste do score).
+    """
+    ajuste = 0
+    verificacoes = 0
+
+    # Separar o nome em partes para melhor detecção
+    posicao = _detectar_grupo(partes.split())
+    if posicao is not None:
+        extensoes = _GRUPOS[posicao][5]
+        verificacoes |= VERIFICACAO_GRUPO
+        ajuste += 20
+    else:
+        extensoes = _FAIXA_SEM_GRUPO[2]
+
     # Verifica extensões se especificadas
-    if 'extensoes_esperadas' in specs:
-        for ext in specs['extensoes_esperadas']:
+    if extensoes and nome.endswith(extensoes):
+        verificacoes |= VERIFICACAO_EXTENSAO
+        ajuste += 10
+
+    # Verifica grupos maliciosos e padrões suspeitos
+    for padrao in maliciosos:
+        for penalidade, alerta in _PENALIDADES_MALICIOSAS[padrao]:
+            ajuste += penalidade
+            if alertas is not None:
+                alertas.append(alerta)
+
+    # Verifica extensões perigosas
+    if nome.endswith(_EXTENSOES_PERIGOSAS):
+        for ext in MALICIOSOS['EXTENSÕES_PERIGOSAS']:
             if nome.endswith(ext.upper()):
-                resultado['verificacoes']['extensao'] = True
-                resultado['score'] += 10
-                break
-    
+                ajuste -= 30
+                if alertas is not None:
+                    alertas.append(f"⚠️ Extensão perigosa detectada: {ext}")
+
+    return posicao, verificacoes, ajuste
+
+def _avaliar_numeros(posicao, tamanho, seeds, leeches, alertas=None):
+    """Parte numérica da pontuação: faixa de tamanho e proporção de seeds
+
+    Retorna (bits de verificação, ajuste do score).
+    """
+    ajuste = 0
+    verificacoes = 0
+
+    # Verifica tamanho
+    min_size, max_size = _GRUPOS[posicao][3:5] if posicao is not None else _FAIXA_SEM_GRUPO[:2]
+    if min_size <= tamanho <= max_size:
+        verificacoes |= VERIFICACAO_TAMANHO
+        ajuste += 10
+
     # Verifica seeds/leechers
-    seeds = int(torrent.get('seeders', 0))
-    leeches = int(torrent.get('leechers', 0))
-    ratio = seeds/max(leeches, 1)
-    
+    ratio = seeds/leeches if leeches > 1 else seeds
     if seeds > 10 and ratio > 1:
-        resultado['verificacoes']['seeds'] = True
-        resultado['score'] += 10
+        verificacoes |= VERIFICACAO_SEEDS
+        ajuste += 10
     elif seeds == 0:
-        resultado['score'] -= 20
-        resultado['alertas'].append("⚠️ Sem seeds ativos")
+        ajuste -= 20
+        if alertas is not None:
+            alertas.append("⚠️ Sem seeds ativos")
     elif ratio < 0.5:
-        resultado['score'] -= 10
-        resultado['alertas'].append("⚠️ Baixa proporção de seeds")
-    
-    # Verifica grupos maliciosos
-    for grupo in MALICIOSOS['CONHECIDOS']:
-        if grupo.upper() in nome:
-            resultado['score'] -= 50
-            resultado['alertas'].append(f"⚠️ Grupo malicioso detectado: {grupo}")
-    
-    # Verifica padrões suspeitos
-    for padrao in MALICIOSOS['PADRÕES_SUSPEITOS']:
-        if padrao.upper() in nome:
-            resultado['score'] -= 15
-            resultado['alertas'].append(f"⚠️ Padrão suspeito detectado: {padrao}")
-    
-    # Verifica extensões perigosas
-    for ext in MALICIOSOS['EXTENSÕES_PERIGOSAS']:
-        if nome.endswith(ext.upper()):
-            resultado['score'] -= 30
-            resultado['alertas'].append(f"⚠️ Extensão perigosa detectada: {ext}")
-    
-    # Ajusta score final
-    resultado['score'] = max(0, min(resultado['score'], 100))
-    
-    # Limita a 95% se não tiver todas as verificações positivas
-    if resultado['score'] > 95:
-        todas_verificacoes = all(resultado['verificacoes'].values())
-        if not todas_verificacoes:
-            resultado['score'] = 95
-            resultado['alertas'].append("ℹ️ Score limitado a 95% por falta de verificaões completas")
+        ajuste -= 10
+        if alertas is not None:
+            alertas.append("⚠️ Baixa proporção de seeds")
+
+    return verificacoes, ajuste
+
+def _ajustar_score(score, verificacoes, alertas=None):
+    """Limita o score a 0-100, e a 95 sem todas as verificações positivas"""
+    if score < 0:
+        score = 0
+    elif score > 100:
+        score = 100
+
+    if score > 95 and verificacoes != _TODAS_VERIFICACOES:
+        score = 95
+        if alertas is not None:
+            alertas.append("ℹ️ Score limitado a 95% por falta de verificaões completas")
+
+    return score
+
+def _pontuar(nome, tamanho, seeds, leeches, maliciosos, alertas=None):
+    """Núcleo da pontuação de um torrent
+
+    Retorna (score, posição do grupo em _GRUPOS ou None, bits de verificação).
+    Os alertas só são montados quando uma lista é passada.
+    """
+    alertas_nome = None if alertas is None else []
+    posicao, bits_nome, ajuste_nome = _avaliar_nome(nome, _separar_partes(nome), maliciosos, alertas_nome)
+    bits_numeros, ajuste_numeros = _avaliar_numeros(posicao, tamanho, seeds, leeches, alertas)
+    if alertas is not None:
+        alertas.extend(alertas_nome)  # Alertas de seeds vêm antes dos de nome
+
+    verificacoes = bits_nome | bits_numeros
+    score = _ajustar_score(70 + ajuste_nome + ajuste_numeros, verificacoes, alertas)
+    return score, posicao, verificacoes
+
+@medido("seguranca.torrent")
+def verificar_seguranca(torrent):
+    """Sistema robusto de verificação de segurança"""
+    nome = torrent.get('name', '').upper()
+    alertas = []
+    score, posicao, verificacoes = _pontuar(
+        nome,
+        int(torrent.get('size', 0)),
+        int(torrent.get('seeders', 0)),
+        int(torrent.get('leechers', 0)),
+        _detectar_maliciosos(nome),
+        alertas
+    )
+    grupo, categoria, subcategoria = _GRUPOS[posicao][:3] if posicao is not None else (None, None, None)
     
-    return resultado
+    return {
+        'score': score,
+        'alertas': alertas,
+        'categoria_detectada': categoria,
+        'subcategoria_detectada': subcategoria,
+        'grupo_detectado': grupo,
+        'verificacoes': _nomes_verificacoes(verificacoes)
+    }
 
 def mostrar_detalhes_torrent(item, analise):
     """Mostra os detalhes do torrent com análise detalhada"""
@@ -1035,7 +3570,7 @@ def mostrar_detalhes_torrent(item, analise):
     # Análise de Seeds/Leechers
     seeds = int(item.get('seeders', 0))
     leeches = int(item.get('leechers', 0))
-    ratio = seeds/max(leeches, 1)
+    ratio = seeds/leeches if leeches > 1 else seeds
     
     ratio_info = [f"Ratio Seeds/Leechers: {ratio:.2f}"]
     if ratio < 0.5:
@@ -1141,7 +3676,351 @@ def analisar_torrent(item):
         'verificacoes': resultado['verificacoes']
     }
 
+def analisar_torrents(torrents, usar_numpy=None):
+    """Pontua de uma vez uma lista inteira de resultados da apibay
+
+    Retorna colunas compactas alinhadas com a lista de entrada:
+    'score' (0-100), 'grupo' (índice em NOMES_GRUPOS ou -1),
+    'verificacoes' (bits VERIFICACAO_*) e 'idade_dias'. As verificações
+    numéricas usam NumPy quando disponível (usar_numpy=None).
+    """
+    colunas = [[t.get(campo, 0) for t in torrents] for campo in ('size', 'seeders', 'leechers', 'added')]
+    return analisar_colunas([t.get('name', '') for t in torrents], *colunas, usar_numpy=usar_numpy)
+
+@medido("seguranca.lote")
+def analisar_colunas(nomes, tamanhos, seeds, leeches, adicionados, usar_numpy=None):
+    """analisar_torrents sobre colunas já separadas (ex.: as do ResultadosTorrent)"""
+    total = len(nomes)
+    if not total:
+        return {'score': array('B'), 'grupo': array('h'), 'verificacoes': array('B'), 'idade_dias': array('q')}
+
+    # Uma única passada do filtro sobre todos os nomes concatenados; só os
+    # nomes com alguma ocorrência passam pela regex completa
+    texto = "\0".join(nomes).upper()
+    separados = texto.split("\0")
+    if len(separados) != total:  # Nome com \0 embutido: volta ao caminho individual
+        nomes = [nome.upper() for nome in nomes]
+        partes = list(map(_separar_partes, nomes))
+        candidatos = range(total)
+    else:
+        nomes = separados
+        # Separadores trocados de uma vez no texto inteiro
+        partes = _separar_partes(texto).split("\0")
+        inicios = []
+        posicao = 0
+        for nome in nomes:
+            inicios.append(posicao)
+            posicao += len(nome) + 1
+        candidatos = {bisect_right(inicios, match.start()) - 1
+                      for match in _FILTRO_MALICIOSOS.finditer(texto)}
+    maliciosos = {}
+    for i in candidatos:
+        encontrados = set(_REGEX_MALICIOSOS.findall(nomes[i]))
+        if encontrados:
+            maliciosos[i] = _ordenar_maliciosos(encontrados)
+
+    por_item = [()] * total
+    for i, encontrados in maliciosos.items():
+        por_item[i] = encontrados
+
+    posicoes, bits_nome, ajustes_nome = zip(*map(_avaliar_nome, nomes, partes, por_item))
+    grupos = [-1 if p is None else p for p in posicoes]
+
+    colunas = (tamanhos, seeds, leeches, adicionados)
+    agora = int(time.time())
+    if usar_numpy is None:
+        usar_numpy = np is not None
+    if usar_numpy:
+        numeros = _avaliar_numeros_numpy(grupos, bits_nome, ajustes_nome, *colunas, agora)
+    else:
+        numeros = _avaliar_numeros_python(posicoes, bits_nome, ajustes_nome, *colunas, agora)
+    scores, verificacoes, idades = numeros
+
+    return {
+        'score': scores,
+        'grupo': array('h', grupos),
+        'verificacoes': verificacoes,
+        'idade_dias': idades
+    }
+
+# 'added' além disso é lixo da origem; o corte mantém a idade dentro do int64
+# nos dois caminhos (o _inteiro aceita qualquer valor de 64 bits)
+_LIMITE_ADICIONADO = 2 ** 62
+
+def _avaliar_numeros_python(posicoes, bits_nome, ajustes_nome, tamanhos, seeds, leeches, adicionados, agora):
+    """Verificações numéricas do lote, item a item"""
+    scores = array('B')
+    verificacoes = array('B')
+    for posicao, bits, ajuste, tamanho, s, l in zip(posicoes, bits_nome, ajustes_nome, tamanhos, seeds, leeches):
+        bits_numeros, ajuste_numeros = _avaliar_numeros(posicao, int(tamanho), int(s), int(l))
+        bits |= bits_numeros
+        scores.append(_ajustar_score(70 + ajuste + ajuste_numeros, bits))
+        verificacoes.append(bits)
+    idades = array('q', [(agora - min(max(int(adicionado), -_LIMITE_ADICIONADO), _LIMITE_ADICIONADO)) // 86400
+                         for adicionado in adicionados])
+    return scores, verificacoes, idades
+
+def _avaliar_numeros_numpy(grupos, bits_nome, ajustes_nome, tamanhos, seeds, leeches, adicionados, agora):
+    """Verificações numéricas do lote em uma única passada vetorizada"""
+    grupos = np.array(grupos, dtype=np.int64)
+    tamanhos = np.array(tamanhos, dtype=np.int64)
+    seeds = np.array(seeds, dtype=np.int64)
+    leeches = np.array(leeches, dtype=np.int64)
+    adicionados = np.array(adicionados, dtype=np.int64)
+
+    # A última linha das faixas é a de "sem grupo", então o índice -1 cai nela
+    faixas = np.array([g[3:5] for g in _GRUPOS] + [_FAIXA_SEM_GRUPO[:2]], dtype=np.int64)
+    tamanho_ok = (faixas[grupos, 0] <= tamanhos) & (tamanhos <= faixas[grupos, 1])
+
+    ratio = seeds / np.maximum(leeches, 1)
+    seeds_ok = (seeds > 10) & (ratio > 1)
+    sem_seeds = ~seeds_ok & (seeds == 0)
+    poucos_seeds = ~seeds_ok & ~sem_seeds & (ratio < 0.5)
+
+    verificacoes = (np.array(bits_nome, dtype=np.int64)
+                    | tamanho_ok * VERIFICACAO_TAMANHO
+                    | seeds_ok * VERIFICACAO_SEEDS)
+    scores = (70 + np.array(ajustes_nome, dtype=np.int64)
+              + 10 * tamanho_ok + 10 * seeds_ok - 20 * sem_seeds - 10 * poucos_seeds)
+    scores = np.clip(scores, 0, 100)
+    scores[(scores > 95) & (verificacoes != _TODAS_VERIFICACOES)] = 95
+    idades = (agora - np.clip(adicionados, -_LIMITE_ADICIONADO, _LIMITE_ADICIONADO)) // 86400
+
+    return (array('B', scores.astype(np.uint8).tobytes()),
+            array('B', verificacoes.astype(np.uint8).tobytes()),
+            array('q', idades.tobytes()))
+
+# Linha de comando (modo não interativo)
+#     python main.py                         -> painel interativo
+#     python main.py pesquisar "termo" ...   -> resultados em JSON lines no stdout
+# Sem consultas na linha de comando (ou com "-"), elas são lidas do stdin,
+# uma por linha, todas no mesmo processo: a sessão HTTP, o bronze.db e os
+# caches são reaproveitados entre uma consulta e outra.
+CLI_PARALELO = 8  # Pesquisas simultâneas no modo em lote
+CLI_LOTE_PONTUACAO = 5000  # Torrents pontuados por chamada de analisar_torrents
+CLI_LOTE_FAVORITOS = 500  # Favoritos lidos por página na exportação
+CAMPOS_NUMERICOS = ('size', 'seeders', 'leechers', 'added')  # Campos da apibay usados na pontuação
+
+def _emitir(saida, objeto):
+    saida.write(json.dumps(objeto, ensure_ascii=False) + "\n")
+
+def _consultas(argumentos):
+    """Consultas da linha de comando, ou do stdin quando não há nenhuma (ou com "-")"""
+    if argumentos and argumentos != ["-"]:
+        yield from argumentos
+        return
+    for linha in sys.stdin:
+        linha = linha.strip()
+        if linha:
+            yield linha
+
+def _pontuados(torrents, normalizados=None):
+    """Os torrents com as colunas de analisar_torrents anexadas a cada um
+
+    `normalizados` (alinhados com `torrents`) são pontuados no lugar dos
+    originais, que saem como vieram.
+    """
+    colunas = analisar_torrents(torrents if normalizados is None else normalizados)
+    for i, torrent in enumerate(torrents):
+        grupo = colunas['grupo'][i]
+        yield {
+            **torrent,
+            'score': colunas['score'][i],
+            'grupo_detectado': NOMES_GRUPOS[grupo] if grupo >= 0 else None,
+            'verificacoes': _nomes_verificacoes(colunas['verificacoes'][i]),
+            'idade_dias': colunas['idade_dias'][i]
+        }
+
+def cli_pesquisar(args, saida):
+    """Uma linha por termo: {"termo", "total", "resultados"}"""
+    def pesquisar(termo):
+        resultados = buscar_torrents(termo)
+        if _sem_resultados(resultados):
+            return 0, []
+        pontuados = [t for t in _pontuados(resultados) if t['score'] >= args.score_minimo]
+        if args.por_score:
+            pontuados.sort(key=lambda t: t['score'], reverse=True)
+        return len(resultados), pontuados[:args.limite or None]
+
+    def emitir(termo, futuro):
+        # Um termo com erro não interrompe os demais; TimeoutError (nenhum
+        # provedor respondeu no prazo) é um OSError
+        try:
+            total, resultados = futuro.result()
+        except (requests.RequestException, ValueError, OSError, sqlite3.Error) as e:
+            _emitir(saida, {'termo': termo, 'erro': str(e) or type(e).__name__})
+        else:
+            _emitir(saida, {'termo': termo, 'total': total, 'resultados': resultados})
+        saida.flush()
+
+    # Janela limitada de pesquisas em voo; a saída sai na ordem da entrada
+    pendentes = deque()
+    with ThreadPoolExecutor(max_workers=args.paralelo, thread_name_prefix="bronze-cli") as executor:
+        for termo in _consultas(args.termos):
+            pendentes.append((termo, executor.submit(pesquisar, termo)))
+            if len(pendentes) >= args.paralelo:
+                emitir(*pendentes.popleft())
+        while pendentes:
+            emitir(*pendentes.popleft())
+
+def cli_pontuar(args, saida):
+    """Lê torrents da apibay do stdin (um objeto ou uma lista por linha) e emite cada um pontuado"""
+    lote = []
+    normalizados = []
+
+    def descarregar():
+        for torrent in _pontuados(lote, normalizados):
+            _emitir(saida, torrent)
+        lote.clear()
+        normalizados.clear()
+
+    def erro(numero, mensagem):
+        descarregar()  # Mantém a saída na ordem da entrada
+        _emitir(saida, {'linha': numero, 'erro': mensagem})
+
+    for numero, linha in enumerate(sys.stdin, 1):
+        if not linha.strip():
+            continue
+        try:
+            objeto = json.loads(linha)
+        except ValueError as e:
+            erro(numero, str(e))
+            continue
+        for item in objeto if isinstance(objeto, list) else [objeto]:
+            # Só o item inválido vira erro; números ruins viram 0 como no ResultadosTorrent
+            if not isinstance(item, dict) or not isinstance(item.get('name', ''), str):
+                erro(numero, "esperado um objeto de torrent com 'name' em texto")
+                continue
+            lote.append(item)
+            normalizados.append({'name': item.get('name', ''),
+                                 **{campo: _inteiro(item.get(campo, 0)) for campo in CAMPOS_NUMERICOS}})
+        if len(lote) >= CLI_LOTE_PONTUACAO:
+            descarregar()
+    descarregar()
+
+def _preparar_catalogo():
+    """Garante um snapshot utilizável e o catálogo indexado a partir dele"""
+    if not BronzeDB().catalogo_disponivel:
+        raise sqlite3.NotSupportedError("este SQLite não tem suporte a FTS5")
+    meta = ler_meta_cache()
+    if meta.get('versao') != str(SNAPSHOT_VERSAO) or cache_expirado(meta):
+        try:
+            revalidar_cache_async(meta).result()
+        except (requests.RequestException, ValueError) as e:
+            if meta.get('versao') != str(SNAPSHOT_VERSAO):
+                raise
+            print_vermelho(f"[!] Usando o cache antigo: {str(e)}")
+    atualizar_catalogo()
+
+def cli_catalogo(args, saida):
+    """Uma linha por consulta: {"consulta", "resultados": [{"caminho", "url", "descricao"}]}"""
+    _preparar_catalogo()
+    for consulta in _consultas(args.consultas):
+        resultados = buscar_no_catalogo(consulta, args.limite)
+        _emitir(saida, {
+            'consulta': consulta,
+            'resultados': [{'caminho': caminho, 'url': url, 'descricao': descricao}
+                           for caminho, url, descricao in resultados]
+        })
+        saida.flush()
+
+def cli_favoritos(args, saida):
+    """Exporta os favoritos, mais recentes primeiro, um por linha"""
+    apos = None
+    while True:
+        pagina = pagina_favoritos(args.categoria, apos, CLI_LOTE_FAVORITOS)
+        for url, titulo, categoria, data in pagina:
+            _emitir(saida, {'url': url, 'titulo': titulo, 'categoria': categoria, 'data_adicao': data})
+        if len(pagina) < CLI_LOTE_FAVORITOS:
+            return
+        apos = (pagina[-1][3], pagina[-1][0])
+
+def cli_historico(args, saida):
+    """Caminhos mais acessados, um por linha; com --resumo, só os totais"""
+    db = BronzeDB()
+    db.descarregar_historico()
+    if args.resumo:
+        caminhos, acessos, primeiro, ultimo = db.consultar_um('''
+            SELECT COUNT(*), COALESCE(SUM(total_acessos), 0), MIN(ultimo_acesso), MAX(ultimo_acesso)
+            FROM historico_resumo
+        ''')
+        _emitir(saida, {'caminhos': caminhos, 'acessos': acessos,
+                        'acesso_mais_antigo': primeiro, 'acesso_mais_recente': ultimo})
+        return
+    for caminho, ultimo, total in db.consultar('''
+        SELECT caminho, ultimo_acesso, total_acessos
+        FROM historico_resumo
+        ORDER BY total_acessos DESC, ultimo_acesso DESC
+        LIMIT ?
+    ''', (args.limite or -1,)):
+        _emitir(saida, {'caminho': caminho, 'total_acessos': total, 'ultimo_acesso': ultimo})
+
+def criar_parser():
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Painel do Bronze. Sem comando, abre o painel interativo; "
+                    "com um comando, responde em JSON lines no stdout.")
+    parser.add_argument("--rapido", action="store_true",
+                        help="início rápido do painel, sem animações (o mesmo que BRONZE_RAPIDO=1)")
+    parser.add_argument("--metricas", metavar="ARQUIVO",
+                        help="grava as métricas da execução em JSON ao sair (o mesmo que BRONZE_METRICAS_ARQUIVO)")
+    comandos = parser.add_subparsers(dest="comando", metavar="comando")
+
+    p = comandos.add_parser("pesquisar", help="pesquisa torrents, pontuados (termos ou stdin)")
+    p.add_argument("termos", nargs="*", help='termos de busca; sem nenhum ou com "-", lê do stdin')
+    p.add_argument("--limite", type=int, default=0, help="máximo de resultados por termo (0 = todos)")
+    p.add_argument("--score-minimo", type=int, default=0, help="descarta resultados abaixo deste score")
+    p.add_argument("--por-score", action="store_true", help="ordena pelo score em vez da relevância")
+    p.add_argument("--paralelo", type=int, default=CLI_PARALELO, help="pesquisas simultâneas")
+    p.set_defaults(funcao=cli_pesquisar)
+
+    p = comandos.add_parser("pontuar", help="pontua torrents da apibay lidos do stdin")
+    p.set_defaults(funcao=cli_pontuar)
+
+    p = comandos.add_parser("catalogo", help="busca no catálogo de links (consultas ou stdin)")
+    p.add_argument("consultas", nargs="*", help='consultas; sem nenhuma ou com "-", lê do stdin')
+    p.add_argument("--limite", type=int, default=CATALOGO_RESULTADOS, help="máximo de links por consulta")
+    p.set_defaults(funcao=cli_catalogo)
+
+    p = comandos.add_parser("favoritos", help="exporta os favoritos")
+    p.add_argument("--categoria", help="só esta categoria e as subcategorias dela")
+    p.set_defaults(funcao=cli_favoritos)
+
+    p = comandos.add_parser("historico", help="caminhos mais acessados do histórico")
+    p.add_argument("--limite", type=int, default=10, help="quantos caminhos (0 = todos)")
+    p.add_argument("--resumo", action="store_true", help="só os totais do histórico")
+    p.set_defaults(funcao=cli_historico)
+    return parser
+
+def executar_cli(args):
+    """Roda um comando da linha de comando e devolve o código de saída"""
+    saida = sys.stdout
+    # Avisos das funções do painel (print_vermelho) vão para o stderr;
+    # o stdout fica só com o JSON
+    with redirect_stdout(sys.stderr):
+        try:
+            args.funcao(args, saida)
+        except BrokenPipeError:
+            raise
+        except (requests.RequestException, ValueError, OSError, sqlite3.Error) as e:
+            print_vermelho(f"[!] Erro: {str(e)}")
+            return 1
+    saida.flush()
+    return 0
+
 if __name__ == "__main__":
+    args = criar_parser().parse_args()
+    INICIO_RAPIDO = INICIO_RAPIDO or args.rapido
+    METRICAS_ARQUIVO = args.metricas or METRICAS_ARQUIVO
+    if args.comando:
+        try:
+            sys.exit(executar_cli(args))
+        except KeyboardInterrupt:
+            sys.exit(130)
+        except BrokenPipeError:
+            # Leitor fechou o pipe (ex.: | head): sai sem o traceback do flush final
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            sys.exit(0)
     try:
         iniciar_sistema()
     except KeyboardInterrupt:
@@ -0,0 +1,35 @@
+# Apoio comum dos testes: bronze.db e snapshot num diretório temporário
+import os
+import sys
+import tempfile
+import unittest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.join(RAIZ, 'benchmarks'))  # geradores e stub_http
+import main
+
+class BancoTemporario(unittest.TestCase):
+    """Cada teste roda num diretório novo, com um BronzeDB (e métricas) do zero"""
+
+    def setUp(self):
+        self._diretorio = os.getcwd()
+        self._temporario = tempfile.TemporaryDirectory()
+        os.chdir(self._temporario.name)  # DB_FILE e CACHE_FILE são relativos ao diretório atual
+        main.BronzeDB._instance = None
+        main.METRICAS.ativas = True
+        main.METRICAS.zerar()
+
+    def tearDown(self):
+        db = main.BronzeDB._instance
+        if db is not None:
+            db.descarregar_historico()
+            conn = getattr(db._local, 'conn', None)
+            if conn is not None:
+                conn.close()
+        main.BronzeDB._instance = None
+        os.chdir(self._diretorio)
+        self._temporario.cleanup()
+
+    def contador(self, nome):
+        return main.METRICAS.contadores.get(nome, 0)
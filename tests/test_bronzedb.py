@@ -0,0 +1,59 @@
+# Testes da camada do bronze.db: conexão por thread, transações e o
+# histórico gravado em lote pela thread de fundo
+import threading
+import unittest
+
+from apoio import BancoTemporario, main
+
+class TestBronzeDB(BancoTemporario):
+    def historico(self):
+        return main.BronzeDB().consultar('SELECT caminho FROM historico ORDER BY id')
+
+    def test_uma_instancia_e_uma_conexao_por_thread(self):
+        db = main.BronzeDB()
+        self.assertIs(main.BronzeDB(), db)
+        self.assertIs(db.conn, db.conn)
+        outras = []
+
+        def abrir():
+            outras.append(db.conn)
+            db.conn.close()
+        thread = threading.Thread(target=abrir)
+        thread.start()
+        thread.join()
+        self.assertIsNot(outras[0], db.conn)
+
+    def test_transacao_desfeita_no_erro(self):
+        db = main.BronzeDB()
+        with self.assertRaises(RuntimeError):
+            with db.transacao() as conn:
+                conn.execute("INSERT INTO favoritos (url) VALUES ('https://a.exemplo.com/')")
+                raise RuntimeError("falhou no meio")
+        self.assertFalse(db.conn.in_transaction)
+        self.assertEqual(db.consultar_um('SELECT COUNT(*) FROM favoritos')[0], 0)
+
+    def test_fila_gravada_ao_descarregar(self):
+        db = main.BronzeDB()
+        caminhos = [f"Filmes > Pasta {i}" for i in range(50)]
+        for caminho in caminhos:
+            db.registrar_historico(caminho)
+        db.descarregar_historico()
+        self.assertEqual([caminho for caminho, in self.historico()], caminhos)
+        self.assertEqual(self.contador("db.historico.acessos"), len(caminhos))
+        # Os 50 acessos chegam juntos: bem menos transações que acessos
+        self.assertLess(self.contador("db.escritas"), 10)
+
+    def test_redesenho_nao_conta_como_acesso(self):
+        db = main.BronzeDB()
+        for caminho in ("Jogos", "Jogos", "Jogos > PC", "Jogos"):
+            db.registrar_historico(caminho)
+        db.descarregar_historico()
+        self.assertEqual([caminho for caminho, in self.historico()], ["Jogos", "Jogos > PC", "Jogos"])
+
+    def test_descarregar_sem_escritor_nao_espera(self):
+        db = main.BronzeDB()
+        db.descarregar_historico(timeout=30)  # Nada enfileirado: retorna na hora
+        self.assertIsNone(db._escritor)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+# Testes do cache de pesquisas (tabela cache_pesquisas): TTL, LRU e contagem
+# de acertos, com a apibay trocada por um servidor HTTP local
+import json
+import unittest
+from datetime import datetime, timedelta
+
+from apoio import BancoTemporario, main
+from geradores import gerar_resultados
+from stub_http import servir, url
+
+class TestCachePesquisa(BancoTemporario):
+    @classmethod
+    def setUpClass(cls):
+        cls.resultados = gerar_resultados(30)
+        for i, item in enumerate(cls.resultados):
+            item['id'] = str(i)
+        cls.servidor = servir({"/q.php": json.dumps(cls.resultados).encode()})
+        original = cls.servidor.RequestHandlerClass.do_GET
+
+        def contar(handler):
+            cls.requisicoes += 1
+            original(handler)
+        cls.servidor.RequestHandlerClass.do_GET = contar
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.servidor.shutdown()
+        cls.servidor.server_close()
+
+    def setUp(self):
+        super().setUp()
+        type(self).requisicoes = 0
+        self._motor = main._motor_pesquisa
+        main._motor_pesquisa = main.MotorPesquisa([
+            main.ProvedorApibay([url(self.servidor, "/q.php?q={termo}")], paralelo=False)])
+        self._limites = (main.PESQUISA_CACHE_MAX, main.PESQUISA_CACHE_MAX_ITENS, main.PESQUISA_CACHE_TTL)
+
+    def tearDown(self):
+        main.PESQUISA_CACHE_MAX, main.PESQUISA_CACHE_MAX_ITENS, main.PESQUISA_CACHE_TTL = self._limites
+        main._motor_pesquisa = self._motor
+        super().tearDown()
+
+    def envelhecer(self, termo, segundos):
+        main.BronzeDB().executar('UPDATE cache_pesquisas SET data_criacao = ? WHERE termo = ?',
+                                 (datetime.now() - timedelta(seconds=segundos), main.normalizar_termo(termo)))
+
+    def termos_guardados(self):
+        return {termo for termo, in main.BronzeDB().consultar('SELECT termo FROM cache_pesquisas')}
+
+    def test_segunda_pesquisa_vem_do_cache(self):
+        self.assertEqual(main.buscar_torrents("Ubuntu ISO"), self.resultados)
+        self.assertEqual(main.buscar_torrents("  ubuntu   iso "), self.resultados)
+        self.assertEqual(self.requisicoes, 1)
+        self.assertEqual(self.contador("cache.pesquisa.falhas"), 1)
+        self.assertEqual(self.contador("cache.pesquisa.acertos"), 1)
+
+    def test_expirado_busca_de_novo(self):
+        main.buscar_torrents("debian")
+        self.envelhecer("debian", main.PESQUISA_CACHE_TTL + 1)
+        self.assertIsNone(main.ler_cache_pesquisa("debian"))
+        self.assertNotIn("debian", self.termos_guardados())  # A linha vencida é apagada na leitura
+        main.buscar_torrents("debian")
+        self.assertEqual(self.requisicoes, 2)
+        self.assertEqual(self.contador("cache.pesquisa.acertos"), 0)
+
+    def test_dentro_do_ttl(self):
+        main.buscar_torrents("arch")
+        self.envelhecer("arch", main.PESQUISA_CACHE_TTL - 60)
+        self.assertEqual(main.ler_cache_pesquisa("arch"), self.resultados)
+
+    def test_lru_descarta_o_menos_usado(self):
+        main.PESQUISA_CACHE_MAX = 3
+        for termo in ("a", "b", "c"):
+            main.salvar_cache_pesquisa(termo, self.resultados)
+        main.ler_cache_pesquisa("a")  # "a" passa a ser o mais recente; "b" fica por último
+        main.salvar_cache_pesquisa("d", self.resultados)
+        self.assertEqual(self.termos_guardados(), {"a", "c", "d"})
+        main.salvar_cache_pesquisa("e", self.resultados)
+        self.assertEqual(self.termos_guardados(), {"a", "d", "e"})
+
+    def test_em_fluxo_guarda_o_registro_completo(self):
+        destino = main.buscar_torrents_em_fluxo("fedora", main.ResultadosTorrent())
+        self.assertEqual(len(destino), len(self.resultados))
+        # O cache é o mesmo do modo sem fluxo: nenhum campo da apibay pode faltar
+        self.assertEqual(main.ler_cache_pesquisa("fedora"), self.resultados)
+
+    def test_em_fluxo_respeita_o_limite_de_itens(self):
+        main.PESQUISA_CACHE_MAX_ITENS = len(self.resultados) - 1
+        main.buscar_torrents_em_fluxo("mint", main.ResultadosTorrent())
+        self.assertNotIn("mint", self.termos_guardados())
+
+    def test_pre_carregamento_renova_so_os_vencidos(self):
+        main.buscar_torrents("vencido")
+        main.buscar_torrents("recente")
+        self.envelhecer("vencido", main.PESQUISA_CACHE_TTL + 1)
+        main._renovar_pesquisas()
+        self.assertEqual(self.requisicoes, 3)
+        self.assertEqual(main.ler_cache_pesquisa("vencido"), self.resultados)
+
+    def test_pre_carregamento_respeita_o_limite_de_itens(self):
+        main.buscar_torrents("grande")
+        self.envelhecer("grande", main.PESQUISA_CACHE_TTL + 1)
+        main.PESQUISA_CACHE_MAX_ITENS = len(self.resultados) - 1
+        main._renovar_pesquisas()
+        self.assertEqual(self.requisicoes, 2)
+        self.assertNotIn("grande", self.termos_guardados())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+# Testes das funções puras do dados.json e da pesquisa em fluxo
+# Uso: python -m unittest discover tests  (ou python -m pytest tests)
+import os
+import sys
+import copy
+import tempfile
+import unittest
+from collections.abc import Mapping
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main
+
+def _itens(pedacos):
+    return [item for lote in main.lotes_array_json(iter(pedacos)) for item in lote]
+
+def _materializar(no):
+    return {k: _materializar(v) for k, v in no.items()} if isinstance(no, Mapping) else no
+
+class TestLotesArrayJson(unittest.TestCase):
+    TEXTO = '[12345, 6500.0, -1e3, 0, true, null, "a, ]", {"x": [1.5, "}"]}, []]'
+
+    def test_um_caractere_por_pedaco(self):
+        esperado = [12345, 6500.0, -1000.0, 0, True, None, "a, ]", {"x": [1.5, "}"]}, []]
+        self.assertEqual(_itens(self.TEXTO), esperado)
+
+    def test_todos_os_cortes(self):
+        # Cada ponto de corte possível em dois pedaços dá o mesmo resultado
+        esperado = _itens([self.TEXTO])
+        for corte in range(len(self.TEXTO) + 1):
+            with self.subTest(corte=corte, pedacos=(self.TEXTO[:corte], self.TEXTO[corte:])):
+                self.assertEqual(_itens([self.TEXTO[:corte], self.TEXTO[corte:]]), esperado)
+
+    def test_numero_no_fim_do_pedaco_espera_o_proximo(self):
+        self.assertEqual(_itens(["[6500.", "25]"]), [6500.25])
+        self.assertEqual(_itens(["[1e", "3]"]), [1000.0])
+        self.assertEqual(_itens(["[-", "7]"]), [-7])
+        self.assertEqual(_itens(["[12", "34]"]), [1234])
+
+    def test_lista_vazia_e_espacos(self):
+        self.assertEqual(_itens(["  ", " [", " ", "]"]), [])
+
+    def test_incompleta(self):
+        with self.assertRaises(ValueError):
+            _itens(["[1, 2"])
+
+    def test_nao_e_lista(self):
+        with self.assertRaises(ValueError):
+            _itens(['{"a": 1}'])
+
+class TestPatchDados(unittest.TestCase):
+    ANTIGO = {
+        "Filmes": {
+            "Clássicos": ["https://a.exemplo.com/1", {"url": "https://b.exemplo.com/", "descrição": "espelho"}],
+            "Aviso": "Só links públicos"
+        },
+        "Jogos": {"Retro": ["https://c.exemplo.com/"]}
+    }
+
+    def setUp(self):
+        self._diretorio = os.getcwd()
+        self._temporario = tempfile.TemporaryDirectory()
+        os.chdir(self._temporario.name)  # O snapshot (CACHE_FILE) é relativo ao diretório atual
+        main.salvar_cache(self.ANTIGO)
+
+    def tearDown(self):
+        os.chdir(self._diretorio)
+        self._temporario.cleanup()
+
+    def _feed(self, novo, operacoes=None):
+        return {'de': main.checksum_dados(self.ANTIGO), 'para': main.checksum_dados(novo),
+                'operacoes': main.gerar_patch(self.ANTIGO, novo) if operacoes is None else operacoes}
+
+    def _snapshot(self):
+        with main.carregar_cache(aceitar_expirado=True) as dados:
+            return _materializar(dados)
+
+    def test_fechar_solta_a_conexao(self):
+        with main.carregar_cache(aceitar_expirado=True) as dados:
+            pasta = dados["Filmes"]
+        with self.assertRaises(main.sqlite3.ProgrammingError):
+            pasta["Clássicos"]  # A subpasta usa a conexão da raiz
+
+    def test_patch_gerado_leva_ao_novo(self):
+        novo = copy.deepcopy(self.ANTIGO)
+        novo["Filmes"]["Clássicos"].append("https://d.exemplo.com/")
+        novo["Filmes"]["Aviso"] = "Atualizado"
+        del novo["Jogos"]["Retro"]
+        novo["Séries"] = {"Novas": ["https://e.exemplo.com/"]}
+        self.assertTrue(main.aplicar_patch_dados(self._feed(novo)))
+        self.assertEqual(self._snapshot(), novo)
+        self.assertEqual(main.ler_meta_cache()['checksum'], main.checksum_dados(novo))
+
+    def test_operacao_dentro_da_lista_de_links(self):
+        novo = copy.deepcopy(self.ANTIGO)
+        novo["Filmes"]["Clássicos"].insert(1, "https://f.exemplo.com/")
+        operacoes = [{'op': 'add', 'path': '/Filmes/Clássicos/1', 'value': "https://f.exemplo.com/"}]
+        self.assertTrue(main.aplicar_patch_dados(self._feed(novo, operacoes)))
+        self.assertEqual(self._snapshot(), novo)
+
+    def test_base_diferente_nao_aplica(self):
+        novo = {"Outro": {}}
+        feed = self._feed(novo)
+        feed['de'] = "0" * len(feed['de'])
+        self.assertFalse(main.aplicar_patch_dados(feed))
+        self.assertEqual(self._snapshot(), self.ANTIGO)
+
+    def test_checksum_errado_desfaz_tudo(self):
+        novo = copy.deepcopy(self.ANTIGO)
+        novo["Jogos"]["Retro"].append("https://g.exemplo.com/")
+        feed = self._feed(novo)
+        feed['para'] = "0" * len(feed['para'])
+        self.assertFalse(main.aplicar_patch_dados(feed))
+        self.assertEqual(self._snapshot(), self.ANTIGO)
+        self.assertEqual(main.ler_meta_cache()['checksum'], main.checksum_dados(self.ANTIGO))
+
+    def test_operacao_invalida_desfaz_tudo(self):
+        operacoes = [{'op': 'remove', 'path': '/Jogos/Retro'}, {'op': 'remove', 'path': '/Nada'}]
+        self.assertFalse(main.aplicar_patch_dados(self._feed({"Filmes": self.ANTIGO["Filmes"], "Jogos": {}}, operacoes)))
+        self.assertEqual(self._snapshot(), self.ANTIGO)
+
+class TestCarregarDados(unittest.TestCase):
+    def setUp(self):
+        self._diretorio = os.getcwd()
+        self._temporario = tempfile.TemporaryDirectory()
+        os.chdir(self._temporario.name)
+        self._catalogo = main.atualizar_catalogo_async
+        main.atualizar_catalogo_async = lambda: None  # O catálogo não entra aqui
+        main._dados_prontos = None
+        main.salvar_cache(TestPatchDados.ANTIGO)
+
+    def tearDown(self):
+        main._guardar_dados(None)
+        main.atualizar_catalogo_async = self._catalogo
+        os.chdir(self._diretorio)
+        self._temporario.cleanup()
+
+    def test_reaproveita_a_mesma_arvore(self):
+        dados = main.carregar_dados()
+        self.assertIs(main.carregar_dados(), dados)
+
+    def test_versao_nova_fecha_a_anterior(self):
+        antigos = main.carregar_dados()
+        main.salvar_cache({"Outro": {"Pasta": ["https://h.exemplo.com/"]}})
+        novos = main.carregar_dados()
+        self.assertIsNot(novos, antigos)
+        self.assertEqual(list(novos), ["Outro"])
+        with self.assertRaises(main.sqlite3.ProgrammingError):
+            antigos["Filmes"]["Aviso"]
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+# Testes da paginação por chave dos favoritos: páginas encostadas umas nas
+# outras mesmo com datas repetidas, e o filtro por categoria
+import unittest
+
+from apoio import BancoTemporario, main
+
+DATAS = ["2024-05-01T12:00:00", "2024-05-01T12:00:00", "2024-05-01T12:00:00",
+         "2024-04-01T08:00:00", "2024-04-01T08:00:00", "2024-03-01T00:00:00"]
+CATEGORIAS = ["Jogos > PC", "Jogos > PC > Retro", "Jogos > PCs", "Jogos", "Filmes", "Jogos > PC"]
+
+class TestPaginaFavoritos(BancoTemporario):
+    def setUp(self):
+        super().setUp()
+        self._max_subcategorias = main.FAVORITOS_MAX_SUBCATEGORIAS
+        linhas = [(f"https://{i % 7}.exemplo.com/{i}", f"Link {i}", CATEGORIAS[i % len(CATEGORIAS)],
+                   DATAS[i % len(DATAS)]) for i in range(40)]
+        with main.BronzeDB().transacao() as conn:
+            conn.executemany('INSERT INTO favoritos (url, titulo, categoria, data_adicao) VALUES (?, ?, ?, ?)',
+                             linhas)
+
+    def tearDown(self):
+        main.FAVORITOS_MAX_SUBCATEGORIAS = self._max_subcategorias
+        super().tearDown()
+
+    def todas_as_paginas(self, categoria, limite):
+        itens, apos = [], None
+        while True:
+            pagina = main.pagina_favoritos(categoria, apos, limite)
+            self.assertLessEqual(len(pagina), limite)
+            itens += pagina
+            if len(pagina) < limite:
+                return itens
+            apos = (pagina[-1][3], pagina[-1][0])
+
+    def esperado(self, categoria):
+        linhas = main.BronzeDB().consultar('SELECT url, titulo, categoria, data_adicao FROM favoritos')
+        if categoria:
+            linhas = [l for l in linhas if l[2] == categoria or l[2].startswith(categoria + " > ")]
+        return sorted(linhas, key=lambda l: (l[3], l[0]), reverse=True)
+
+    def test_datas_empatadas_nao_pulam_nem_repetem(self):
+        for limite in (1, 2, 3, 7, 40, 100):
+            with self.subTest(limite=limite):
+                self.assertEqual(self.todas_as_paginas(None, limite), self.esperado(None))
+
+    def test_categoria_com_subcategorias(self):
+        for categoria in ("Jogos > PC", "Jogos", "Filmes", "Nada"):
+            for limite in (1, 3, 4):
+                with self.subTest(categoria=categoria, limite=limite):
+                    itens = self.todas_as_paginas(categoria, limite)
+                    self.assertEqual(itens, self.esperado(categoria))
+                    self.assertEqual(len(itens), main.contar_favoritos(categoria))
+        # "Jogos > PC" não inclui "Jogos > PCs"
+        self.assertNotIn("Jogos > PCs", {l[2] for l in self.todas_as_paginas("Jogos > PC", 5)})
+
+    def test_muitas_subcategorias_usam_o_indice_por_data(self):
+        main.FAVORITOS_MAX_SUBCATEGORIAS = 1
+        for limite in (2, 5):
+            with self.subTest(limite=limite):
+                self.assertEqual(self.todas_as_paginas("Jogos", limite), self.esperado("Jogos"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+# Testes do resumo do histórico (historico_resumo): contagem por caminho,
+# compactação do log bruto e montagem a partir de um banco antigo
+import sqlite3
+import unittest
+from datetime import datetime, timedelta
+
+from apoio import BancoTemporario, main
+
+class TestHistoricoResumo(BancoTemporario):
+    def registrar(self, *caminhos):
+        db = main.BronzeDB()
+        for caminho in caminhos:
+            db.registrar_historico(caminho)
+        db.descarregar_historico()
+        return db
+
+    def resumo(self):
+        return {caminho: total for caminho, total in main.BronzeDB().consultar(
+            'SELECT caminho, total_acessos FROM historico_resumo')}
+
+    def test_conta_os_acessos_por_caminho(self):
+        self.registrar("Filmes", "Jogos", "Filmes", "Séries", "Filmes")
+        self.assertEqual(self.resumo(), {"Filmes": 3, "Jogos": 1, "Séries": 1})
+
+    def test_compactar_nao_muda_o_resumo(self):
+        db = self.registrar(*["Filmes", "Jogos"] * 6)
+        ultimos = dict(db.consultar('SELECT caminho, ultimo_acesso FROM historico_resumo'))
+        # Os 8 primeiros acessos passam a ser velhos; lotes de 3 apagam em várias rodadas
+        antigo = datetime.now() - timedelta(days=400)
+        db.executar('UPDATE historico SET data_acesso = ? WHERE id IN (SELECT id FROM historico ORDER BY id LIMIT 8)',
+                    (antigo,))
+        self.assertEqual(db.compactar_historico(dias=30, lote=3), 8)
+        self.assertEqual(db.consultar_um('SELECT COUNT(*) FROM historico')[0], 4)
+        self.assertEqual(self.resumo(), {"Filmes": 6, "Jogos": 6})
+        self.assertEqual(dict(db.consultar('SELECT caminho, ultimo_acesso FROM historico_resumo')), ultimos)
+        self.assertEqual(db.compactar_historico(dias=30), 0)
+        self.assertEqual(db.compactar_historico(dias=None), 0)
+
+    def test_banco_antigo_ganha_o_resumo(self):
+        # bronze.db de antes do resumo: só o log bruto
+        conn = sqlite3.connect(main.DB_FILE)
+        conn.execute('CREATE TABLE historico (id INTEGER PRIMARY KEY AUTOINCREMENT, caminho TEXT, data_acesso TIMESTAMP)')
+        conn.executemany('INSERT INTO historico (caminho, data_acesso) VALUES (?, ?)', [
+            ("Filmes", "2024-01-01T10:00:00"), ("Jogos", "2024-01-02T10:00:00"), ("Filmes", "2024-01-03T10:00:00")])
+        conn.commit()
+        conn.close()
+        db = main.BronzeDB()
+        self.assertEqual(self.resumo(), {"Filmes": 2, "Jogos": 1})
+        self.assertEqual(db.consultar_um("SELECT ultimo_acesso FROM historico_resumo WHERE caminho = 'Filmes'")[0],
+                         "2024-01-03T10:00:00")
+
+    def test_limpar_zera_os_dois(self):
+        db = self.registrar("Filmes", "Jogos")
+        db.limpar_historico()
+        self.assertEqual(self.resumo(), {})
+        self.assertEqual(db.consultar_um('SELECT COUNT(*) FROM historico')[0], 0)
+        self.registrar("Jogos")  # O mesmo caminho de antes da limpeza volta a contar
+        self.assertEqual(self.resumo(), {"Jogos": 1})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+# Testes da verificação de links contra o servidor local dos benchmarks
+import unittest
+
+from apoio import main
+from stub_http import servir, url
+
+class TestVerificarLinks(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.servidor = servir()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.servidor.shutdown()
+        cls.servidor.server_close()
+
+    def verificar(self, urls):
+        return {url: (status, erro) for url, status, _, erro in main.verificar_links_async(urls).result(timeout=30)}
+
+    def test_status_de_cada_url(self):
+        ok, sem_head, morto = url(self.servidor, "/ok"), url(self.servidor, "/sem-head"), url(self.servidor, "/morto")
+        self.assertEqual(self.verificar([ok, sem_head, morto]),
+                         {ok: (200, None), sem_head: (200, None), morto: (404, None)})
+
+    def test_url_malformada_nao_derruba_as_outras(self):
+        ok = url(self.servidor, "/ok")
+        malformadas = ["https://ex..com/", "https://" + "a" * 64 + ".com/", "http://[::1/"]
+        resultados = self.verificar([ok, *malformadas])
+        self.assertEqual(resultados[ok], (200, None))
+        for malformada in malformadas:
+            with self.subTest(url=malformada):
+                self.assertEqual(resultados[malformada], (None, 'InvalidURL'))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+# Testes do MotorPesquisa com provedores falsos: prazo por provedor,
+# deduplicação entre provedores e isolamento de um provedor com erro
+import time
+import threading
+import unittest
+
+from apoio import main
+
+def _itens(inicio, quantidade, provedor):
+    return [{'name': f"{provedor} {i}", 'info_hash': f"{i:040X}", 'size': '1000',
+             'seeders': '10', 'leechers': '1', 'added': '1600000000'}
+            for i in range(inicio, inicio + quantidade)]
+
+class Provedor(main.ProvedorPesquisa):
+    def __init__(self, nome, itens=(), atraso=0, erro=None, timeout=1.0):
+        self.nome = nome
+        self.itens = list(itens)
+        self.atraso = atraso
+        self.erro = erro
+        self.timeout = timeout
+        self.liberar = threading.Event()  # Solta um provedor travado no fim do teste
+
+    def pesquisar(self, termo):
+        if self.atraso:
+            self.liberar.wait(self.atraso)
+        if self.erro:
+            raise self.erro
+        return list(self.itens)
+
+class PingaLotes(Provedor):
+    """Entrega um item por vez, devagar, sem nunca terminar dentro do prazo"""
+
+    def pesquisar_em_lotes(self, termo):
+        for item in self.itens:
+            if self.liberar.wait(0.05):
+                return
+            yield [item]
+
+class TestMotorPesquisa(unittest.TestCase):
+    def setUp(self):
+        self.provedores = []
+
+    def tearDown(self):
+        for provedor in self.provedores:
+            provedor.liberar.set()
+
+    def motor(self, *provedores):
+        self.provedores += provedores
+        return main.MotorPesquisa(provedores)
+
+    def test_provedor_incompleto_falha_ao_criar(self):
+        class SemPesquisar(main.ProvedorPesquisa):
+            pass
+        with self.assertRaises(TypeError):
+            SemPesquisar()
+
+    def test_mescla_sem_repetidos_na_ordem_de_prioridade(self):
+        primeiro = Provedor("primeiro", _itens(0, 10, "primeiro"), atraso=0.1)
+        segundo = Provedor("segundo", _itens(5, 10, "segundo"))  # 5 a 9 repetem o primeiro
+        resultados = self.motor(primeiro, segundo).pesquisar("x")
+        self.assertEqual(len(resultados), 15)
+        # O mais lento tem prioridade: os repetidos ficam com o nome dele
+        self.assertEqual([r['name'] for r in resultados[:10]], [f"primeiro {i}" for i in range(10)])
+
+    def test_provedor_lento_estoura_so_o_dele(self):
+        lento = Provedor("lento", _itens(0, 5, "lento"), atraso=30, timeout=0.3)
+        rapido = Provedor("rapido", _itens(100, 5, "rapido"))
+        recebidos = []
+        inicio = time.monotonic()
+        resultados = self.motor(lento, rapido).pesquisar("x", lambda p, r: recebidos.append(p.nome))
+        self.assertLess(time.monotonic() - inicio, 2)
+        self.assertEqual(len(resultados), 5)
+        self.assertEqual(recebidos, ["rapido"])
+
+    def test_provedor_com_erro_nao_derruba_os_outros(self):
+        quebrado = Provedor("quebrado", erro=main.requests.ConnectionError("recusada"))
+        bom = Provedor("bom", _itens(0, 3, "bom"))
+        self.assertEqual(len(self.motor(quebrado, bom).pesquisar("x")), 3)
+
+    def test_todos_falhando_repassa_o_erro(self):
+        quebrado = Provedor("quebrado", erro=ValueError("json inválido"))
+        lento = Provedor("lento", atraso=30, timeout=0.2)
+        with self.assertRaises((ValueError, TimeoutError)):
+            self.motor(quebrado, lento).pesquisar("x")
+
+    def test_preencher_deduplica_entre_provedores(self):
+        destino = main.ResultadosTorrent()
+        self.motor(Provedor("a", _itens(0, 10, "a")), Provedor("b", _itens(5, 10, "b"))).preencher("x", destino)
+        self.assertEqual(len(destino), 15)
+
+    def test_preencher_prazo_total_por_provedor(self):
+        # Um provedor que pinga dados e um travado: os dois param no prazo e
+        # o que já chegou fica
+        pingando = PingaLotes("pingando", _itens(0, 1000, "pingando"), timeout=0.4)
+        travado = Provedor("travado", _itens(5000, 5, "travado"), atraso=30, timeout=0.4)
+        rapido = Provedor("rapido", _itens(9000, 2, "rapido"))
+        destino = main.ResultadosTorrent()
+        terminaram = []
+        inicio = time.monotonic()
+        self.motor(pingando, travado, rapido).preencher("x", destino, lambda p, q: terminaram.append((p.nome, q)))
+        self.assertLess(time.monotonic() - inicio, 2)
+        self.assertEqual(terminaram, [("rapido", 2)])
+        self.assertGreater(len(destino), 2)  # Os lotes do pingando que chegaram a tempo ficam
+        self.assertLess(len(destino), 1002)
+
+    def test_preencher_todos_estourando(self):
+        with self.assertRaises(TimeoutError):
+            self.motor(Provedor("travado", atraso=30, timeout=0.2)).preencher("x", main.ResultadosTorrent())
+
+if __name__ == "__main__":
+    unittest.main()
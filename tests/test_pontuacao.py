@@ -0,0 +1,62 @@
+# Testes da pontuação em lote: individual x lote e caminho NumPy x Python
+# Uso: python -m unittest discover tests  (ou python -m pytest tests)
+import os
+import sys
+import unittest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.join(RAIZ, 'benchmarks'))
+import main
+from geradores import gerar_resultados
+
+# Limites do int64 (o que o _inteiro aceita) e valores absurdos que a apibay já devolveu
+EXTREMOS = [0, -1, 1, 10 ** 15, 2 ** 63 - 1, -2 ** 63, 150_000_000_000]
+
+def _torrents_extremos():
+    torrents = []
+    for i, valor in enumerate(EXTREMOS):
+        for campo in ('size', 'seeders', 'leechers', 'added'):
+            torrent = {'name': f"Filme.2023.1080p.x264-{main.NOMES_GRUPOS[i % len(main.NOMES_GRUPOS)]}",
+                       'size': '2000000000', 'seeders': '50', 'leechers': '5', 'added': '1600000000'}
+            torrent[campo] = str(valor)
+            torrents.append(torrent)
+    return torrents
+
+class TestPontuacao(unittest.TestCase):
+    def test_lote_igual_ao_individual(self):
+        resultados = gerar_resultados(2000)
+        scores = main.analisar_torrents(resultados, usar_numpy=False)['score']
+        for i, torrent in enumerate(resultados):
+            self.assertEqual(scores[i], main.verificar_seguranca(torrent)['score'], torrent)
+
+    @unittest.skipIf(main.np is None, "NumPy não instalado")
+    def test_numpy_igual_ao_python(self):
+        for nome, torrents in (("gerados", gerar_resultados(5000)), ("extremos", _torrents_extremos())):
+            python = main.analisar_torrents(torrents, usar_numpy=False)
+            vetorizado = main.analisar_torrents(torrents, usar_numpy=True)
+            for coluna in python:
+                with self.subTest(nome=nome, coluna=coluna):
+                    self.assertEqual(list(python[coluna]), list(vetorizado[coluna]))
+
+    def test_extremos_sem_numpy(self):
+        # Um 'added' absurdo não pode derrubar o lote inteiro do provedor
+        colunas = main.analisar_torrents(_torrents_extremos(), usar_numpy=False)
+        self.assertEqual(len(colunas['idade_dias']), len(_torrents_extremos()))
+        self.assertTrue(all(0 <= score <= 100 for score in colunas['score']))
+
+    def test_resultados_torrent_com_extremos(self):
+        numpy = main.np
+        main.np = None
+        try:
+            resultados = main.ResultadosTorrent()
+            torrents = _torrents_extremos()
+            for i, torrent in enumerate(torrents):
+                torrent['info_hash'] = f"{i:040X}"
+            self.assertEqual(resultados.adicionar(torrents), len(torrents))
+        finally:
+            main.np = numpy
+        self.assertEqual(resultados.adicionados[len(EXTREMOS) * 4 - 1], 150_000_000_000)
+
+if __name__ == "__main__":
+    unittest.main()